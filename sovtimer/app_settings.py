@@ -15,3 +15,77 @@ def debug_enabled() -> bool:
     """
 
     return settings.DEBUG
+
+
+def esi_max_concurrent_requests() -> int:
+    """
+    Get the maximum number of concurrent ESI requests
+
+    Used when several independent ESI requests have to be made at once,
+    e.g. when resolving unknown alliances.
+
+    :return:
+    :rtype:
+    """
+
+    return max(1, int(getattr(settings, "SOVTIMER_ESI_MAX_CONCURRENT_REQUESTS", 10)))
+
+
+def esi_request_timeout() -> float:
+    """
+    Get the time in seconds to wait for a batch of concurrent ESI requests
+
+    :return:
+    :rtype:
+    """
+
+    return float(getattr(settings, "SOVTIMER_ESI_REQUEST_TIMEOUT", 30))
+
+
+def dashboard_sse_enabled() -> bool:
+    """
+    Check if the dashboard receives its updates via Server-Sent Events
+
+    Every open stream occupies a web worker thread, so this is opt-in.
+
+    :return:
+    :rtype:
+    """
+
+    return bool(getattr(settings, "SOVTIMER_DASHBOARD_SSE_ENABLED", False))
+
+
+def dashboard_sse_max_streams() -> int:
+    """
+    Get the maximum number of Server-Sent Events streams open at the same time
+
+    Dashboards beyond it fall back to polling, so the open streams can't occupy
+    all web worker threads.
+
+    :return:
+    :rtype:
+    """
+
+    return max(0, int(getattr(settings, "SOVTIMER_DASHBOARD_SSE_MAX_STREAMS", 2)))
+
+
+def adaptive_scheduling_enabled() -> bool:
+    """
+    Check if the update tasks schedule their next run by the expiry of the ESI data
+
+    :return:
+    :rtype:
+    """
+
+    return bool(getattr(settings, "SOVTIMER_ADAPTIVE_SCHEDULING", False))
+
+
+def esi_connection_reuse_enabled() -> bool:
+    """
+    Check if all ESI requests of a worker process share one pool of connections
+
+    :return:
+    :rtype:
+    """
+
+    return bool(getattr(settings, "SOVTIMER_ESI_CONNECTION_REUSE", True))
@@ -0,0 +1,197 @@
+"""
+Benchmark of the connection reuse of the ESI requests
+
+Sends the same requests to a local stub of ESI, once with a new session per
+request, as aiopenapi3 does on its own, and once with the sessions of the
+PooledSessionFactory, counting the connections the stub accepted. Every connection
+saved is a TCP and TLS handshake saved against ESI.
+
+Run with: python -m sovtimer.benchmarks.connections
+"""
+
+# Standard Library
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+# Third Party
+from httpx2 import Client
+
+# Alliance Auth
+from esi.http_utils import build_limits, build_timeout
+
+# AA Sovereignty Timer
+from sovtimer.providers.esi import PooledSessionFactory
+
+
+class _StubESIRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers every request like ESI, with an empty list
+    """
+
+    # Keep the connections alive between requests, and send the answers right away
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Answer a GET request
+
+        :return:
+        :rtype:
+        """
+
+        body = b"[]"
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """
+        Don't log the requests
+
+        :param format:
+        :param args:
+        :return:
+        :rtype:
+        """
+
+
+class _StubESIServer(ThreadingHTTPServer):
+    """
+    Local stub of ESI, counting the connections it accepted
+    """
+
+    daemon_threads = True
+    connections = 0
+
+    def get_request(self) -> tuple[Any, Any]:
+        """
+        Accept a connection
+
+        :return:
+        :rtype:
+        """
+
+        request = super().get_request()
+        self.connections += 1
+
+        return request
+
+
+@contextmanager
+def _stub_esi_server() -> Iterator[_StubESIServer]:
+    """
+    Run the stub of ESI on a free local port
+
+    :return:
+    :rtype:
+    """
+
+    server = _StubESIServer(("127.0.0.1", 0), _StubESIRequestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def _session_factory(**kwargs) -> Client:
+    """
+    Build a session like the session factory of django-esi, without HTTP/2, which
+    the stub doesn't speak
+
+    :param kwargs: The session arguments of aiopenapi3
+    :type kwargs: dict
+    :return:
+    :rtype:
+    """
+
+    return Client(timeout=build_timeout(), limits=build_limits(), **kwargs)
+
+
+def _measure(
+    session_factory: Callable[..., Any], url: str, requests: int, concurrency: int
+) -> float:
+    """
+    Send requests like aiopenapi3, with a session per request that is closed
+    afterwards
+
+    :param session_factory: The session factory
+    :type session_factory: Callable[..., Any]
+    :param url: The URL to request
+    :type url: str
+    :param requests: Number of requests
+    :type requests: int
+    :param concurrency: Number of requests sent at the same time
+    :type concurrency: int
+    :return: The duration in seconds
+    :rtype: float
+    """
+
+    def send(_) -> None:
+        with closing(session_factory(cert=None, auth=None)) as session:
+            session.send(session.build_request("GET", url)).read()
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(send, range(requests)))
+
+    return time.perf_counter() - started
+
+
+def benchmark_connection_reuse(requests: int = 50, concurrency: int = 10) -> dict:
+    """
+    Compare the connections needed with and without the PooledSessionFactory
+
+    :param requests: Number of requests, e.g. alliances resolved on a fresh install
+    :type requests: int
+    :param concurrency: Number of requests sent at the same time, see SOVTIMER_ESI_MAX_CONCURRENT_REQUESTS
+    :type concurrency: int
+    :return:
+    :rtype:
+    """
+
+    results = {}
+
+    for name, session_factory in (
+        ("session_per_request", _session_factory),
+        ("pooled", PooledSessionFactory(session_factory=_session_factory)),
+    ):
+        with _stub_esi_server() as server:
+            seconds = _measure(
+                session_factory=session_factory,
+                url=f"http://127.0.0.1:{server.server_port}/sovereignty/campaigns",
+                requests=requests,
+                concurrency=concurrency,
+            )
+
+        results[name] = {
+            "requests": requests,
+            "connections": server.connections,
+            "reuse_ratio": 1 - server.connections / requests,
+            "seconds": seconds,
+        }
+
+    results["handshakes_saved"] = (
+        results["session_per_request"]["connections"] - results["pooled"]["connections"]
+    )
+
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_connection_reuse(), indent=4))
@@ -0,0 +1,283 @@
+"""
+Synthetic ESI payloads and database fixtures for the benchmarks
+
+All IDs are far outside the ranges used by EVE Online, so the fixtures never
+collide with real SDE data or real sovereignty data.
+"""
+
+# Standard Library
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from types import SimpleNamespace
+
+# Third Party
+from eve_sde.models import Constellation, Region, SolarSystem
+
+# AA Sovereignty Timer
+from sovtimer.models import (
+    Alliance,
+    Campaign,
+    SovereigntyStructure,
+    SovereigntySystem,
+)
+
+REGION_ID_OFFSET = 900_000_000
+CONSTELLATION_ID_OFFSET = 910_000_000
+SOLAR_SYSTEM_ID_OFFSET = 920_000_000
+ALLIANCE_ID_OFFSET = 3_000_000_000
+STRUCTURE_ID_OFFSET = 9_000_000_000_000
+CAMPAIGN_ID_OFFSET = 3_000_000_000
+
+# Shape of New Eden, roughly: a region has a handful of constellations with a
+# handful of systems each, and most sov space is held by a few dozen alliances
+SYSTEMS_PER_CONSTELLATION = 7
+CONSTELLATIONS_PER_REGION = 6
+ALLIANCE_COUNT = 50
+
+START_TIME = datetime(2030, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def _alliance_id(index: int) -> int:
+    """
+    Get the alliance ID holding the system with the given index
+
+    :param index: Index of the system
+    :type index: int
+    :return:
+    :rtype:
+    """
+
+    return ALLIANCE_ID_OFFSET + index % ALLIANCE_COUNT
+
+
+def structure_id(index: int) -> int:
+    """
+    Get the ID of the sov hub in the system with the given index
+
+    :param index: Index of the system
+    :type index: int
+    :return:
+    :rtype:
+    """
+
+    return STRUCTURE_ID_OFFSET + index
+
+
+def create_database_fixtures(systems: int) -> None:
+    """
+    Create the regions, constellations, solar systems and alliances for the payloads
+
+    :param systems: Number of solar systems
+    :type systems: int
+    :return:
+    :rtype:
+    """
+
+    constellations = -(-systems // SYSTEMS_PER_CONSTELLATION)
+    regions = -(-constellations // CONSTELLATIONS_PER_REGION)
+
+    Region.objects.bulk_create(
+        [
+            Region(id=REGION_ID_OFFSET + index, name=f"Benchmark Region {index}")
+            for index in range(regions)
+        ]
+    )
+    Constellation.objects.bulk_create(
+        [
+            Constellation(
+                id=CONSTELLATION_ID_OFFSET + index,
+                name=f"Benchmark Constellation {index}",
+                region_id=REGION_ID_OFFSET + index // CONSTELLATIONS_PER_REGION,
+            )
+            for index in range(constellations)
+        ]
+    )
+    SolarSystem.objects.bulk_create(
+        [
+            SolarSystem(
+                id=SOLAR_SYSTEM_ID_OFFSET + index,
+                name=f"Benchmark System {index}",
+                constellation_id=CONSTELLATION_ID_OFFSET
+                + index // SYSTEMS_PER_CONSTELLATION,
+            )
+            for index in range(systems)
+        ],
+        batch_size=1000,
+    )
+    Alliance.objects.bulk_create(
+        [
+            Alliance(
+                alliance_id=_alliance_id(index), name=f"Benchmark Alliance {index}"
+            )
+            for index in range(min(systems, ALLIANCE_COUNT))
+        ]
+    )
+
+
+def sov_systems_payload(systems: int, revision: int = 0) -> SimpleNamespace:
+    """
+    Build a GetSovereigntySystems payload with an alliance claim for every system
+
+    :param systems: Number of solar systems
+    :type systems: int
+    :param revision: Changes the ADM of every tenth system, to simulate a later sync
+    :type revision: int
+    :return:
+    :rtype:
+    """
+
+    solar_systems = []
+
+    for index in range(systems):
+        vulnerable_start_time = START_TIME + timedelta(minutes=index % 1440)
+        activity_defense_multiplier = 1 + (index % 50) / 10
+
+        if index % 10 == 0:
+            activity_defense_multiplier += revision / 10
+
+        claim = SimpleNamespace(
+            alliance_id=_alliance_id(index),
+            corporation_id=_alliance_id(index),
+            claimed_since=START_TIME,
+            is_capital_system=False,
+            sovereignty_hub=SimpleNamespace(
+                id=structure_id(index),
+                vulnerability_window=SimpleNamespace(
+                    start=vulnerable_start_time,
+                    end=vulnerable_start_time + timedelta(hours=4),
+                ),
+            ),
+            development=SimpleNamespace(
+                activity_defense_multiplier=activity_defense_multiplier,
+                military_level=index % 6,
+                industrial_level=index % 6,
+                strategic_level=index % 6,
+            ),
+        )
+
+        solar_systems.append(
+            SimpleNamespace(
+                solar_system_id=SOLAR_SYSTEM_ID_OFFSET + index,
+                claim=SimpleNamespace(root=SimpleNamespace(alliance=claim)),
+            )
+        )
+
+    return SimpleNamespace(solar_systems=solar_systems)
+
+
+def campaigns_payload(
+    campaigns: int, now: datetime, revision: int = 0
+) -> list[SimpleNamespace]:
+    """
+    Build a GetSovereigntyCampaigns payload, one campaign per sov hub
+
+    :param campaigns: Number of campaigns, not more than systems
+    :type campaigns: int
+    :param now: The time the campaigns start around
+    :type now: datetime
+    :param revision: Changes the scores of every tenth campaign, to simulate a later sync
+    :type revision: int
+    :return:
+    :rtype:
+    """
+
+    payload = []
+
+    for index in range(campaigns):
+        defender_score = 0.6
+
+        if index % 10 == 0:
+            defender_score -= revision / 100
+
+        payload.append(
+            SimpleNamespace(
+                campaign_id=CAMPAIGN_ID_OFFSET + index,
+                defender_id=_alliance_id(index),
+                attackers_score=round(1 - defender_score, 2),
+                defender_score=defender_score,
+                event_type=Campaign.Type.SOVHUB_DEFENSE,
+                # Spread the campaigns over active, upcoming and later ones
+                start_time=now + timedelta(hours=index % 12 - 2),
+                structure_id=structure_id(index),
+            )
+        )
+
+    return payload
+
+
+def create_sov_fixtures(
+    systems: int, campaigns: int = 0, now: datetime = START_TIME, revision: int = 0
+) -> None:
+    """
+    Create the sov hubs, system snapshots and campaigns of the synthetic payloads
+    directly, without running the sync tasks
+
+    The solar systems and alliances must exist, see create_database_fixtures.
+
+    :param systems: Number of solar systems
+    :type systems: int
+    :param campaigns: Number of campaigns, not more than systems
+    :type campaigns: int
+    :param now: The time the campaigns start around
+    :type now: datetime
+    :param revision: Revision of the payloads
+    :type revision: int
+    :return:
+    :rtype:
+    """
+
+    sov_hubs = list(
+        SovereigntyStructure.iter_sov_structures(
+            sov_systems_payload(systems=systems, revision=revision).solar_systems
+        )
+    )
+
+    SovereigntyStructure.objects.bulk_create(
+        [
+            SovereigntyStructure(
+                structure_id=sov_hub.structure_id,
+                solar_system_id=sov_hub.solar_system_id,
+                alliance_id=sov_hub.alliance_id,
+                vulnerability_occupancy_level=sov_hub.vulnerability_occupancy_level,
+                vulnerable_start_time=sov_hub.vulnerable_start_time,
+                vulnerable_end_time=sov_hub.vulnerable_end_time,
+            )
+            for sov_hub in sov_hubs
+        ],
+        batch_size=1000,
+    )
+    SovereigntySystem.objects.bulk_create(
+        [
+            SovereigntySystem(
+                solar_system_id=sov_hub.solar_system_id,
+                alliance_id=sov_hub.alliance_id,
+                vulnerability_occupancy_level=sov_hub.vulnerability_occupancy_level,
+                vulnerable_start_time=sov_hub.vulnerable_start_time,
+                vulnerable_end_time=sov_hub.vulnerable_end_time,
+                is_capital_system=sov_hub.is_capital_system,
+                military_level=sov_hub.military_level,
+                industrial_level=sov_hub.industrial_level,
+                strategic_level=sov_hub.strategic_level,
+            )
+            for sov_hub in sov_hubs
+        ],
+        batch_size=1000,
+    )
+    Campaign.objects.bulk_create(
+        [
+            Campaign(
+                campaign_id=campaign.campaign_id,
+                attackers_score=campaign.attackers_score,
+                defender_score=campaign.defender_score,
+                event_type=campaign.event_type,
+                start_time=campaign.start_time,
+                structure_id=campaign.structure_id,
+                progress_current=campaign.defender_score,
+                progress_previous=campaign.defender_score,
+            )
+            for campaign in campaigns_payload(
+                campaigns=campaigns, now=now, revision=revision
+            )
+        ],
+        batch_size=1000,
+    )
@@ -0,0 +1,120 @@
+"""
+Import-time benchmark of the app
+
+Runs the Django setup in a new interpreter with `python -X importtime` and reports
+what importing the app's modules costs, and whether the ESI client was built on
+startup, which it isn't anymore, see ThreadSafeESIClientProvider.
+
+`-X importtime` doesn't report modules imported with importlib.import_module, which
+is how Django imports the apps and their models, so these imports are timed in
+the new interpreter as well.
+
+A module only accounts for the imports no other app imported before it, Django
+loads the apps in the order of INSTALLED_APPS.
+
+Run with: python -m sovtimer.benchmarks.imports
+"""
+
+# Standard Library
+import json
+import os
+import subprocess  # nosec B404 - runs this interpreter with a fixed script
+import sys
+
+# Django setup in the new interpreter, printing the import times of the apps and
+# models in microseconds, and whether the ESI client was built
+SETUP_SCRIPT = """
+import json
+import time
+
+import django
+import django.apps.config
+
+import_module = django.apps.config.import_module
+imported = {}
+
+
+def timed_import_module(name, package=None):
+    started = time.perf_counter_ns()
+
+    try:
+        return import_module(name, package)
+    finally:
+        imported.setdefault(name, (time.perf_counter_ns() - started) // 1000)
+
+
+django.apps.config.import_module = timed_import_module
+
+started = time.perf_counter_ns()
+django.setup()
+setup_us = (time.perf_counter_ns() - started) // 1000
+
+from sovtimer.providers.esi import esi
+
+print(json.dumps([imported, setup_us, esi._client is not None]))
+"""
+
+# Modules reported by default
+MODULES = ("sovtimer.models", "sovtimer.providers.esi", "esi.openapi_clients")
+
+
+def _parse_importtime(output: str) -> dict[str, int]:
+    """
+    Parse the output of `python -X importtime`
+
+    :param output: The output, one line per imported module
+    :type output: str
+    :return: The cumulative import time in microseconds per module
+    :rtype: dict[str, int]
+    """
+
+    modules = {}
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        _, cumulative_us, name = line.removeprefix("import time:").split("|")
+
+        # The header line
+        if not cumulative_us.strip().isdigit():
+            continue
+
+        modules[name.strip()] = int(cumulative_us)
+
+    return modules
+
+
+def benchmark_import_time(modules: tuple[str, ...] = MODULES) -> dict:
+    """
+    Measure the import time of modules during the Django setup
+
+    The settings are taken from DJANGO_SETTINGS_MODULE, as for any Django process.
+
+    :param modules: The modules to report
+    :type modules: tuple[str, ...]
+    :return: The cumulative import time in microseconds per module, None if it wasn't imported, the duration of the Django setup, and whether the ESI client was built
+    :rtype: dict
+    """
+
+    process = subprocess.run(  # nosec B603 - no untrusted input
+        [sys.executable, "-X", "importtime", "-c", SETUP_SCRIPT],
+        capture_output=True,
+        check=True,
+        env=os.environ.copy(),
+        text=True,
+    )
+    app_imports, setup_us, esi_client_built = json.loads(
+        process.stdout.strip().splitlines()[-1]
+    )
+    imports = {**_parse_importtime(output=process.stderr), **app_imports}
+
+    return {
+        "modules_us": {name: imports.get(name) for name in modules},
+        "django_setup_us": setup_us,
+        "esi_client_built_on_startup": esi_client_built,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_import_time(), indent=4))
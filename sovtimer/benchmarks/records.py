@@ -0,0 +1,136 @@
+"""
+Micro-benchmark of the sov structure record against the former dict shape
+
+Run with: python -m sovtimer.benchmarks.records
+"""
+
+# Standard Library
+import gc
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any
+
+# AA Sovereignty Timer
+from sovtimer.records import SovStructureRecord
+
+CLAIMED_SINCE = datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+VULNERABLE_START_TIME = datetime(2023, 10, 1, 12, 0, tzinfo=dt_timezone.utc)
+VULNERABLE_END_TIME = VULNERABLE_START_TIME + timedelta(hours=4)
+
+
+def _dict_shape(index: int) -> dict[str, Any]:
+    """
+    Build a sov structure in the dict shape get_sov_structures_from_esi used to return
+
+    :param index: Index of the sov structure
+    :type index: int
+    :return:
+    :rtype:
+    """
+
+    return {
+        "solar_system_id": 30000000 + index,
+        "alliance_id": 99000000 + index % 100,
+        "corporation_id": 98000000 + index % 100,
+        "claimed_since": CLAIMED_SINCE,
+        "sovereignty_hub": {
+            "id": 1000000000000 + index,
+            "vulnerability_window": {
+                "start": VULNERABLE_START_TIME,
+                "end": VULNERABLE_END_TIME,
+            },
+        },
+        "is_capital_system": False,
+        "development": {
+            "activity_defense_multiplier": 1.5,
+            "military_level": 1,
+            "industrial_level": 2,
+            "strategic_level": 3,
+        },
+    }
+
+
+def _record(index: int) -> SovStructureRecord:
+    """
+    Build a sov structure record
+
+    :param index: Index of the sov structure
+    :type index: int
+    :return:
+    :rtype:
+    """
+
+    # Built like in SovereigntyStructure.iter_sov_structures
+    return SovStructureRecord(
+        1000000000000 + index,
+        30000000 + index,
+        99000000 + index % 100,
+        1.5,
+        VULNERABLE_START_TIME,
+        VULNERABLE_END_TIME,
+        False,
+        1,
+        2,
+        3,
+    )
+
+
+def _measure(factory: Callable[[int], Any], count: int) -> dict[str, float]:
+    """
+    Measure the memory per item and the construction time per item of a factory
+
+    :param factory: The factory building one item
+    :type factory: Callable[[int], Any]
+    :param count: Number of items to build
+    :type count: int
+    :return:
+    :rtype:
+    """
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        items = [factory(index) for index in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+    del items
+
+    started = time.perf_counter()
+
+    for index in range(count):
+        factory(index)
+
+    duration = time.perf_counter() - started
+
+    return {
+        "bytes_per_record": allocated / count,
+        "construction_ns_per_record": duration / count * 1e9,
+    }
+
+
+def benchmark_sov_structure_records(count: int = 10000) -> dict[str, dict]:
+    """
+    Compare the sov structure record against the former dict shape
+
+    :param count: Number of sov structures, New Eden has a few thousand
+    :type count: int
+    :return:
+    :rtype:
+    """
+
+    return {
+        "dict": _measure(factory=_dict_shape, count=count),
+        "record": _measure(factory=_record, count=count),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(benchmark_sov_structure_records(), indent=4))
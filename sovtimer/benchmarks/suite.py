@@ -0,0 +1,389 @@
+"""
+Benchmark suite for the sync tasks and the dashboard data view
+
+The benchmarks run offline, with a stubbed ESIHandler serving synthetic payloads
+and an in-memory cache, in a throwaway database that is created and destroyed
+like the test runner does, see throwaway_database. They empty the sovereignty
+tables, and refuse to run against any other database, so neither the live
+database nor the cache used by the dashboard are touched. The connection reuse of the ESI
+requests is measured against a local stub of ESI, see benchmarks.connections.
+"""
+
+# Standard Library
+import gc
+import json
+import platform
+import re
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any
+from unittest.mock import patch
+
+# Third Party
+from eve_sde.models import SolarSystem
+
+# Django
+import django
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, transaction
+from django.db.models import QuerySet
+from django.test import RequestFactory, override_settings
+from django.test.utils import (
+    CaptureQueriesContext,
+    setup_databases,
+    teardown_databases,
+)
+from django.urls import reverse
+from django.utils import timezone
+
+# AA Sovereignty Timer
+from sovtimer import __version__
+from sovtimer.benchmarks.connections import benchmark_connection_reuse
+from sovtimer.benchmarks.fixtures import (
+    campaigns_payload,
+    create_database_fixtures,
+    sov_systems_payload,
+)
+from sovtimer.helper.dashboard import dashboard_campaigns
+from sovtimer.models import (
+    Alliance,
+    Campaign,
+    SovereigntyStructure,
+    SovereigntySystem,
+)
+from sovtimer.providers.esi import ESIHandler
+from sovtimer.tasks import (
+    STRUCTURE_SYNC_FIELDS,
+    SYSTEM_SYNC_FIELDS,
+    update_sov_campaigns,
+    update_sov_structures,
+)
+from sovtimer.views import dashboard_data_v2
+
+# Number of (sovereignty systems, campaigns) per benchmark run
+DEFAULT_SCALES = ((100, 10), (1000, 100), (10000, 1000))
+
+BENCHMARK_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sovtimer-benchmarks",
+    }
+}
+
+# Names of the databases created by throwaway_database, the only ones the
+# benchmarks may empty
+_throwaway_databases: set[str] = set()
+
+
+def measure(func: Callable, *args, **kwargs) -> dict[str, Any]:
+    """
+    Measure the duration, the number of queries and the peak memory of a call
+
+    Memory is traced during the call, which slows it down a bit, so the duration
+    is only comparable to other benchmark runs.
+
+    :param func: The function to call
+    :type func: Callable
+    :param args: Positional arguments for the function
+    :param kwargs: Keyword arguments for the function
+    :return:
+    :rtype:
+    """
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        with CaptureQueriesContext(connection=connection) as queries:
+            started = time.perf_counter()
+            func(*args, **kwargs)
+            duration = time.perf_counter() - started
+
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "seconds": round(duration, 6),
+        "queries": len(queries),
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def hot_queries(sample_size: int = 100) -> dict[str, QuerySet]:
+    """
+    Get the queries the sync tasks and the dashboard data run on every update
+
+    The lookups by ID use IDs of the existing rows.
+
+    :param sample_size: Number of IDs in the lookups
+    :type sample_size: int
+    :return:
+    :rtype:
+    """
+
+    structure_ids = list(
+        SovereigntyStructure.objects.values_list("pk", flat=True)[:sample_size]
+    )
+    solar_system_ids = list(
+        SovereigntySystem.objects.values_list("pk", flat=True)[:sample_size]
+    )
+    alliance_ids = list(Alliance.objects.values_list("pk", flat=True)[:sample_size])
+
+    return {
+        "dashboard_campaigns": dashboard_campaigns(),
+        "sync_existing_structures": SovereigntyStructure.objects.values_list(
+            "pk", *STRUCTURE_SYNC_FIELDS
+        ),
+        "sync_existing_systems": SovereigntySystem.objects.values_list(
+            "pk", *SYSTEM_SYNC_FIELDS
+        ),
+        "sync_alliances": Alliance.objects.filter(pk__in=alliance_ids),
+        "sync_solar_systems": SolarSystem.objects.filter(
+            pk__in=solar_system_ids
+        ).values_list("pk", flat=True),
+        "sync_vanished_structures": SovereigntyStructure.objects.filter(
+            pk__in=structure_ids
+        ),
+        # The campaigns deleted along with vanished structures
+        "sync_vanished_structure_campaigns": Campaign.objects.filter(
+            structure__in=structure_ids
+        ),
+        "sync_vanished_systems": SovereigntySystem.objects.filter(
+            pk__in=solar_system_ids
+        ),
+    }
+
+
+def _json_scanned_tables(plan: Any) -> Iterator[str]:
+    """
+    Yield the tables read in full from a MySQL or MariaDB JSON query plan
+
+    :param plan: The query plan or a part of it
+    :type plan: Any
+    :return:
+    :rtype:
+    """
+
+    if isinstance(plan, dict):
+        if plan.get("access_type") in ("ALL", "index") and "table_name" in plan:
+            yield plan["table_name"]
+
+        for value in plan.values():
+            yield from _json_scanned_tables(value)
+    elif isinstance(plan, list):
+        for value in plan:
+            yield from _json_scanned_tables(value)
+
+
+def scanned_tables(queryset: QuerySet) -> set[str]:
+    """
+    Get the tables a query reads in full instead of searching them by an index
+
+    Supported for SQLite and MySQL/MariaDB, other databases return an empty set.
+
+    :param queryset: The query
+    :type queryset: QuerySet
+    :return:
+    :rtype:
+    """
+
+    if connection.vendor == "sqlite":
+        return set(re.findall(r"\bSCAN (\w+)", queryset.explain()))
+
+    if connection.vendor == "mysql":
+        return set(_json_scanned_tables(json.loads(queryset.explain(format="json"))))
+
+    return set()
+
+
+def query_plans() -> dict[str, dict[str, Any]]:
+    """
+    Get the query plans of the hot queries and the tables they read in full
+
+    :return:
+    :rtype:
+    """
+
+    return {
+        name: {
+            "plan": queryset.explain(),
+            "scanned_tables": sorted(scanned_tables(queryset)),
+        }
+        for name, queryset in hot_queries().items()
+    }
+
+
+@contextmanager
+def throwaway_database() -> Iterator[None]:
+    """
+    Run in a new database, created with all migrations and destroyed afterwards,
+    like the test runner does
+
+    The database user needs the permission to create databases, as for running
+    the tests.
+
+    :return:
+    :rtype:
+    """
+
+    old_config = setup_databases(
+        verbosity=0,
+        interactive=False,
+        aliases={DEFAULT_DB_ALIAS},
+        serialized_aliases=set(),
+    )
+    name = connection.settings_dict["NAME"]
+    _throwaway_databases.add(name)
+
+    try:
+        yield
+    finally:
+        _throwaway_databases.discard(name)
+        teardown_databases(old_config=old_config, verbosity=0)
+
+
+@contextmanager
+def _isolated() -> Iterator[None]:
+    """
+    Run with empty sovereignty tables and an in-memory cache, rolling back afterwards
+
+    :return:
+    :rtype:
+    """
+
+    # The tables are emptied, never do that to the live database
+    if connection.settings_dict["NAME"] not in _throwaway_databases:
+        raise RuntimeError(
+            "The benchmarks only run in a throwaway database, "
+            "see sovtimer.benchmarks.suite.throwaway_database"
+        )
+
+    with override_settings(CACHES=BENCHMARK_CACHES), transaction.atomic():
+        try:
+            Campaign.objects.all().delete()
+            SovereigntyStructure.objects.all().delete()
+            SovereigntySystem.objects.all().delete()
+            cache.clear()
+
+            yield
+        finally:
+            transaction.set_rollback(True)
+
+
+@contextmanager
+def _stubbed_esi(
+    systems: int, campaigns: int, now: datetime, revision: int
+) -> Iterator[None]:
+    """
+    Serve synthetic payloads instead of calling ESI
+
+    :param systems: Number of sovereignty systems
+    :type systems: int
+    :param campaigns: Number of campaigns
+    :type campaigns: int
+    :param now: The time the campaigns start around
+    :type now: datetime
+    :param revision: Revision of the payloads, see the fixtures
+    :type revision: int
+    :return:
+    :rtype:
+    """
+
+    with (
+        patch.object(
+            ESIHandler,
+            "get_sovereignty_systems",
+            return_value=sov_systems_payload(systems=systems, revision=revision),
+        ),
+        patch.object(
+            ESIHandler,
+            "get_sovereignty_campaigns",
+            return_value=campaigns_payload(
+                campaigns=campaigns, now=now, revision=revision
+            ),
+        ),
+        # All alliances exist in the database, ESI must never be asked for one
+        patch.object(ESIHandler, "get_alliance_names", return_value={}),
+        patch.object(ESIHandler, "get_alliances", return_value={}),
+    ):
+        yield
+
+
+def run_scale(systems: int, campaigns: int) -> dict[str, Any]:
+    """
+    Benchmark the sync tasks and the dashboard data view at one scale
+
+    Each task is measured for the initial sync into empty tables and for a later
+    sync where every tenth row changed. The query plans of the hot queries are
+    recorded after the syncs.
+
+    :param systems: Number of sovereignty systems
+    :type systems: int
+    :param campaigns: Number of campaigns, not more than systems
+    :type campaigns: int
+    :return:
+    :rtype:
+    """
+
+    now = timezone.now()
+    request = RequestFactory().get(reverse("sovtimer:dashboard_data_v2"))
+    request.user = AnonymousUser()
+
+    results = {"systems": systems, "campaigns": campaigns}
+
+    with _isolated():
+        create_database_fixtures(systems=systems)
+
+        for phase, revision in (("initial", 0), ("resync", 1)):
+            with _stubbed_esi(
+                systems=systems, campaigns=campaigns, now=now, revision=revision
+            ):
+                results[f"update_sov_structures_{phase}"] = measure(
+                    update_sov_structures, force_refresh=True
+                )
+                results[f"update_sov_campaigns_{phase}"] = measure(
+                    update_sov_campaigns, force_refresh=True
+                )
+
+        results["query_plans"] = query_plans()
+
+        # Without cached dashboard data, it's built by the first request
+        cache.clear()
+
+        results["dashboard_data_uncached"] = measure(dashboard_data_v2, request)
+        results["dashboard_data_cached"] = measure(dashboard_data_v2, request)
+
+    return results
+
+
+def run_benchmarks(
+    scales: Iterable[tuple[int, int]] = DEFAULT_SCALES,
+) -> dict[str, Any]:
+    """
+    Run the benchmarks at all scales
+
+    :param scales: (sovereignty systems, campaigns) per run
+    :type scales: Iterable[tuple[int, int]]
+    :return: The environment, the results per scale and the connection reuse of the ESI requests, ready to be dumped as JSON
+    :rtype: dict[str, Any]
+    """
+
+    return {
+        "environment": {
+            "sovtimer": __version__,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "database": connection.vendor,
+            "timestamp": timezone.now().isoformat(),
+        },
+        "results": [
+            run_scale(systems=systems, campaigns=campaigns)
+            for systems, campaigns in scales
+        ],
+        "connections": benchmark_connection_reuse(),
+    }
@@ -17,5 +17,63 @@ class Constants:
     TASK_ESI_MAX_RETRIES = 5
     TASK_DEFAULT_RETRY_DELAY = 180  # Retry after 3 minutes
 
+    # Maximum number of IDs ESI resolves in a single POST /universe/names/ request
+    ESI_UNIVERSE_NAMES_MAX_IDS = 1000
+
     TASK_STRUCTURE_CACHE_KEY = "sov_structures_task_run"
     TASK_STRUCTURE_CACHE_TTL = 300
+
+    # Leases of the update tasks, so only one worker runs each of them at a time
+    LEASE_CACHE_KEY = "sovtimer_lease"
+    LEASE_METRICS_CACHE_KEY = "sovtimer_lease_metrics"
+
+    # Adaptive scheduling, the update tasks schedule their next run just after the
+    # ESI data expires, all values in seconds
+    TASK_ESI_EXPIRY_CACHE_KEY = "sovtimer_task_esi_expiry"
+    TASK_ESI_EXPIRY_CACHE_TTL = 3600
+    TASK_NEXT_RUN_CACHE_KEY = "sovtimer_task_next_run"
+    TASK_ADAPTIVE_SCHEDULE_MARGIN = 2  # After the expiry
+    TASK_ADAPTIVE_SCHEDULE_JITTER = 10
+    TASK_ADAPTIVE_SCHEDULE_MIN_COUNTDOWN = 30
+    TASK_ADAPTIVE_SCHEDULE_MAX_COUNTDOWN = 900
+
+    # Governor of the ESI error limit, ESI allows 100 errors per 60 seconds and
+    # bans the IP when they're used up, all values in seconds unless noted
+    ESI_ERROR_LIMIT_CACHE_KEY = "sovtimer_esi_error_limit"
+    ESI_ERROR_LIMIT_METRICS_CACHE_KEY = "sovtimer_esi_error_limit_metrics"
+    ESI_ERROR_LIMIT_WINDOW = 60
+    ESI_ERROR_LIMIT_WINDOW_TOLERANCE = 2  # Between responses of the same window
+    ESI_ERROR_LIMIT_SLOW_DOWN_BELOW = 50  # Errors left
+    ESI_ERROR_LIMIT_PAUSE_BELOW = 10  # Errors left
+    ESI_ERROR_LIMIT_MAX_DELAY = 5  # Per request while slowed down
+
+    # Content hash of the last ESI payload processed by each update task, the
+    # tasks skip all database work while ESI returns the same payload
+    TASK_PAYLOAD_HASH_CACHE_KEY = "sovtimer_task_payload_hash"
+    TASK_PAYLOAD_HASH_CACHE_TTL = 3600  # Process at least once an hour regardless
+    TASK_PAYLOAD_HASH_METRICS_CACHE_KEY = "sovtimer_task_payload_hash_metrics"
+
+    # Campaigns starting within this time (in seconds) are considered upcoming
+    CAMPAIGN_UPCOMING_THRESHOLD = 14400  # 4 hours
+
+    # Precomputed dashboard data, bump the version when the format changes
+    DASHBOARD_DATA_CACHE_KEY = "sovtimer_dashboard_data_v4"
+    DASHBOARD_DATA_CACHE_TTL = 3600
+    DASHBOARD_DATA_CACHE_LOCK_TTL = 30
+    DASHBOARD_DATA_CACHE_LOCK_WAIT = 2
+
+    # Monotonic sync version of the dashboard data and the recent change sets,
+    # used to send clients only the campaigns that changed since their last update
+    DASHBOARD_SYNC_VERSION_CACHE_KEY = "sovtimer_dashboard_sync_version"
+    DASHBOARD_CHANGE_LOG_CACHE_KEY = "sovtimer_dashboard_change_log"
+    DASHBOARD_CHANGE_LOG_SIZE = 50
+
+    # Server-Sent Events for the dashboard, all values in seconds
+    DASHBOARD_SSE_POLL_INTERVAL = 5  # How often an open stream checks the cache
+    DASHBOARD_SSE_KEEPALIVE_INTERVAL = 15
+    DASHBOARD_SSE_MAX_LIFETIME = 300  # The browser reconnects after this
+    DASHBOARD_SSE_RETRY_INTERVAL = 5
+    # Every open stream holds one of SOVTIMER_DASHBOARD_SSE_MAX_STREAMS slots, the
+    # slot of a stream whose worker died expires after the margin
+    DASHBOARD_SSE_STREAM_SLOT_CACHE_KEY = "sovtimer_dashboard_sse_stream_slot"
+    DASHBOARD_SSE_STREAM_SLOT_MARGIN = 60
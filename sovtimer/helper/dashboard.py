@@ -0,0 +1,863 @@
+"""
+Dashboard data helper
+
+The dashboard data is built once per sync by the update tasks and stored in the
+cache, so the dashboard_data view doesn't have to query and render all campaigns
+on every request. Only the time-relative fields are computed per request.
+"""
+
+# Standard Library
+import hashlib
+import json
+import time
+from collections.abc import Iterator
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Any
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, QuerySet
+from django.templatetags.static import static
+from django.utils import timezone
+from django.utils.translation import get_language
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import override
+
+# Alliance Auth
+from allianceauth.eveonline.evelinks.eveimageserver import alliance_logo_url
+from allianceauth.eveonline.templatetags.evelinks import (
+    dotlan_alliance_url,
+    dotlan_region_url,
+)
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Sovereignty Timer
+from sovtimer.app_settings import dashboard_sse_max_streams
+from sovtimer.constants import Constants
+from sovtimer.models import Campaign
+from sovtimer.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+# Fields of the plain data rows sent as-is in the columnar format
+_COLUMNAR_FIELDS = (
+    "campaign_id",
+    "solar_system_id",
+    "solar_system_name",
+    "adm",
+    "start_time",
+    "progress_current",
+    "progress_previous",
+    "remaining_seconds",
+    "campaign_status",
+)
+
+# Fields of the plain data rows interned into lookup tables in the columnar format
+_COLUMNAR_LOOKUPS = ("region", "constellation", "defender")
+
+
+def _fmt_float_to_percentage(value: float) -> str:
+    """
+    Format a float value (0.0-1.0) as a percentage string with leading zero if <10%
+
+    :param value:
+    :type value:
+    :return:
+    :rtype:
+    """
+
+    pct = int(round(value * 100))
+    s = f"{pct}%"
+
+    if pct < 10:
+        s = "0" + s
+
+    return s
+
+
+def _cache_key(language_code: str | None = None) -> str:
+    """
+    Get the cache key for the dashboard data in the given language
+
+    The rendered data contains translated strings, so it is cached per language.
+
+    :param language_code: The language code, defaults to the active language
+    :type language_code: str | None
+    :return:
+    :rtype:
+    """
+
+    return f"{Constants.DASHBOARD_DATA_CACHE_KEY}_{language_code or get_language()}"
+
+
+def _campaign_progress_active_display(  # pylint: disable=too-many-arguments
+    *,
+    progress_previous: float,
+    progress_current: float,
+    prev_formatted: str,
+    curr_formatted: str,
+    constellation_id: int,
+) -> str:
+    """
+    Get the campaign progress HTML for an active campaign, including the trend icon
+    and the zKillboard link for the constellation
+
+    :param progress_previous:
+    :type progress_previous:
+    :param progress_current:
+    :type progress_current:
+    :param prev_formatted:
+    :type prev_formatted:
+    :param curr_formatted:
+    :type curr_formatted:
+    :param constellation_id:
+    :type constellation_id:
+    :return:
+    :rtype:
+    """
+
+    if progress_previous < progress_current:
+        title = _("Defenders making progress")
+        cls = "aa-sovtimer-trend-up"
+        icon_name = "trending_up"
+    elif progress_previous > progress_current:
+        title = _("Attackers making progress")
+        cls = "aa-sovtimer-trend-down"
+        icon_name = "trending_down"
+    else:
+        title = _("Neither side has made any progress yet")
+        cls = "aa-sovtimer-trend-flat"
+        icon_name = "trending_flat"
+
+    campaign_progress_icon = (
+        f'<i class="material-icons aa-sovtimer-trend {cls}" '
+        f'title="{title}" data-bs-tooltip="aa-sovtimer">{icon_name}</i>'
+    )
+
+    zkb_href = f"https://zkillboard.com/constellation/{constellation_id}/"
+    zkb_icon = (
+        f'<img src="{static("sovtimer/images/zkillboard.png")}" alt="zKillboard">'
+    )
+    constellation_killboard_link = (
+        f'<a href="{zkb_href}" target="_blank" rel="noopener noreferer" '
+        f'class="aa-sov-timer-zkb-icon ms-2">{zkb_icon}</a>'
+    )
+
+    return (
+        prev_formatted
+        + campaign_progress_icon
+        + curr_formatted
+        + constellation_killboard_link
+    )
+
+
+def _sync_version() -> int:
+    """
+    Get the current sync version of the dashboard data
+
+    :return:
+    :rtype:
+    """
+
+    return cache.get(Constants.DASHBOARD_SYNC_VERSION_CACHE_KEY, 0)
+
+
+def dashboard_campaigns() -> QuerySet:
+    """
+    Get the query for the campaigns shown on the dashboard
+
+    One query, the location, defender and ADM come with the structure join, and
+    the rows are plain dicts with the keys of the plain campaign data.
+
+    :return:
+    :rtype:
+    """
+
+    return Campaign.objects.filter(structure__isnull=False).values(
+        "campaign_id",
+        "start_time",
+        "progress_current",
+        "progress_previous",
+        solar_system_id=F("structure__solar_system_id"),
+        solar_system_name=F("structure__solar_system__name"),
+        constellation_id=F("structure__solar_system__constellation_id"),
+        constellation_name=F("structure__solar_system__constellation__name"),
+        region_id=F("structure__solar_system__constellation__region_id"),
+        region_name=F("structure__solar_system__constellation__region__name"),
+        defender_id=F("structure__alliance_id"),
+        defender_name=F("structure__alliance__name"),
+        adm=F("structure__vulnerability_occupancy_level"),
+    )
+
+
+def build_dashboard_data(  # pylint: disable=too-many-locals
+    sync_version: int | None = None,
+) -> dict[str, Any]:
+    """
+    Build the dashboard data from the database
+
+    Everything that doesn't depend on the current time is computed here. The
+    returned dict holds the campaigns as rendered table rows ("campaigns") and as
+    plain data ("campaign_data", rendered client-side), a version hash of their
+    data and the sync version they belong to.
+
+    :param sync_version: The sync version, defaults to the current one
+    :type sync_version: int | None
+    :return:
+    :rtype:
+    """
+
+    campaigns = []
+    campaign_data = []
+
+    sovereignty_campaigns = dashboard_campaigns()
+
+    for campaign in sovereignty_campaigns:
+        # Activity defense multiplier, 1 when the structure has none
+        campaign["adm"] = adm = campaign["adm"] or 1
+
+        campaign_data.append(campaign)
+
+        # Defender
+        defender_name = campaign["defender_name"]
+        defender_url = dotlan_alliance_url(eve_obj=campaign["defender_id"])
+        defender_logo_url = alliance_logo_url(
+            alliance_id=campaign["defender_id"], size=32
+        )
+        defender_name_html = (
+            f'<a href="{defender_url}" target="_blank" rel="noopener noreferer">'
+            f'<img class="aa-sovtimer-entity-logo-left me-2" src="{defender_logo_url}" '
+            f'alt="{defender_name}">{defender_name}</a>'
+        )
+
+        # Region / System / Constellation URLs and HTML (compute region_url once)
+        region_url = dotlan_region_url(eve_obj=campaign["region_id"])
+        campaign_system_name = campaign["solar_system_name"]
+        solar_system_url = f"{region_url}/{campaign_system_name}"
+        solar_system_name_html = f'<a href="{solar_system_url}" target="_blank" rel="noopener noreferer">{campaign_system_name}</a>'
+
+        constellation_name = campaign["constellation_name"]
+        constellation_url = f"{region_url}/{constellation_name}"
+        constellation_name_html = f'<a href="{constellation_url}" target="_blank" rel="noopener noreferer">{constellation_name}</a>'
+
+        region_name = campaign["region_name"]
+        region_name_html = f'<a href="{region_url}" target="_blank" rel="noopener noreferer">{region_name}</a>'
+
+        # Progress formatting
+        prev_formatted = _fmt_float_to_percentage(campaign["progress_previous"])
+        curr_formatted = _fmt_float_to_percentage(campaign["progress_current"])
+
+        campaigns.append(
+            {
+                "campaign_id": campaign["campaign_id"],
+                "solar_system": {
+                    "display": solar_system_name_html,
+                    "sort": campaign_system_name,
+                },
+                "constellation": {
+                    "display": constellation_name_html,
+                    "sort": constellation_name,
+                },
+                "region": {
+                    "display": region_name_html,
+                    "sort": region_name,
+                },
+                "defender": {
+                    "display": defender_name_html,
+                    "sort": defender_name,
+                },
+                "adm": f"{adm:.1f}",
+                "start_time": campaign["start_time"],
+                "campaign_progress": {
+                    "current": campaign["progress_current"],
+                    "previous": campaign["progress_previous"],
+                    "display": curr_formatted,
+                },
+                # Only shown once the campaign is active
+                "campaign_progress_active_display": (
+                    _campaign_progress_active_display(
+                        progress_previous=campaign["progress_previous"],
+                        progress_current=campaign["progress_current"],
+                        prev_formatted=prev_formatted,
+                        curr_formatted=curr_formatted,
+                        constellation_id=campaign["constellation_id"],
+                    )
+                ),
+            }
+        )
+
+    version = hashlib.sha256(
+        json.dumps(campaign_data, cls=DjangoJSONEncoder, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+    return {
+        "version": version,
+        "sync_version": (_sync_version() if sync_version is None else sync_version),
+        "campaigns": campaigns,
+        "campaign_data": campaign_data,
+    }
+
+
+def _record_change_set(
+    previous_data: dict[str, Any] | None, dashboard_data: dict[str, Any]
+) -> int:
+    """
+    Bump the sync version and add the campaigns that changed to the change log
+
+    Without previous data to compare with, a reset is recorded, and clients
+    that are older than this sync version get the full data again.
+
+    :param previous_data: The previously cached dashboard data, if any
+    :type previous_data: dict[str, Any] | None
+    :param dashboard_data: The new dashboard data
+    :type dashboard_data: dict[str, Any]
+    :return: The new sync version
+    :rtype: int
+    """
+
+    cache.add(Constants.DASHBOARD_SYNC_VERSION_CACHE_KEY, 0, timeout=None)
+    sync_version = cache.incr(Constants.DASHBOARD_SYNC_VERSION_CACHE_KEY)
+
+    if previous_data is None:
+        change_set = {"sync_version": sync_version, "reset": True}
+    else:
+        previous_campaigns = {
+            campaign["campaign_id"]: campaign for campaign in previous_data["campaigns"]
+        }
+        campaigns = {
+            campaign["campaign_id"]: campaign
+            for campaign in dashboard_data["campaigns"]
+        }
+
+        change_set = {
+            "sync_version": sync_version,
+            "changed": [
+                campaign_id
+                for campaign_id, campaign in campaigns.items()
+                if previous_campaigns.get(campaign_id) != campaign
+            ],
+            "removed": [
+                campaign_id
+                for campaign_id in previous_campaigns
+                if campaign_id not in campaigns
+            ],
+        }
+
+    change_log = cache.get(Constants.DASHBOARD_CHANGE_LOG_CACHE_KEY, [])
+    change_log = [*change_log, change_set][-Constants.DASHBOARD_CHANGE_LOG_SIZE :]
+
+    cache.set(
+        key=Constants.DASHBOARD_CHANGE_LOG_CACHE_KEY, value=change_log, timeout=None
+    )
+
+    return sync_version
+
+
+def update_dashboard_data_cache() -> dict[str, Any]:
+    """
+    Rebuild the dashboard data and store it in the cache
+
+    Called by the update tasks after each sync. When the data changed, the sync
+    version is bumped and the changed campaigns are recorded. Cached data in other
+    languages is dropped and rebuilt on their next request.
+
+    :return:
+    :rtype:
+    """
+
+    previous_data = cache.get(_cache_key())
+
+    cache.delete_many(
+        keys=[_cache_key(language_code) for language_code, _ in settings.LANGUAGES]
+    )
+
+    dashboard_data = build_dashboard_data()
+
+    if previous_data is None or previous_data["version"] != dashboard_data["version"]:
+        dashboard_data["sync_version"] = _record_change_set(
+            previous_data=previous_data, dashboard_data=dashboard_data
+        )
+
+    cache.set(
+        key=_cache_key(),
+        value=dashboard_data,
+        timeout=Constants.DASHBOARD_DATA_CACHE_TTL,
+    )
+
+    logger.debug(f"Dashboard data cache updated, version {dashboard_data['version']}")
+
+    return dashboard_data
+
+
+def get_dashboard_data() -> dict[str, Any]:
+    """
+    Get the dashboard data from the cache
+
+    On a cache miss, only one process rebuilds the data, guarded by a lock in the
+    cache. Everyone else waits a moment for it to appear and only builds the data
+    on their own (without caching it) when that takes too long.
+
+    :return:
+    :rtype:
+    """
+
+    cache_key = _cache_key()
+    dashboard_data = cache.get(cache_key)
+
+    if dashboard_data is not None:
+        return dashboard_data
+
+    lock_key = f"{cache_key}_lock"
+
+    if cache.add(lock_key, True, timeout=Constants.DASHBOARD_DATA_CACHE_LOCK_TTL):
+        try:
+            dashboard_data = build_dashboard_data()
+
+            cache.set(
+                key=cache_key,
+                value=dashboard_data,
+                timeout=Constants.DASHBOARD_DATA_CACHE_TTL,
+            )
+        finally:
+            cache.delete(lock_key)
+
+        return dashboard_data
+
+    # Someone else is rebuilding the data, wait for it
+    deadline = time.monotonic() + Constants.DASHBOARD_DATA_CACHE_LOCK_WAIT
+
+    while time.monotonic() < deadline:
+        time.sleep(0.05)
+
+        dashboard_data = cache.get(cache_key)
+
+        if dashboard_data is not None:
+            return dashboard_data
+
+    logger.debug("Timed out waiting for the dashboard data, building it uncached.")
+
+    return build_dashboard_data()
+
+
+def campaign_status(remaining_time_in_seconds: float) -> str:
+    """
+    Get the status of a campaign from the time remaining until it starts
+
+    :param remaining_time_in_seconds:
+    :type remaining_time_in_seconds:
+    :return:
+    :rtype:
+    """
+
+    if remaining_time_in_seconds < 0:
+        return "active"
+
+    if remaining_time_in_seconds <= Constants.CAMPAIGN_UPCOMING_THRESHOLD:
+        return "upcoming"
+
+    return "inactive"
+
+
+def _changes_token(sync_version: int, timestamp: datetime) -> str:
+    """
+    Get the token a client sends to get the changes since its last update
+
+    :param sync_version:
+    :type sync_version:
+    :param timestamp: The time the campaign statuses were last sent
+    :type timestamp: datetime
+    :return:
+    :rtype:
+    """
+
+    return f"{sync_version}:{int(timestamp.timestamp())}"
+
+
+def dashboard_changes(
+    since: str,
+    now: datetime | None = None,
+    schema: int = 1,
+    dashboard_data: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Get the campaigns that were added, changed or removed since the given token
+
+    Besides the campaigns changed by a sync, campaigns that became upcoming or
+    active since then are returned as changed. When the token is invalid or too
+    old for the change log, all rows are returned with "full" set.
+
+    :param since: The token of the client's last update
+    :type since: str
+    :param now: The current time, defaults to now
+    :type now: datetime | None
+    :param schema: 1 for rendered table rows, 2 for plain data rows
+    :type schema: int
+    :param dashboard_data: The dashboard data, read from the cache if not given
+    :type dashboard_data: dict[str, Any] | None
+    :return:
+    :rtype:
+    """
+
+    now = now or timezone.now()
+    dashboard_data = dashboard_data or get_dashboard_data()
+    rows = dashboard_rows(dashboard_data, now=now, schema=schema)
+    sync_version = dashboard_data["sync_version"]
+
+    full_data = {
+        "full": True,
+        "token": _changes_token(sync_version=sync_version, timestamp=now),
+        "rows": rows,
+    }
+
+    try:
+        since_version, since_timestamp = (int(part) for part in since.split(":"))
+        since_time = datetime.fromtimestamp(since_timestamp, tz=dt_timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        return full_data
+
+    if since_version > sync_version or since_time > now:
+        return full_data
+
+    changed_ids = set()
+    removed_ids = set()
+
+    if since_version < sync_version:
+        change_sets = [
+            change_set
+            for change_set in cache.get(Constants.DASHBOARD_CHANGE_LOG_CACHE_KEY, [])
+            if since_version < change_set["sync_version"] <= sync_version
+        ]
+
+        # The change log doesn't reach back far enough
+        if len(change_sets) != sync_version - since_version or any(
+            change_set.get("reset") for change_set in change_sets
+        ):
+            return full_data
+
+        for change_set in change_sets:
+            changed_ids.update(change_set["changed"])
+            removed_ids.update(change_set["removed"])
+
+    # Campaigns that became upcoming or active since the last update
+    status_changed_ids = {
+        row["campaign_id"]
+        for row in rows
+        if campaign_status((row["start_time"] - since_time).total_seconds())
+        != row["campaign_status"]
+    }
+    changed_ids.update(status_changed_ids)
+
+    current_ids = {row["campaign_id"] for row in rows}
+
+    return {
+        "full": False,
+        # Keep the token when nothing changed, so the response stays the same
+        "token": _changes_token(
+            sync_version=sync_version,
+            timestamp=now if status_changed_ids else since_time,
+        ),
+        "changed": [row for row in rows if row["campaign_id"] in changed_ids],
+        "removed": sorted((removed_ids | changed_ids) - current_ids),
+    }
+
+
+def dashboard_etag(
+    dashboard_data: dict[str, Any],
+    rows: list[dict[str, Any]],
+    variant: str = "",
+    since: str | None = None,
+) -> str:
+    """
+    Get a strong ETag for the dashboard rows
+
+    The ETag is derived from the data version and the campaign status of each row,
+    so it changes with every sync that changes the data and whenever a campaign
+    becomes upcoming or active. The remaining time is counted down client-side and
+    is not part of the ETag.
+
+    The changes since a token, see dashboard_changes, only depend on the token,
+    the sync version and the campaign statuses as well, so their ETag is known
+    before they're collected.
+
+    The dashboard data is cached per language, so is the ETag, a client switching
+    its language doesn't get a 304 for the rows in the previous one.
+
+    :param dashboard_data: The dashboard data as returned by get_dashboard_data
+    :type dashboard_data: dict[str, Any]
+    :param rows: The rows as returned by dashboard_rows
+    :type rows: list[dict[str, Any]]
+    :param variant: The response format, if it differs from the default
+    :type variant: str
+    :param since: The token of the client's last update, for the changes since then
+    :type since: str | None
+    :return:
+    :rtype:
+    """
+
+    statuses = ",".join(row["campaign_status"] for row in rows)
+    etag_source = f"{get_language()}:{dashboard_data['version']}:{statuses}"
+
+    if since is not None:
+        etag_source = f"{dashboard_data['sync_version']}:{since}:{etag_source}"
+
+    if variant:
+        etag_source = f"{variant}:{etag_source}"
+
+    etag = hashlib.sha256(etag_source.encode("utf-8")).hexdigest()
+
+    return f'"{etag[:32]}"'
+
+
+def dashboard_rows(
+    dashboard_data: dict[str, Any], now: datetime | None = None, schema: int = 1
+) -> list[dict[str, Any]]:
+    """
+    Get the table rows for the dashboard, adding the time-relative fields
+
+    :param dashboard_data: The dashboard data as returned by get_dashboard_data
+    :type dashboard_data: dict[str, Any]
+    :param now: The current time, defaults to now
+    :type now: datetime | None
+    :param schema: 1 for rendered table rows, 2 for plain data rows
+    :type schema: int
+    :return:
+    :rtype:
+    """
+
+    now = now or timezone.now()
+    rows = []
+
+    if schema == 2:
+        for campaign in dashboard_data["campaign_data"]:
+            remaining_time_in_seconds = (campaign["start_time"] - now).total_seconds()
+
+            rows.append(
+                {
+                    **campaign,
+                    "remaining_seconds": remaining_time_in_seconds,
+                    "campaign_status": campaign_status(remaining_time_in_seconds),
+                }
+            )
+
+        return rows
+
+    for campaign in dashboard_data["campaigns"]:
+        row = dict(campaign)
+        progress_active_display = row.pop("campaign_progress_active_display")
+
+        remaining_time_in_seconds = (campaign["start_time"] - now).total_seconds()
+        status = campaign_status(remaining_time_in_seconds)
+
+        if status == "active":
+            row["campaign_progress"] = {
+                **campaign["campaign_progress"],
+                "display": progress_active_display,
+            }
+
+        row["remaining_time"] = {"display": "", "seconds": remaining_time_in_seconds}
+        row["campaign_status"] = status
+
+        rows.append(row)
+
+    return rows
+
+
+def dashboard_columnar(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Get plain data rows (schema 2) in columnar form
+
+    Every field is sent as one array, region, constellation and defender are
+    deduplicated into lookup tables of [id, name] and referenced by index, since
+    most campaigns share them.
+
+    :param rows: The rows as returned by dashboard_rows with schema 2
+    :type rows: list[dict[str, Any]]
+    :return:
+    :rtype:
+    """
+
+    lookups = {name: [] for name in _COLUMNAR_LOOKUPS}
+    lookup_indexes = {name: {} for name in _COLUMNAR_LOOKUPS}
+    columns = {field: [] for field in _COLUMNAR_FIELDS + _COLUMNAR_LOOKUPS}
+
+    for row in rows:
+        for field in _COLUMNAR_FIELDS:
+            columns[field].append(row[field])
+
+        for name in _COLUMNAR_LOOKUPS:
+            entity_id = row[f"{name}_id"]
+            index = lookup_indexes[name].get(entity_id)
+
+            if index is None:
+                index = lookup_indexes[name][entity_id] = len(lookups[name])
+                lookups[name].append([entity_id, row[f"{name}_name"]])
+
+            columns[name].append(index)
+
+    return {"length": len(rows), "lookups": lookups, "columns": columns}
+
+
+def _row_without_remaining_time(row: dict[str, Any] | None) -> dict[str, Any] | None:
+    """
+    Get a row without its remaining time, which changes with every request
+
+    :param row:
+    :type row:
+    :return:
+    :rtype:
+    """
+
+    if row is None:
+        return None
+
+    return {
+        key: value
+        for key, value in row.items()
+        if key not in ("remaining_time", "remaining_seconds")
+    }
+
+
+def dashboard_delta(
+    previous_rows: dict[int, dict[str, Any]], rows: list[dict[str, Any]]
+) -> dict[str, list]:
+    """
+    Get the rows that changed or were removed since the previous rows
+
+    The remaining time is counted down client-side and doesn't count as a change.
+
+    :param previous_rows: The previously sent rows, mapped by campaign ID
+    :type previous_rows: dict[int, dict[str, Any]]
+    :param rows: The current rows as returned by dashboard_rows
+    :type rows: list[dict[str, Any]]
+    :return:
+    :rtype:
+    """
+
+    current_ids = {row["campaign_id"] for row in rows}
+
+    return {
+        "changed": [
+            row
+            for row in rows
+            if _row_without_remaining_time(previous_rows.get(row["campaign_id"]))
+            != _row_without_remaining_time(row)
+        ],
+        "removed": [
+            campaign_id
+            for campaign_id in previous_rows
+            if campaign_id not in current_ids
+        ],
+    }
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """
+    Format a Server-Sent Event
+
+    :param event:
+    :type event:
+    :param data:
+    :type data:
+    :return:
+    :rtype:
+    """
+
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+def acquire_dashboard_event_stream_slot() -> str | None:
+    """
+    Claim one of the slots for an open Server-Sent Events stream
+
+    A slot is a cache key, claimed atomically with cache.add and shared by all web
+    workers. It's released when the stream ends, and expires shortly after the
+    longest a stream can last, should its worker die.
+
+    :return: The cache key of the slot, None if all slots are taken
+    :rtype: str | None
+    """
+
+    for slot in range(dashboard_sse_max_streams()):
+        cache_key = f"{Constants.DASHBOARD_SSE_STREAM_SLOT_CACHE_KEY}_{slot}"
+
+        if cache.add(
+            key=cache_key,
+            value=True,
+            timeout=Constants.DASHBOARD_SSE_MAX_LIFETIME
+            + Constants.DASHBOARD_SSE_STREAM_SLOT_MARGIN,
+        ):
+            return cache_key
+
+    return None
+
+
+def dashboard_event_stream(
+    language_code: str, slot: str | None = None
+) -> Iterator[str]:
+    """
+    Stream the dashboard updates as Server-Sent Events
+
+    The stream starts with a "snapshot" event holding all rows, followed by "delta"
+    events with the changed and removed rows whenever the cached dashboard data
+    changes or a campaign changes its status. All open streams read the same
+    cached data, so they don't cause any database queries. The stream ends after
+    a while and the browser reconnects, so no worker is blocked forever.
+
+    :param language_code: The language to render the rows in
+    :type language_code: str
+    :param slot: The slot of the stream, see acquire_dashboard_event_stream_slot, released when the stream ends
+    :type slot: str | None
+    :return:
+    :rtype:
+    """
+
+    try:
+        yield from _dashboard_events(language_code=language_code)
+    finally:
+        if slot is not None:
+            cache.delete(slot)
+
+
+def _dashboard_events(language_code: str) -> Iterator[str]:
+    """
+    Generate the Server-Sent Events of a stream, see dashboard_event_stream
+
+    :param language_code: The language to render the rows in
+    :type language_code: str
+    :return:
+    :rtype:
+    """
+
+    with override(language_code):
+        started = time.monotonic()
+        last_sent = started
+
+        yield f"retry: {Constants.DASHBOARD_SSE_RETRY_INTERVAL * 1000}\n\n"
+
+        rows = dashboard_rows(get_dashboard_data(), schema=2)
+        sent_rows = {row["campaign_id"]: row for row in rows}
+
+        yield _sse_event("snapshot", rows)
+
+        while time.monotonic() - started < Constants.DASHBOARD_SSE_MAX_LIFETIME:
+            time.sleep(Constants.DASHBOARD_SSE_POLL_INTERVAL)
+
+            rows = dashboard_rows(get_dashboard_data(), schema=2)
+            delta = dashboard_delta(sent_rows, rows)
+
+            if delta["changed"] or delta["removed"]:
+                sent_rows = {row["campaign_id"]: row for row in rows}
+                last_sent = time.monotonic()
+
+                yield _sse_event("delta", delta)
+            elif (
+                time.monotonic() - last_sent
+                >= Constants.DASHBOARD_SSE_KEEPALIVE_INTERVAL
+            ):
+                last_sent = time.monotonic()
+
+                # Comment line, keeps proxies from closing the idle connection
+                yield ": keepalive\n\n"
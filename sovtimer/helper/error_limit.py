@@ -0,0 +1,228 @@
+"""
+Governor of the ESI error limit
+
+ESI allows a limited number of failed requests per time window to every IP, see
+https://developers.eveonline.com/docs/services/esi/best-practices/#error-limit,
+and bans the IP when it runs out of this error budget, which takes out every
+app of the Auth install sharing it.
+
+Every ESI response tells the remaining budget and when the window resets in the
+`X-ESI-Error-Limit-Remain` and `X-ESI-Error-Limit-Reset` headers. They're kept
+in the cache, shared by all processes, and while the budget runs low the ESI
+requests of this app are slowed down, spreading the remaining budget over the
+rest of the window, and paused altogether just before it's used up.
+"""
+
+# Standard Library
+import time
+from collections.abc import Mapping
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+# Third Party
+from httpx import Headers
+
+# Django
+from django.core.cache import cache
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Sovereignty Timer
+from sovtimer.constants import Constants
+from sovtimer.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+# Counters of the requests the governor held back
+ERROR_LIMIT_METRICS = ("slowed", "paused")
+
+
+def _metric_cache_key(metric: str) -> str:
+    """
+    Get the cache key of a governor metric
+
+    :param metric: The metric
+    :type metric: str
+    :return:
+    :rtype:
+    """
+
+    return f"{Constants.ESI_ERROR_LIMIT_METRICS_CACHE_KEY}_{metric}"
+
+
+def _increment_metric(metric: str) -> None:
+    """
+    Increment a governor metric
+
+    :param metric: The metric
+    :type metric: str
+    :return:
+    :rtype:
+    """
+
+    key = _metric_cache_key(metric=metric)
+
+    cache.add(key, 0, timeout=None)
+    cache.incr(key)
+
+
+def _remember(remain: int, reset: float) -> None:
+    """
+    Remember the remaining error budget of the current window
+
+    Responses of the same window, which resets at about the same time, can arrive
+    in any order from several processes, so the lowest budget seen is kept.
+
+    :param remain: The remaining error budget
+    :type remain: int
+    :param reset: Seconds until the window resets
+    :type reset: float
+    :return:
+    :rtype:
+    """
+
+    reset_at = time.time() + reset
+    previous = cache.get(Constants.ESI_ERROR_LIMIT_CACHE_KEY)
+
+    if (
+        previous
+        and abs(previous["reset_at"] - reset_at)
+        <= Constants.ESI_ERROR_LIMIT_WINDOW_TOLERANCE
+    ):
+        remain = min(remain, previous["remain"])
+
+    cache.set(
+        key=Constants.ESI_ERROR_LIMIT_CACHE_KEY,
+        value={"remain": remain, "reset_at": reset_at},
+        # Forgotten once the window resets, the budget is full again
+        timeout=max(1, int(reset) + 1),
+    )
+
+
+def remember_error_limit(headers: Mapping[str, str] | None) -> None:
+    """
+    Remember the remaining error budget from the headers of an ESI response
+
+    :param headers: The response headers
+    :type headers: Mapping[str, str] | None
+    :return:
+    :rtype:
+    """
+
+    headers = Headers(headers or {})
+
+    try:
+        remain = int(headers["x-esi-error-limit-remain"])
+        reset = float(headers["x-esi-error-limit-reset"])
+    except (KeyError, ValueError):
+        return
+
+    # Responses served from django-esi's cache keep the headers of the request
+    # that fetched them, their window reset counts from when ESI answered
+    try:
+        answered_at = parsedate_to_datetime(headers["date"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        answered_at = None
+
+    if answered_at is not None:
+        reset -= max(0.0, time.time() - answered_at)
+
+    # The window already reset since
+    if reset <= 0:
+        return
+
+    _remember(remain=remain, reset=reset)
+
+
+def remember_error_limit_exceeded(reset: float | None) -> None:
+    """
+    Remember that ESI reported the error limit as exceeded
+
+    :param reset: Seconds until the window resets, if known
+    :type reset: float | None
+    :return:
+    :rtype:
+    """
+
+    _remember(remain=0, reset=reset or Constants.ESI_ERROR_LIMIT_WINDOW)
+
+
+def error_limit_state() -> dict[str, Any]:
+    """
+    Get the state of the governor
+
+    :return: The remaining error budget (None if unknown), seconds until the window resets, whether requests are "normal", "slowed" or "paused", the delay per request, and the number of requests slowed down and paused so far
+    :rtype: dict[str, Any]
+    """
+
+    budget = cache.get(Constants.ESI_ERROR_LIMIT_CACHE_KEY)
+    metrics = cache.get_many(
+        [_metric_cache_key(metric=metric) for metric in ERROR_LIMIT_METRICS]
+    )
+    state = {
+        "remain": None,
+        "reset_in": 0.0,
+        "mode": "normal",
+        "delay": 0.0,
+        **{
+            metric: metrics.get(_metric_cache_key(metric=metric), 0)
+            for metric in ERROR_LIMIT_METRICS
+        },
+    }
+
+    if budget is None or budget["reset_at"] <= time.time():
+        return state
+
+    state["remain"] = budget["remain"]
+    state["reset_in"] = budget["reset_at"] - time.time()
+
+    if budget["remain"] <= Constants.ESI_ERROR_LIMIT_PAUSE_BELOW:
+        state["mode"] = "paused"
+        state["delay"] = state["reset_in"]
+    elif budget["remain"] <= Constants.ESI_ERROR_LIMIT_SLOW_DOWN_BELOW:
+        # Spread the budget left before the pause over the rest of the window
+        state["mode"] = "slowed"
+        state["delay"] = min(
+            state["reset_in"]
+            / (budget["remain"] - Constants.ESI_ERROR_LIMIT_PAUSE_BELOW),
+            Constants.ESI_ERROR_LIMIT_MAX_DELAY,
+        )
+
+    return state
+
+
+def wait_for_error_budget(operation_id: str) -> bool:
+    """
+    Wait before an ESI request while the error budget runs low
+
+    :param operation_id: The ESI operation ID, for logging
+    :type operation_id: str
+    :return: Whether the request may be made, False while paused
+    :rtype: bool
+    """
+
+    state = error_limit_state()
+
+    if state["mode"] == "paused":
+        _increment_metric(metric="paused")
+
+        logger.warning(
+            f"ESI error limit almost reached ({state['remain']} errors left), "
+            f"skipping {operation_id} until it resets in "
+            f"{state['reset_in']:.0f} seconds."
+        )
+
+        return False
+
+    if state["mode"] == "slowed":
+        _increment_metric(metric="slowed")
+
+        logger.info(
+            f"ESI error limit running low ({state['remain']} errors left), "
+            f"delaying {operation_id} by {state['delay']:.1f} seconds."
+        )
+
+        time.sleep(state["delay"])
+
+    return True
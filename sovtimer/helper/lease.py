@@ -0,0 +1,315 @@
+"""
+Leases, held by at most one worker at a time across all Celery nodes
+
+A lease is a cache key holding the token of its owner. It's acquired atomically
+with cache.add (SET NX on Redis), expires after its TTL should the owner die, and
+is only released by its owner, even when it expired in the meantime and was
+acquired by someone else.
+
+Every attempt is counted per lease, with the time it took, so the contention
+between workers can be monitored, see lease_metrics.
+"""
+
+# Standard Library
+import os
+import socket
+import time
+from collections.abc import Callable
+from functools import wraps
+from typing import Any
+from uuid import uuid4
+
+# Third Party
+from redis.exceptions import WatchError
+
+# Django
+from django.core.cache import cache
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+from allianceauth.utils.cache import get_redis_client
+
+# AA Sovereignty Timer
+from sovtimer.constants import Constants
+from sovtimer.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+# Counters kept per lease, "acquisition_us" is the summed duration of all attempts
+LEASE_METRICS = ("acquired", "contended", "expired", "acquisition_us")
+
+
+def _cache_key(name: str) -> str:
+    """
+    Get the cache key of a lease
+
+    :param name: The name of the lease
+    :type name: str
+    :return:
+    :rtype:
+    """
+
+    return f"{Constants.LEASE_CACHE_KEY}_{name}"
+
+
+def _metric_cache_key(name: str, metric: str) -> str:
+    """
+    Get the cache key of a lease metric
+
+    :param name: The name of the lease
+    :type name: str
+    :param metric: The metric
+    :type metric: str
+    :return:
+    :rtype:
+    """
+
+    return f"{Constants.LEASE_METRICS_CACHE_KEY}_{name}_{metric}"
+
+
+def _increment_metric(name: str, metric: str, delta: int = 1) -> None:
+    """
+    Increment a lease metric
+
+    :param name: The name of the lease
+    :type name: str
+    :param metric: The metric
+    :type metric: str
+    :param delta: The value to add
+    :type delta: int
+    :return:
+    :rtype:
+    """
+
+    key = _metric_cache_key(name=name, metric=metric)
+
+    cache.add(key, 0, timeout=None)
+    cache.incr(key, delta)
+
+
+def _delete_if_equal(key: str, value: str) -> bool:
+    """
+    Delete a cache key if it holds the given value
+
+    Atomic on Redis, where the key is watched during the comparison, best effort on
+    other cache backends, e.g. the local memory cache of the benchmarks.
+
+    :param key: The cache key
+    :type key: str
+    :param value: The expected value
+    :type value: str
+    :return: Whether the key was deleted
+    :rtype: bool
+    """
+
+    try:
+        client = get_redis_client()
+    except NotImplementedError:
+        if cache.get(key) != value:
+            return False
+
+        cache.delete(key)
+
+        return True
+
+    redis_key = cache.make_key(key)
+
+    with client.pipeline() as pipe:
+        try:
+            pipe.watch(redis_key)
+
+            current_value = pipe.get(redis_key)
+
+            if current_value is None or cache.client.decode(current_value) != value:
+                return False
+
+            pipe.multi()
+            pipe.delete(redis_key)
+            pipe.execute()
+        except WatchError:
+            # Changed in between, so it's not ours anymore
+            return False
+
+    return True
+
+
+class Lease:
+    """
+    A lease on a named resource, see the module docstring
+
+    Use it as context manager and check `acquired`:
+
+    ```python
+    with Lease(name="update_sov_structures", ttl=600) as lease:
+        if lease.acquired:
+            ...
+    ```
+    """
+
+    def __init__(self, name: str, ttl: int):
+        """
+        Initialize the lease
+
+        :param name: The name of the resource
+        :type name: str
+        :param ttl: Seconds until the lease expires when it isn't released
+        :type ttl: int
+        """
+
+        self.name = name
+        self.ttl = ttl
+        # The owner, readable for humans, and unique per lease
+        self.token = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex}"
+        self.acquired = False
+
+    def acquire(self) -> bool:
+        """
+        Try to acquire the lease, without waiting for it
+
+        :return: Whether the lease was acquired
+        :rtype: bool
+        """
+
+        started = time.perf_counter()
+        self.acquired = cache.add(
+            _cache_key(name=self.name), self.token, timeout=self.ttl
+        )
+        acquisition_us = round((time.perf_counter() - started) * 1_000_000)
+
+        _increment_metric(
+            name=self.name, metric="acquired" if self.acquired else "contended"
+        )
+        _increment_metric(name=self.name, metric="acquisition_us", delta=acquisition_us)
+
+        if not self.acquired:
+            logger.info(
+                f"Lease {self.name} is held by {lease_holder(name=self.name)}, "
+                "skipping."
+            )
+
+        return self.acquired
+
+    def release(self) -> bool:
+        """
+        Release the lease, when it's still held by this owner
+
+        :return: Whether the lease was released, False if it wasn't acquired or already expired
+        :rtype: bool
+        """
+
+        if not self.acquired:
+            return False
+
+        self.acquired = False
+
+        if _delete_if_equal(key=_cache_key(name=self.name), value=self.token):
+            return True
+
+        _increment_metric(name=self.name, metric="expired")
+
+        logger.warning(
+            f"Lease {self.name} expired after {self.ttl} seconds before it was "
+            "released, it might have been held by two owners at once."
+        )
+
+        return False
+
+    def __enter__(self) -> "Lease":
+        """
+        Try to acquire the lease
+
+        :return:
+        :rtype:
+        """
+
+        self.acquire()
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Release the lease
+
+        :param exc_info:
+        :return:
+        :rtype:
+        """
+
+        self.release()
+
+
+def with_lease(ttl: int) -> Callable:
+    """
+    Decorate a function to only run while holding the lease named after it,
+    returning None without running it when the lease is held by someone else
+
+    :param ttl: Seconds until the lease expires, not shorter than the function may run
+    :type ttl: int
+    :return:
+    :rtype:
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs) -> Any:
+            with Lease(name=func.__name__, ttl=ttl) as lease:
+                if not lease.acquired:
+                    return None
+
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def lease_holder(name: str) -> str | None:
+    """
+    Get the owner currently holding a lease
+
+    :param name: The name of the lease
+    :type name: str
+    :return: The token of the owner as host:pid:id, or None if the lease is free
+    :rtype: str | None
+    """
+
+    return cache.get(_cache_key(name=name))
+
+
+def lease_metrics(names: tuple[str, ...]) -> dict[str, dict[str, Any]]:
+    """
+    Get the holders and the metrics of leases
+
+    :param names: The names of the leases
+    :type names: tuple[str, ...]
+    :return:
+    :rtype:
+    """
+
+    keys = {
+        (name, metric): _metric_cache_key(name=name, metric=metric)
+        for name in names
+        for metric in LEASE_METRICS
+    }
+    values = cache.get_many(keys.values())
+    holders = cache.get_many([_cache_key(name=name) for name in names])
+
+    metrics = {}
+
+    for name in names:
+        counters = {
+            metric: values.get(keys[(name, metric)], 0) for metric in LEASE_METRICS
+        }
+        attempts = counters["acquired"] + counters["contended"]
+
+        metrics[name] = {
+            "holder": holders.get(_cache_key(name=name)),
+            "acquired": counters["acquired"],
+            "contended": counters["contended"],
+            "expired": counters["expired"],
+            "avg_acquisition_ms": (
+                counters["acquisition_us"] / attempts / 1000 if attempts else 0.0
+            ),
+        }
+
+    return metrics
@@ -0,0 +1,190 @@
+"""
+Content hashes of the ESI payloads processed by the update tasks
+
+The tasks keep the hash of the last payload they processed and skip all database
+work when ESI returns the same payload again, even when the ETag isn't available
+anymore, e.g. because it was evicted from the cache.
+"""
+
+# Standard Library
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any
+
+# Django
+from django.core.cache import cache
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Sovereignty Timer
+from sovtimer.constants import Constants
+from sovtimer.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+# Counters kept per payload, "time_saved_ms" is the summed duration of the
+# processing runs that were skipped
+PAYLOAD_HASH_METRICS = ("hits", "misses", "time_saved_ms")
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Serialize the values json doesn't know, ESI returns pydantic models
+
+    :param obj: The value to serialize
+    :type obj: Any
+    :return:
+    :rtype:
+    """
+
+    if callable(getattr(type(obj), "model_dump", None)):
+        return obj.model_dump(mode="json")
+
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+
+    # Unknown objects hash by their representation, which never matches
+    # across runs for objects without a meaningful one, so they're never skipped
+    return repr(obj)
+
+
+def payload_hash(payload: Any) -> str:
+    """
+    Get the content hash of an ESI payload
+
+    :param payload: The payload as returned from ESI
+    :type payload: Any
+    :return:
+    :rtype:
+    """
+
+    return hashlib.sha256(
+        json.dumps(payload, default=_json_default, sort_keys=True).encode("utf-8")
+    ).hexdigest()
+
+
+def _cache_key(name: str) -> str:
+    """
+    Get the cache key of the last processed payload
+
+    :param name: The name of the payload
+    :type name: str
+    :return:
+    :rtype:
+    """
+
+    return f"{Constants.TASK_PAYLOAD_HASH_CACHE_KEY}_{name}"
+
+
+def _metric_cache_key(name: str, metric: str) -> str:
+    """
+    Get the cache key of a payload hash metric
+
+    :param name: The name of the payload
+    :type name: str
+    :param metric: The metric
+    :type metric: str
+    :return:
+    :rtype:
+    """
+
+    return f"{Constants.TASK_PAYLOAD_HASH_METRICS_CACHE_KEY}_{name}_{metric}"
+
+
+def _increment_metric(name: str, metric: str, delta: int = 1) -> None:
+    """
+    Increment a payload hash metric
+
+    :param name: The name of the payload
+    :type name: str
+    :param metric: The metric
+    :type metric: str
+    :param delta: The value to add
+    :type delta: int
+    :return:
+    :rtype:
+    """
+
+    key = _metric_cache_key(name=name, metric=metric)
+
+    cache.add(key, 0, timeout=None)
+    cache.incr(key, delta)
+
+
+def payload_unchanged(name: str, content_hash: str) -> bool:
+    """
+    Check if a payload was already processed, and count the hit or miss
+
+    :param name: The name of the payload
+    :type name: str
+    :param content_hash: The content hash of the payload
+    :type content_hash: str
+    :return:
+    :rtype:
+    """
+
+    last_processed = cache.get(_cache_key(name=name))
+
+    if last_processed and last_processed["hash"] == content_hash:
+        _increment_metric(name=name, metric="hits")
+        _increment_metric(
+            name=name,
+            metric="time_saved_ms",
+            delta=round(last_processed["duration"] * 1000),
+        )
+
+        logger.info(f"ESI payload for {name} is unchanged, skipping update.")
+
+        return True
+
+    _increment_metric(name=name, metric="misses")
+
+    return False
+
+
+def remember_payload_hash(name: str, content_hash: str, duration: float) -> None:
+    """
+    Remember the content hash of a processed payload
+
+    :param name: The name of the payload
+    :type name: str
+    :param content_hash: The content hash of the payload
+    :type content_hash: str
+    :param duration: How long processing the payload took, in seconds
+    :type duration: float
+    :return:
+    :rtype:
+    """
+
+    cache.set(
+        key=_cache_key(name=name),
+        value={"hash": content_hash, "duration": duration},
+        timeout=Constants.TASK_PAYLOAD_HASH_CACHE_TTL,
+    )
+
+
+def payload_hash_metrics(names: tuple[str, ...]) -> dict[str, dict[str, int]]:
+    """
+    Get the payload hash metrics
+
+    :param names: The names of the payloads
+    :type names: tuple[str, ...]
+    :return:
+    :rtype:
+    """
+
+    keys = {
+        (name, metric): _metric_cache_key(name=name, metric=metric)
+        for name in names
+        for metric in PAYLOAD_HASH_METRICS
+    }
+    values = cache.get_many(keys.values())
+
+    metrics = {name: {} for name in names}
+
+    for (name, metric), key in keys.items():
+        metrics[name][metric] = values.get(key, 0)
+
+    return metrics
@@ -0,0 +1,165 @@
+"""
+Adaptive scheduling of the update tasks
+
+ESI tells in the `Cache-Control` and `Expires` headers of every response how long
+its data stays the same. The expiry of the ESI operations the update tasks use is
+kept, so the next update can be scheduled just after the earliest of them, instead
+of polling ESI on a fixed interval and getting the same data back.
+"""
+
+# Standard Library
+import random
+import re
+import time
+from collections.abc import Iterable, Mapping
+from email.utils import parsedate_to_datetime
+
+# Third Party
+from httpx import Headers
+
+# Django
+from django.core.cache import cache
+
+# Alliance Auth
+from allianceauth.services.hooks import get_extension_logger
+
+# AA Sovereignty Timer
+from sovtimer.constants import Constants
+from sovtimer.providers.applogger import AppLogger
+
+logger = AppLogger(my_logger=get_extension_logger(name=__name__))
+
+
+def _http_date(value: str | None) -> float | None:
+    """
+    Get the timestamp of an HTTP date header value
+
+    :param value: The header value
+    :type value: str | None
+    :return:
+    :rtype:
+    """
+
+    if not value:
+        return None
+
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def seconds_until_expiry(headers: Mapping[str, str]) -> float | None:
+    """
+    Get the number of seconds until an ESI response expires
+
+    The `max-age` of `Cache-Control` takes precedence over `Expires`, as in
+    RFC 9111. `Expires` is compared to the `Date` of the response when available.
+    django-esi serves cached responses with the headers ESI sent them with, so the
+    time passed since their `Date` is subtracted in both cases.
+
+    :param headers: The response headers
+    :type headers: Mapping[str, str]
+    :return: Seconds until the response expires, negative when already expired, or None if the headers don't tell
+    :rtype: float | None
+    """
+
+    headers = Headers(headers)
+    date = _http_date(headers.get("date"))
+    elapsed = max(0.0, time.time() - date) if date is not None else 0.0
+
+    max_age = re.search(r"max-age=(\d+)", headers.get("cache-control", ""))
+
+    if max_age:
+        try:
+            age = int(headers.get("age", 0))
+        except ValueError:
+            age = 0
+
+        return float(int(max_age.group(1)) - age) - elapsed
+
+    expires = _http_date(headers.get("expires"))
+
+    if expires is None:
+        return None
+
+    if date is None:
+        return expires - time.time()
+
+    return expires - date - elapsed
+
+
+def _cache_key(operation_id: str) -> str:
+    """
+    Get the cache key of the expiry of an ESI operation
+
+    :param operation_id: The ESI operation ID
+    :type operation_id: str
+    :return:
+    :rtype:
+    """
+
+    return f"{Constants.TASK_ESI_EXPIRY_CACHE_KEY}_{operation_id}"
+
+
+def remember_esi_expiry(operation_id: str, headers: Mapping[str, str]) -> None:
+    """
+    Remember when the data of an ESI operation expires
+
+    :param operation_id: The ESI operation ID
+    :type operation_id: str
+    :param headers: The response headers
+    :type headers: Mapping[str, str]
+    :return:
+    :rtype:
+    """
+
+    seconds = seconds_until_expiry(headers)
+
+    if seconds is None:
+        return
+
+    logger.debug(f"ESI data for {operation_id} expires in {seconds:.0f} seconds.")
+
+    cache.set(
+        key=_cache_key(operation_id=operation_id),
+        value=time.time() + seconds,
+        timeout=Constants.TASK_ESI_EXPIRY_CACHE_TTL,
+    )
+
+
+def next_run_countdown(operation_ids: Iterable[str]) -> float:
+    """
+    Get the number of seconds until the next update should run
+
+    That's just after the earliest expiry of the given ESI operations, plus a
+    random jitter, so not every installation calls ESI at the same moment. Without
+    any known expiry, e.g. because ESI didn't answer, the next update runs after
+    the minimum countdown.
+
+    :param operation_ids: The ESI operation IDs the update uses
+    :type operation_ids: Iterable[str]
+    :return:
+    :rtype:
+    """
+
+    expiries = cache.get_many(
+        [_cache_key(operation_id=operation_id) for operation_id in operation_ids]
+    )
+
+    if not expiries:
+        return float(Constants.TASK_ADAPTIVE_SCHEDULE_MIN_COUNTDOWN)
+
+    countdown = (
+        min(expiries.values())
+        - time.time()
+        + Constants.TASK_ADAPTIVE_SCHEDULE_MARGIN
+        + random.uniform(  # nosec B311 - not used for security
+            0, Constants.TASK_ADAPTIVE_SCHEDULE_JITTER
+        )
+    )
+
+    return min(
+        max(countdown, Constants.TASK_ADAPTIVE_SCHEDULE_MIN_COUNTDOWN),
+        Constants.TASK_ADAPTIVE_SCHEDULE_MAX_COUNTDOWN,
+    )
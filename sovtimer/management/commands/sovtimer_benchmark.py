@@ -0,0 +1,102 @@
+"""
+Run the benchmarks of the sync tasks and the dashboard data view
+"""
+
+# Standard Library
+import json
+from argparse import ArgumentTypeError
+
+# Django
+from django.core.management.base import BaseCommand
+
+# AA Sovereignty Timer
+from sovtimer.benchmarks.suite import (
+    DEFAULT_SCALES,
+    run_benchmarks,
+    throwaway_database,
+)
+
+
+def _scale(value: str) -> tuple[int, int]:
+    """
+    Parse a scale given as SYSTEMS:CAMPAIGNS
+
+    :param value: The scale
+    :type value: str
+    :return:
+    :rtype:
+    """
+
+    try:
+        systems, campaigns = (int(part) for part in value.split(":"))
+    except ValueError as exc:
+        raise ArgumentTypeError(
+            f"Invalid scale '{value}', expected SYSTEMS:CAMPAIGNS"
+        ) from exc
+
+    if not 0 < campaigns <= systems:
+        raise ArgumentTypeError(
+            f"Invalid scale '{value}', campaigns must be between 1 and systems"
+        )
+
+    return systems, campaigns
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the sync tasks and the dashboard data view with synthetic ESI data
+    """
+
+    help = (
+        "Benchmarks the sync tasks and the dashboard data view with synthetic ESI "
+        "data. They run in a throwaway database, created and destroyed like the "
+        "test runner does, nothing is written to the database or the cache."
+    )
+
+    def add_arguments(self, parser):
+        """
+        Add the arguments
+
+        :param parser:
+        """
+
+        parser.add_argument(
+            "--scale",
+            action="append",
+            type=_scale,
+            dest="scales",
+            metavar="SYSTEMS:CAMPAIGNS",
+            help=(
+                "Number of sovereignty systems and campaigns, can be given multiple "
+                "times (default: "
+                + ", ".join(
+                    f"{systems}:{campaigns}" for systems, campaigns in DEFAULT_SCALES
+                )
+                + ")"
+            ),
+        )
+        parser.add_argument("--output", help="Write the results as JSON to this file")
+
+    def handle(self, *args, **options):  # pylint: disable=unused-argument
+        """
+        Run the benchmarks
+
+        :param args:
+        :param options:
+        """
+
+        # Never against the live database, the benchmarks empty the tables
+        with throwaway_database():
+            results = run_benchmarks(scales=options["scales"] or DEFAULT_SCALES)
+
+        output = json.dumps(results, indent=4)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                output_file.write(output)
+
+            self.stdout.write(
+                msg=self.style.SUCCESS(f"Results written to {options['output']}")
+            )
+        else:
+            self.stdout.write(msg=output)
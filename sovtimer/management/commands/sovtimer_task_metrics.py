@@ -0,0 +1,71 @@
+"""
+Show the metrics of the update tasks
+"""
+
+# Django
+from django.core.management.base import BaseCommand
+
+# AA Sovereignty Timer
+from sovtimer.helper.error_limit import error_limit_state
+from sovtimer.helper.lease import lease_metrics
+from sovtimer.helper.payload_hash import payload_hash_metrics
+from sovtimer.tasks import CAMPAIGNS_PAYLOAD, STRUCTURES_PAYLOAD, SYNC_LEASES
+
+
+class Command(BaseCommand):
+    """
+    Shows how often the update tasks skipped an unchanged ESI payload, who
+    holds their leases and how often workers contended for them, and the state of
+    the ESI error limit governor
+    """
+
+    help = (
+        "Shows the ESI payload hash hits, misses and the time saved by skipping, "
+        "the lease holders and contention of the update tasks, and the remaining "
+        "ESI error budget"
+    )
+
+    def handle(self, *args, **options):  # pylint: disable=unused-argument
+        """
+        Print the metrics per payload and per lease, and of the error limit governor
+
+        :param args:
+        :param options:
+        """
+
+        metrics = payload_hash_metrics(names=(STRUCTURES_PAYLOAD, CAMPAIGNS_PAYLOAD))
+
+        for name, values in metrics.items():
+            self.stdout.write(
+                msg=(
+                    f"{name}: {values['hits']} hits, {values['misses']} misses, "
+                    f"{values['time_saved_ms'] / 1000:.1f} seconds saved"
+                )
+            )
+
+        for name, values in lease_metrics(names=SYNC_LEASES).items():
+            self.stdout.write(
+                msg=(
+                    f"{name} lease: held by {values['holder'] or 'nobody'}, "
+                    f"{values['acquired']} acquired, {values['contended']} contended, "
+                    f"{values['expired']} expired, "
+                    f"{values['avg_acquisition_ms']:.2f} ms to acquire on average"
+                )
+            )
+
+        state = error_limit_state()
+        budget = (
+            "budget unknown"
+            if state["remain"] is None
+            else (
+                f"{state['remain']} errors left, resets in "
+                f"{state['reset_in']:.0f} seconds"
+            )
+        )
+
+        self.stdout.write(
+            msg=(
+                f"ESI error limit: {budget}, requests {state['mode']}, "
+                f"{state['slowed']} slowed down, {state['paused']} paused"
+            )
+        )
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:41
+
+# Django
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("eve_sde", "0012_alter_constellation_region"),
+        ("sovtimer", "0002_remove_sovereigntystructure_structure_type_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SovereigntySystem",
+            fields=[
+                (
+                    "solar_system",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sov_system_solar_system",
+                        serialize=False,
+                        to="eve_sde.solarsystem",
+                    ),
+                ),
+                ("vulnerability_occupancy_level", models.FloatField(default=1)),
+                ("vulnerable_end_time", models.DateTimeField(blank=True, null=True)),
+                ("vulnerable_start_time", models.DateTimeField(blank=True, null=True)),
+                ("is_capital_system", models.BooleanField(default=False)),
+                ("military_level", models.PositiveSmallIntegerField(default=0)),
+                ("industrial_level", models.PositiveSmallIntegerField(default=0)),
+                ("strategic_level", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "alliance",
+                    models.ForeignKey(
+                        blank=True,
+                        default=None,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sov_system_alliance",
+                        to="sovtimer.alliance",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Sovereignty system",
+                "verbose_name_plural": "Sovereignty systems",
+                "default_permissions": (),
+            },
+        ),
+    ]
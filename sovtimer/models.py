@@ -3,7 +3,7 @@ Our Models
 """
 
 # Standard Library
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from typing import TYPE_CHECKING, Any
 
 # Third Party
@@ -19,6 +19,7 @@ from allianceauth.services.hooks import get_extension_logger
 # AA Sovereignty Timer
 from sovtimer.providers.applogger import AppLogger
 from sovtimer.providers.esi import ESIHandler
+from sovtimer.records import SovStructureRecord
 
 if TYPE_CHECKING:
     # Third Party
@@ -80,29 +81,42 @@ class Alliance(models.Model):
         :rtype: dict[int, Alliance]
         """
 
-        existing_alliances = cls.objects.filter(pk__in=alliance_ids)
-        existing_alliance_ids = set(existing_alliances.values_list("pk", flat=True))
+        alliance_ids = set(alliance_ids)
 
-        alliances_to_create = set(alliance_ids) - existing_alliance_ids
+        # Evaluated once, the IDs and the instances are both taken from it
+        existing_alliances = list(cls.objects.filter(pk__in=alliance_ids))
+        existing_alliance_ids = {alliance.pk for alliance in existing_alliances}
+
+        alliances_to_create = alliance_ids - existing_alliance_ids
+
+        # Resolve the names of the missing alliances in bulk first
+        alliance_names = ESIHandler.get_alliance_names(alliance_ids=alliances_to_create)
+
+        # Fall back to concurrent per-alliance lookups for whatever the bulk
+        # endpoint didn't return
+        unresolved_alliance_ids = alliances_to_create - alliance_names.keys()
+
+        if unresolved_alliance_ids:
+            alliances_from_esi = ESIHandler.get_alliances(
+                alliance_ids=unresolved_alliance_ids, force_refresh=force_refresh
+            )
+
+            alliance_names |= {
+                alliance_id: alliance_data.name
+                for alliance_id, alliance_data in alliances_from_esi.items()
+            }
 
         # Create a list of new Alliance instances to be created in bulk
         new_alliances = []
         for alliance_id in alliances_to_create:
-            alliance_data = ESIHandler.get_alliances_alliance_id(
-                alliance_id=alliance_id, force_refresh=force_refresh
-            )
-
-            logger.debug(
-                f"Fetched alliance data for alliance ID {alliance_id} from ESI"
-            )
+            alliance_name = alliance_names.get(alliance_id)
 
-            if alliance_data:
-                new_alliances.append(
-                    cls(
-                        alliance_id=alliance_id,
-                        name=alliance_data.name,
-                    )
+            if alliance_name:
+                logger.debug(
+                    f"Fetched alliance data for alliance ID {alliance_id} from ESI"
                 )
+
+                new_alliances.append(cls(alliance_id=alliance_id, name=alliance_name))
             else:
                 logger.warning(
                     f"Failed to fetch data for alliance ID {alliance_id} from ESI. Skipping creation."
@@ -161,70 +175,131 @@ class SovereigntyStructure(models.Model):
         default_permissions = ()
 
     @staticmethod
+    def iter_sov_structures(
+        sov_systems: Iterable[Any],
+    ) -> Iterator[SovStructureRecord]:
+        """
+        Yield the sov hubs of the alliance-claimed systems from the ESI payload
+
+        Only the fields update_sov_structures needs for the sov hubs and the
+        per-system snapshots are read into a record.
+        Systems without an alliance claim or with incomplete data are skipped.
+
+        :param sov_systems: The solar systems of the GetSovereigntySystems payload
+        :type sov_systems: Iterable[Any]
+        :return:
+        :rtype:
+        """
+
+        for sov_system in sov_systems:
+            try:
+                claim = sov_system.claim.root.alliance
+
+                if not claim:
+                    continue
+
+                sovereignty_hub = claim.sovereignty_hub
+                development = claim.development
+                activity_defense_multiplier = development.activity_defense_multiplier
+                vulnerability_window = sovereignty_hub.vulnerability_window
+
+                # Positional arguments, keywords double the construction time
+                sov_structure = SovStructureRecord(
+                    sovereignty_hub.id,
+                    sov_system.solar_system_id,
+                    claim.alliance_id,
+                    (
+                        activity_defense_multiplier
+                        if activity_defense_multiplier is not None
+                        else 1
+                    ),
+                    vulnerability_window.start if vulnerability_window else None,
+                    vulnerability_window.end if vulnerability_window else None,
+                    bool(claim.is_capital_system),
+                    development.military_level or 0,
+                    development.industrial_level or 0,
+                    development.strategic_level or 0,
+                )
+            except AttributeError:
+                continue
+
+            yield sov_structure
+
+    @classmethod
     def get_sov_structures_from_esi(
-        use_etags: bool = True, force_refresh: bool = False
-    ) -> list[Any] | None:
+        cls, use_etags: bool = True, force_refresh: bool = False
+    ) -> Iterator[SovStructureRecord] | None:
         """
         Get all sov structures from ESI
 
+        The sov hubs are yielded one by one as lightweight records, see
+        iter_sov_structures, instead of building intermediate dicts for the whole
+        payload.
+
         :param use_etags: Whether to use ETag for caching.
         :type use_etags: bool
         :param force_refresh: Whether to force a refresh of the data.
         :type force_refresh: bool
-        :return: List of sovereignty structures or None if an error occurred.
-        :rtype: list[Any] | None
+        :return: Iterator of sovereignty structures or None if an error occurred.
+        :rtype: Iterator[SovStructureRecord] | None
         """
 
-        sov_structures_from_esi = None
-
         sov_systems_from_esi = ESIHandler.get_sovereignty_systems(
             use_etags=use_etags, force_refresh=force_refresh
         )
 
-        if sov_systems_from_esi:
-            sov_structures_from_esi = []
-
-            for sov_system in sov_systems_from_esi.solar_systems:
-                try:
-                    if sov_system.claim.root.alliance:
-                        claim = sov_system.claim.root.alliance
-
-                        sov_structure = {
-                            "solar_system_id": sov_system.solar_system_id,
-                            "alliance_id": claim.alliance_id,
-                            "corporation_id": claim.corporation_id,
-                            "claimed_since": claim.claimed_since,
-                            "sovereignty_hub": {
-                                "id": claim.sovereignty_hub.id,
-                            },
-                            "is_capital_system": claim.is_capital_system,
-                            "development": {
-                                "activity_defense_multiplier": claim.development.activity_defense_multiplier,
-                                "military_level": claim.development.military_level,
-                                "industrial_level": claim.development.industrial_level,
-                                "strategic_level": claim.development.strategic_level,
-                            },
-                        }
-
-                        if claim.sovereignty_hub.vulnerability_window:
-                            sov_structure["sovereignty_hub"]["vulnerability_window"] = {
-                                "start": claim.sovereignty_hub.vulnerability_window.start,
-                                "end": claim.sovereignty_hub.vulnerability_window.end,
-                            }
-
-                        sov_structures_from_esi.append(sov_structure)
-                except AttributeError:
-                    continue
-
-            logger.debug(
-                msg=f"Fetched {len(sov_structures_from_esi or [])} sovereignty structures from ESI"
-            )
-        else:
+        if not sov_systems_from_esi:
             logger.info(
                 msg="No sovereignty structure changes found, nothing to update."
             )
 
-        return sov_structures_from_esi
+            return None
+
+        logger.debug(
+            msg=f"Fetched {len(sov_systems_from_esi.solar_systems)} sovereignty systems from ESI"
+        )
+
+        return cls.iter_sov_structures(sov_systems=sov_systems_from_esi.solar_systems)
+
+
+class SovereigntySystem(models.Model):
+    """
+    Sovereignty snapshot of an alliance-claimed solar system
+
+    Maintained by update_sov_structures from the sovereignty systems payload, one
+    row per system, so the sovereignty of a system can be read by its primary key.
+    """
+
+    solar_system = models.OneToOneField(
+        to=SolarSystem,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sov_system_solar_system",
+    )
+    alliance = models.ForeignKey(
+        to=Alliance,
+        on_delete=models.CASCADE,
+        default=None,
+        null=True,
+        blank=True,
+        related_name="sov_system_alliance",
+    )
+    vulnerability_occupancy_level = models.FloatField(default=1)
+    vulnerable_end_time = models.DateTimeField(null=True, blank=True)
+    vulnerable_start_time = models.DateTimeField(null=True, blank=True)
+    is_capital_system = models.BooleanField(default=False)
+    military_level = models.PositiveSmallIntegerField(default=0)
+    industrial_level = models.PositiveSmallIntegerField(default=0)
+    strategic_level = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        """
+        Meta definitions
+        """
+
+        verbose_name = _("Sovereignty system")
+        verbose_name_plural = _("Sovereignty systems")
+        default_permissions = ()
 
 
 class Campaign(models.Model):
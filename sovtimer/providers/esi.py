@@ -3,6 +3,10 @@ Providers
 """
 
 # Standard Library
+import os
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, wait
 from typing import TYPE_CHECKING, Any
 
 # Third Party
@@ -11,8 +15,13 @@ from httpx import Response
 
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
-from esi.exceptions import HTTPClientError, HTTPNotModified
-from esi.openapi_clients import ESIClientProvider, EsiOperation
+from esi.exceptions import (
+    ESIErrorLimitException,
+    HTTPClientError,
+    HTTPNotModified,
+    HTTPServerError,
+)
+from esi.openapi_clients import ESIClient, ESIClientProvider, EsiOperation
 
 # AA Sovereignty Timer
 from sovtimer import (
@@ -21,6 +30,18 @@ from sovtimer import (
     __github_url__,
     __version__,
 )
+from sovtimer.app_settings import (
+    esi_connection_reuse_enabled,
+    esi_max_concurrent_requests,
+    esi_request_timeout,
+)
+from sovtimer.constants import Constants
+from sovtimer.helper.error_limit import (
+    remember_error_limit,
+    remember_error_limit_exceeded,
+    wait_for_error_budget,
+)
+from sovtimer.helper.scheduling import remember_esi_expiry
 from sovtimer.providers.applogger import AppLogger
 
 if TYPE_CHECKING:
@@ -29,8 +50,149 @@ if TYPE_CHECKING:
 
 logger = AppLogger(get_extension_logger(__name__))
 
-# ESI client
-esi = ESIClientProvider(
+
+class _SharedSession:
+    """
+    Session of a single ESI request, sharing the pooled client of PooledSessionFactory
+    """
+
+    def __init__(self, client: Any):
+        """
+        Initialize the session
+
+        :param client: The shared HTTP client
+        :type client: Any
+        """
+
+        self._client = client
+
+    def __getattr__(self, name: str) -> Any:
+        """
+        Use the shared client for everything but closing
+
+        :param name: The attribute name
+        :type name: str
+        :return:
+        :rtype:
+        """
+
+        return getattr(self._client, name)
+
+    def close(self) -> None:
+        """
+        Keep the connections of the shared client open for the next request
+
+        :return:
+        :rtype:
+        """
+
+
+class PooledSessionFactory:
+    """
+    Session factory of the ESI client, sharing one HTTP client per process
+
+    aiopenapi3 creates a session for every request and closes it afterwards, so
+    every ESI request would open a new connection, with its own TCP and TLS
+    handshake. Instead, all requests share one HTTP client, built by the session
+    factory of django-esi, with its pool size, keep-alive and timeouts
+    (`ESI_CONNECTION_POOL_*` and `ESI_REQUESTS_*_TIMEOUT`) and HTTP/2.
+
+    A forked worker process builds its own client, connections can't be shared
+    between processes. Requests with credentials get a session of their own.
+    """
+
+    def __init__(self, session_factory: Callable[..., Any]):
+        """
+        Initialize the factory
+
+        :param session_factory: The session factory of django-esi
+        :type session_factory: Callable[..., Any]
+        """
+
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._client = None
+        self._pid = None
+
+    def __call__(self, **kwargs) -> Any:
+        """
+        Get the session for a request
+
+        :param kwargs: The session arguments of aiopenapi3
+        :type kwargs: dict
+        :return:
+        :rtype:
+        """
+
+        if kwargs.get("auth") or kwargs.get("cert"):
+            return self.session_factory(**kwargs)
+
+        with self._lock:
+            if self._client is None or self._pid != os.getpid():
+                self._client = self.session_factory(**kwargs)
+                self._pid = os.getpid()
+
+            return _SharedSession(client=self._client)
+
+
+class ThreadSafeESIClientProvider(ESIClientProvider):
+    """
+    ESI client provider that builds its client only once, even when the first ESI
+    requests come from several threads at once, e.g. in ESIHandler.get_alliances
+    or update_sov_structures_and_campaigns.
+
+    The client is built from the ESI spec on first use, not when the provider is
+    created at import time, so processes that never call ESI, like the web
+    workers serving the dashboard, never build it. Its requests share one pool of
+    connections, see PooledSessionFactory.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the provider
+
+        :param args: The arguments of ESIClientProvider
+        :param kwargs: The keyword arguments of ESIClientProvider
+        """
+
+        super().__init__(*args, **kwargs)
+
+        self._client_lock = threading.Lock()
+        # Set once the client is fully set up, ESIClientProvider assigns _client
+        # before the pooled session factory is installed on it
+        self._client_ready = False
+
+    @property
+    def client(self) -> ESIClient:
+        """
+        Get the ESI client, building it on first use
+
+        :return:
+        :rtype:
+        """
+
+        if not self._client_ready:
+            with self._client_lock:
+                # Another thread might have built it while we waited for the lock
+                if not self._client_ready:
+                    client = super().client
+
+                    if esi_connection_reuse_enabled():
+                        # aiopenapi3 creates the session of every request with it
+                        api = client.api
+                        api._session_factory = PooledSessionFactory(  # pylint: disable=protected-access
+                            session_factory=api._session_factory  # pylint: disable=protected-access
+                        )
+
+                    # Only published to other threads once set up
+                    self._client = client
+                    self._client_ready = True
+
+        return self._client
+
+
+# ESI client, built on first use
+esi = ThreadSafeESIClientProvider(
     # Use the latest compatibility date, see https://esi.evetech.net/meta/compatibility-dates
     compatibility_date=__esi_compatibility_date__,
     # spec_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "openapi.json"),
@@ -45,6 +207,8 @@ esi = ESIClientProvider(
         "GetSovereigntyCampaigns",
         "GetSovereigntyStructures",
         "GetSovereigntySystems",
+        # Universe
+        "PostUniverseNames",
     ],
 )
 
@@ -62,11 +226,15 @@ class ESIHandler:
         return_response: bool = False,
         force_refresh: bool = False,
         use_cache: bool = True,
+        track_expiry: bool = False,
         **extra,
     ) -> Any | tuple[Any, Response] | None:
         """
         Retrieve the result of an ESI operation, handling HTTPNotModified exceptions.
 
+        Requests are slowed down or skipped while ESI's error budget runs low, see
+        sovtimer.helper.error_limit.
+
         :param operation: The ESI operation to execute.
         :type operation: EsiOperation
         :param use_etag: Whether to use ETag for caching.
@@ -77,49 +245,59 @@ class ESIHandler:
         :type force_refresh: bool
         :param use_cache: Whether to use cached data.
         :type use_cache: bool
+        :param track_expiry: Whether to remember when the data expires, for the adaptive scheduling of the update tasks.
+        :type track_expiry: bool
         :param extra: Additional parameters to pass to the operation.
         :type extra: dict
         :return: The result of the ESI operation.
         :rtype: Any | tuple[Any, Response] | None
         """
 
-        logger.debug(f"Handling ESI operation: {operation.operation.operationId}")
+        operation_id = operation.operation.operationId
+
+        logger.debug(f"Handling ESI operation: {operation_id}")
         logger.debug(
-            f"Operation parameters: use_etag={use_etag}, return_response={return_response}, force_refresh={force_refresh}, use_cache={use_cache}, extra={extra}"
+            f"Operation parameters: use_etag={use_etag}, return_response={return_response}, force_refresh={force_refresh}, use_cache={use_cache}, track_expiry={track_expiry}, extra={extra}"
         )
 
         response: Response | None = None
 
+        # Hold back the request while ESI's error budget runs low
+        if not wait_for_error_budget(operation_id=operation_id):
+            return (None, None) if return_response else None
+
         try:
-            # Call operation.result differently depending on whether the caller
-            # requested the raw Response object. Some implementations return a
-            # single result when return_response is False and a (result, response)
-            # tuple when True, so only unpack when return_response is True.
-            if return_response:
-                esi_result, response = operation.result(
-                    use_etag=use_etag,
-                    return_response=return_response,
-                    force_refresh=force_refresh,
-                    use_cache=use_cache,
-                    **extra,
-                )
+            # Always get the (result, response) tuple, the error budget is read
+            # from the headers of every response, and the expiry when tracked.
+            # The response is only returned when the caller requested it.
+            esi_result, response = operation.result(
+                use_etag=use_etag,
+                return_response=True,
+                force_refresh=force_refresh,
+                use_cache=use_cache,
+                **extra,
+            )
 
-                logger.debug(
-                    f"ESI Response for operation: {operation.operation.operationId}: {response}"
-                )
-            else:
-                esi_result = operation.result(
-                    use_etag=use_etag,
-                    return_response=return_response,
-                    force_refresh=force_refresh,
-                    use_cache=use_cache,
-                    **extra,
-                )
-        except HTTPNotModified:
+            logger.debug(f"ESI Response for operation: {operation_id}: {response}")
+
+            if response is not None:
+                remember_error_limit(headers=response.headers)
+
+                if track_expiry:
+                    remember_esi_expiry(
+                        operation_id=operation_id, headers=response.headers
+                    )
+        except HTTPNotModified as exc:
             logger.debug(
-                f"ESI returned 304 Not Modified for operation: {operation.operation.operationId} - Skipping update."
+                f"ESI returned 304 Not Modified for operation: {operation_id} - Skipping update."
             )
 
+            remember_error_limit(headers=exc.headers)
+
+            # The data didn't change, but its expiry did
+            if track_expiry:
+                remember_esi_expiry(operation_id=operation_id, headers=exc.headers)
+
             esi_result = None
         except ContentTypeError:
             logger.warning(
@@ -127,9 +305,22 @@ class ESIHandler:
             )
 
             esi_result = None
+        except ESIErrorLimitException as exc:
+            logger.error(msg=f"ESI error limit exceeded: {str(exc)}")
+
+            remember_error_limit_exceeded(reset=exc.reset)
+
+            esi_result = None
+        except HTTPServerError as exc:
+            remember_error_limit(headers=exc.headers)
+
+            raise
         except (HTTPClientError, RequestError) as exc:
             logger.error(msg=f"Error while fetching data from ESI: {str(exc)}")
 
+            # Failed requests are what uses up the error budget
+            remember_error_limit(headers=getattr(exc, "headers", None))
+
             esi_result = None
 
         # If caller requested the raw response, return a tuple (result, response)
@@ -174,6 +365,134 @@ class ESIHandler:
             return_response=return_response,
         )
 
+    @classmethod
+    def get_alliances(
+        cls, alliance_ids: Iterable[int], force_refresh: bool = False
+    ) -> "dict[int, AllianceDetail]":
+        """
+        Get alliance information for multiple alliances from ESI.
+
+        The requests are executed concurrently with a bounded number of workers
+        (`SOVTIMER_ESI_MAX_CONCURRENT_REQUESTS`), so resolving many alliances scales
+        with the ESI latency rather than with the number of alliances. Requests that
+        haven't finished `SOVTIMER_ESI_REQUEST_TIMEOUT` seconds after they were
+        submitted are skipped, so the call never blocks for longer than that.
+
+        :param alliance_ids: The IDs of the alliances to retrieve.
+        :type alliance_ids: Iterable[int]
+        :param force_refresh: Whether to force a refresh of the data from ESI, bypassing any caches.
+        :type force_refresh: bool
+        :return: Dictionary mapping alliance IDs to alliance information, alliances that could not be fetched are omitted.
+        :rtype: dict[int, AllianceDetail]
+        """
+
+        alliance_ids = set(alliance_ids)
+
+        if not alliance_ids:
+            return {}
+
+        timeout = esi_request_timeout()
+        executor = ThreadPoolExecutor(
+            max_workers=min(esi_max_concurrent_requests(), len(alliance_ids)),
+            thread_name_prefix="sovtimer-esi",
+        )
+
+        futures = {
+            alliance_id: executor.submit(
+                cls.get_alliances_alliance_id,
+                alliance_id=alliance_id,
+                force_refresh=force_refresh,
+            )
+            for alliance_id in alliance_ids
+        }
+
+        alliances = {}
+
+        try:
+            # One deadline for all requests, not one per request waited for
+            done, _ = wait(futures.values(), timeout=timeout)
+
+            for alliance_id, future in futures.items():
+                if future not in done:
+                    logger.warning(
+                        f"Timed out after {timeout} seconds while fetching alliance ID {alliance_id} from ESI."
+                    )
+
+                    continue
+
+                alliance_data = future.result()
+
+                if alliance_data:
+                    alliances[alliance_id] = alliance_data
+        finally:
+            # Don't wait for requests that timed out, and drop the ones not yet started
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return alliances
+
+    @classmethod
+    def post_universe_names(cls, ids: Iterable[int]) -> list | None:
+        """
+        Resolve a set of IDs to names and categories via ESI.
+
+        ESI accepts up to 1000 IDs per request and fails the whole request when
+        one of the IDs can't be resolved. The response is never cached, since
+        the cache key of POST requests doesn't consider the request body.
+
+        :param ids: The IDs to resolve.
+        :type ids: Iterable[int]
+        :return: List of resolved IDs with name and category or None if an error occurred.
+        :rtype: list | None
+        """
+
+        ids = list(ids)
+
+        logger.debug(f"Resolving {len(ids)} IDs to names via ESI…")
+
+        return cls.result(
+            operation=esi.client.Universe.PostUniverseNames(body=ids),
+            use_etag=False,
+            use_cache=False,
+            store_cache=False,
+        )
+
+    @classmethod
+    def get_alliance_names(cls, alliance_ids: Iterable[int]) -> dict[int, str]:
+        """
+        Get the names of multiple alliances from ESI in bulk.
+
+        The IDs are resolved in batches of up to 1000 IDs per request. IDs that are
+        not returned as alliance, e.g. because their batch failed, are omitted, so the
+        caller can fall back to per-alliance lookups for them.
+
+        :param alliance_ids: The IDs of the alliances to resolve.
+        :type alliance_ids: Iterable[int]
+        :return: Dictionary mapping alliance IDs to alliance names.
+        :rtype: dict[int, str]
+        """
+
+        alliance_ids = sorted(set(alliance_ids))
+        batch_size = Constants.ESI_UNIVERSE_NAMES_MAX_IDS
+        alliance_names = {}
+
+        for index in range(0, len(alliance_ids), batch_size):
+            resolved_names = cls.post_universe_names(
+                ids=alliance_ids[index : index + batch_size]
+            )
+
+            if not resolved_names:
+                continue
+
+            for resolved_name in resolved_names:
+                category = getattr(
+                    resolved_name.category, "value", resolved_name.category
+                )
+
+                if category == "alliance":
+                    alliance_names[resolved_name.id] = resolved_name.name
+
+        return alliance_names
+
     @classmethod
     def get_sovereignty_campaigns(
         cls,
@@ -201,6 +520,7 @@ class ESIHandler:
             use_etag=use_etags,
             force_refresh=force_refresh,
             return_response=return_response,
+            track_expiry=True,
         )
 
     @classmethod
@@ -230,4 +550,5 @@ class ESIHandler:
             use_etag=use_etags,
             force_refresh=force_refresh,
             return_response=return_response,
+            track_expiry=True,
         )
@@ -0,0 +1,28 @@
+"""
+Lightweight records for the data read from ESI
+"""
+
+# Standard Library
+from datetime import datetime
+from typing import NamedTuple
+
+
+class SovStructureRecord(NamedTuple):
+    """
+    A sov hub of an alliance-claimed system from the sovereignty systems payload
+
+    Only holds the fields the structure and system syncs write. As a tuple it has
+    no per-instance dict, which keeps the records small when a full payload of
+    several thousand systems is processed.
+    """
+
+    structure_id: int
+    solar_system_id: int
+    alliance_id: int
+    vulnerability_occupancy_level: float
+    vulnerable_start_time: datetime | None
+    vulnerable_end_time: datetime | None
+    is_capital_system: bool = False
+    military_level: int = 0
+    industrial_level: int = 0
+    strategic_level: int = 0
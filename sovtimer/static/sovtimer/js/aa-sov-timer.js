@@ -1,4 +1,4 @@
-/* global sovtimerJsSettingsDefaults, sovtimerJsSettingsOverride, moment, objectDeepMerge, fetchGet, DataTable, bootstrap */
+/* global sovtimerJsSettingsDefaults, sovtimerJsSettingsOverride, moment, objectDeepMerge, DataTable, bootstrap, EventSource */
 
 $(document).ready(() => {
     'use strict';
@@ -87,6 +87,112 @@ $(document).ready(() => {
         };
     };
 
+    /**
+     * Escape HTML special characters.
+     *
+     * @param {string} text Text to escape.
+     * @return {string} Escaped text.
+     * @private
+     */
+    const _escapeHtml = (text) => {
+        const entities = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', '\'': '&#39;'};
+
+        return String(text).replace(/[&<>"']/g, (character) => entities[character]);
+    };
+
+    /**
+     * Link opening in a new tab.
+     *
+     * @param {string} url Link target.
+     * @param {string} content Link content (HTML).
+     * @return {string} Link HTML.
+     * @private
+     */
+    const _externalLink = (url, content) => {
+        return `<a href="${url}" target="_blank" rel="noopener noreferer">${content}</a>`;
+    };
+
+    /**
+     * Dotlan URL of a region.
+     *
+     * @param {int} regionId Region ID.
+     * @return {string} Dotlan URL.
+     * @private
+     */
+    const _dotlanRegionUrl = (regionId) => {
+        return `https://evemaps.dotlan.net/map/${regionId}`;
+    };
+
+    /**
+     * Format a float value (0.0-1.0) as a percentage with leading zero if < 10%.
+     *
+     * @param {number} value Value to format.
+     * @return {string} Percentage.
+     * @private
+     */
+    const _percentage = (value) => {
+        return `${String(Math.round(value * 100)).padStart(2, '0')}%`;
+    };
+
+    /**
+     * Render the defender with alliance logo.
+     *
+     * @param {Object} d Campaign data.
+     * @return {string} Defender HTML.
+     * @private
+     */
+    const _renderDefender = (d) => {
+        const defenderName = _escapeHtml(d.defender_name);
+        const logoUrl = `https://images.evetech.net/alliances/${d.defender_id}/logo?size=32`;
+
+        return _externalLink(
+            `https://evemaps.dotlan.net/alliance/${d.defender_id}`,
+            `<img class="aa-sovtimer-entity-logo-left me-2" src="${logoUrl}" alt="${defenderName}">${defenderName}`
+        );
+    };
+
+    /**
+     * Render the campaign progress.
+     * Active campaigns show the trend and a zKillboard link for the constellation.
+     *
+     * @param {Object} d Campaign data.
+     * @return {string} Campaign progress HTML.
+     * @private
+     */
+    const _renderCampaignProgress = (d) => {
+        const current = _percentage(d.progress_current);
+
+        if (d.campaign_status !== 'active') {
+            return current;
+        }
+
+        let trend = {
+            title: sovtimerSettings.translation.noProgress,
+            cls: 'aa-sovtimer-trend-flat',
+            icon: 'trending_flat'
+        };
+
+        if (d.progress_previous < d.progress_current) {
+            trend = {
+                title: sovtimerSettings.translation.defendersMakingProgress,
+                cls: 'aa-sovtimer-trend-up',
+                icon: 'trending_up'
+            };
+        } else if (d.progress_previous > d.progress_current) {
+            trend = {
+                title: sovtimerSettings.translation.attackersMakingProgress,
+                cls: 'aa-sovtimer-trend-down',
+                icon: 'trending_down'
+            };
+        }
+
+        const trendIcon = `<i class="material-icons aa-sovtimer-trend ${trend.cls}" title="${trend.title}" data-bs-tooltip="aa-sovtimer">${trend.icon}</i>`;
+        const zkbLink = `<a href="https://zkillboard.com/constellation/${d.constellation_id}/" target="_blank" rel="noopener noreferer" class="aa-sov-timer-zkb-icon ms-2">`
+            + `<img src="${sovtimerSettings.url.zkillboardIcon}" alt="zKillboard"></a>`;
+
+        return _percentage(d.progress_previous) + trendIcon + current + zkbLink;
+    };
+
     /**
      * Update campaign counts.
      *
@@ -117,14 +223,139 @@ $(document).ready(() => {
         elements.campaignsActive.html(counts.active);
     };
 
+    /**
+     * ETag of the last dashboard data received.
+     *
+     * @type {string|null}
+     */
+    let dashboardDataEtag = null;
+
+    /**
+     * Token of the last dashboard data received, to only get the changes since then.
+     *
+     * @type {string}
+     */
+    let dashboardDataToken = '';
+
+    /**
+     * Decode campaign data in columnar form back into rows.
+     * Region, constellation and defender are referenced by index into their lookup table.
+     *
+     * @param {Object} data Campaign data in columnar form.
+     * @return {Array} Campaign data.
+     * @private
+     */
+    const _decodeColumnar = (data) => {
+        const lookupNames = Object.keys(data.lookups);
+        const fields = Object.keys(data.columns).filter((field) => !lookupNames.includes(field));
+
+        return Array.from({length: data.length}, (_, index) => {
+            const rowData = {};
+
+            fields.forEach((field) => {
+                rowData[field] = data.columns[field][index];
+            });
+
+            lookupNames.forEach((name) => {
+                const [id, entityName] = data.lookups[name][data.columns[name][index]];
+
+                rowData[`${name}_id`] = id;
+                rowData[`${name}_name`] = entityName;
+            });
+
+            return rowData;
+        });
+    };
+
+    /**
+     * Fetch the changes of the dashboard data since the last update,
+     * sending the ETag of the last response.
+     *
+     * Resolves to `null` when the server answers with 304 Not Modified.
+     *
+     * @return {Promise<Object|null>} Campaign changes or null when unchanged.
+     * @private
+     */
+    const _fetchDashboardData = async () => {
+        const url = new URL(sovtimerSettings.url.ajaxUpdate, window.location.href);
+        const headers = {Accept: 'application/json'};
+
+        url.searchParams.set('since', dashboardDataToken);
+        url.searchParams.set('format', 'columnar');
+
+        if (dashboardDataEtag) {
+            headers['If-None-Match'] = dashboardDataEtag;
+        }
+
+        const response = await fetch(url, {
+            method: 'GET',
+            headers: headers,
+            cache: 'no-store'
+        });
+
+        if (response.status === 304) {
+            return null;
+        }
+
+        if (!response.ok) {
+            throw new Error(`Error: ${response.status} - ${response.statusText}`);
+        }
+
+        dashboardDataEtag = response.headers.get('ETag');
+
+        const changes = await response.json();
+
+        dashboardDataToken = changes.token;
+
+        if (changes.full) {
+            changes.rows = _decodeColumnar(changes.rows);
+        } else {
+            changes.changed = _decodeColumnar(changes.changed);
+        }
+
+        return changes;
+    };
+
+    /**
+     * Remember when the rows were received, their remaining time is relative to that.
+     *
+     * @param {Array} rows Campaign data.
+     * @return {Array} Campaign data.
+     * @private
+     */
+    const _setReceivedAt = (rows) => {
+        const receivedAt = Date.now();
+
+        rows.forEach((rowData) => {
+            rowData.receivedAt = receivedAt;
+        });
+
+        return rows;
+    };
+
+    /**
+     * Get the remaining seconds of a row, accounting for the time since it was received.
+     *
+     * @param {Object} rowData Campaign data.
+     * @return {number} Remaining time in seconds.
+     * @private
+     */
+    const _remainingSeconds = (rowData) => {
+        const elapsed = rowData.receivedAt ? Math.round((Date.now() - rowData.receivedAt) / 1000) : 0;
+
+        return Number(rowData.remaining_seconds) - elapsed;
+    };
+
     const sovCampaignTable = $('.aa-sovtimer-campaigns');
 
-    fetchGet({url: sovtimerSettings.url.ajaxUpdate})
-        .then((tableData) => {
-            if (!tableData) {
+    _fetchDashboardData()
+        .then((changes) => {
+            if (!changes) {
                 return;
             }
 
+            const tableData = _setReceivedAt(changes.rows);
+
             const dt = new DataTable(sovCampaignTable, { // eslint-disable-line no-unused-vars
                 language: {url: sovtimerSettings.dataTables.languageUrl},
                 data: tableData,
@@ -135,38 +366,42 @@ $(document).ready(() => {
                     // Column: 0 - System
                     {
                         data: {
-                            display: d => d.solar_system.display,
-                            sort: d => d.solar_system.sort,
-                            filter: d => d.solar_system.sort
+                            display: d => _externalLink(`${_dotlanRegionUrl(d.region_id)}/${d.solar_system_name}`, _escapeHtml(d.solar_system_name)),
+                            sort: d => d.solar_system_name,
+                            filter: d => d.solar_system_name
                         }
                     },
                     // Column: 1 - Constellation
                     {
                         data: {
-                            display: d => d.constellation.display,
-                            sort: d => d.constellation.sort,
-                            filter: d => d.constellation.sort
+                            display: d => _externalLink(`${_dotlanRegionUrl(d.region_id)}/${d.constellation_name}`, _escapeHtml(d.constellation_name)),
+                            sort: d => d.constellation_name,
+                            filter: d => d.constellation_name
                         }
                     },
                     // Column: 2 - Region
                     {
                         data: {
-                            display: d => d.region.display,
-                            sort: d => d.region.sort,
-                            filter: d => d.region.sort
+                            display: d => _externalLink(_dotlanRegionUrl(d.region_id), _escapeHtml(d.region_name)),
+                            sort: d => d.region_name,
+                            filter: d => d.region_name
                         }
                     },
                     // Column: 3 - Defender
                     {
                         data: {
-                            display: d => d.defender.display,
-                            sort: d => d.defender.sort,
-                            filter: d => d.defender.sort
+                            display: d => _renderDefender(d),
+                            sort: d => d.defender_name,
+                            filter: d => d.defender_name
                         }
                     },
                     // Column: 4 - Activity Defense Multiplier
                     {
-                        data: 'adm'
+                        data: {
+                            display: d => Number(d.adm).toFixed(1),
+                            sort: d => d.adm,
+                            filter: d => Number(d.adm).toFixed(1)
+                        }
                     },
                     // Column: 5 - Start Time
                     {
@@ -179,16 +414,16 @@ $(document).ready(() => {
                     // Column: 6 - Remaining Time
                     {
                         data: {
-                            display: d => d.remaining_time.display,
-                            sort: d => d.remaining_time.seconds,
-                            filter: d => d.remaining_time.seconds
+                            display: () => '',
+                            sort: d => d.remaining_seconds,
+                            filter: d => d.remaining_seconds
                         }
                     },
                     // Column: 7 - Campaign Progress
                     {
                         data: {
-                            display: d => d.campaign_progress.display,
-                            sort: d => d.campaign_progress.current,
+                            display: d => _renderCampaignProgress(d),
+                            sort: d => d.progress_current,
                             filter: d => d.campaign_status
                         }
                     }
@@ -205,6 +440,7 @@ $(document).ready(() => {
                     },
                 ],
                 order: [[5, 'asc']],
+                rowId: 'campaign_id',
                 createdRow: (row, data) => {
                     // Add a class for upcoming or active campaigns
                     $(row).addClass(`aa-sovtimer-${data.campaign_status}-campaign`);
@@ -222,7 +458,7 @@ $(document).ready(() => {
                         return {
                             rowIdx,
                             cellNode: dt.cell(rowIdx, 6).node(),
-                            remainingSeconds: Number(rowData.remaining_time.seconds)
+                            remainingSeconds: _remainingSeconds(rowData)
                         };
                     });
 
@@ -238,7 +474,7 @@ $(document).ready(() => {
                             return {
                                 rowIdx,
                                 cellNode: dt.cell(rowIdx, 6).node(),
-                                remainingSeconds: Number(rowData.remaining_time.seconds)
+                                remainingSeconds: _remainingSeconds(rowData)
                             };
                         });
                     };
@@ -314,16 +550,121 @@ $(document).ready(() => {
                     // Set interval for ticking every second to update remaining time
                     setInterval(_tick, 1000);
 
-                    // Update the table data every 30 seconds
-                    setInterval(() => {
-                        fetchGet({url: sovtimerSettings.url.ajaxUpdate})
-                            .then((newData) => {
-                                dt.clear().rows.add(newData).draw();
-                                _updateCampaignCounts(newData);
-                                _bootstrapTooltip({selector: '.aa-sovtimer'});
-                            })
-                            .catch(console.error);
-                    }, 30000);
+                    /**
+                     * Replace the table data.
+                     *
+                     * @param {Array} newData Campaign data.
+                     * @private
+                     */
+                    const _replaceTableData = (newData) => {
+                        dt.clear().rows.add(_setReceivedAt(newData)).draw();
+                    };
+
+                    /**
+                     * Apply changed and removed campaigns to the table.
+                     *
+                     * @param {{changed: Array, removed: Array}} delta Changed campaigns and removed campaign IDs.
+                     * @private
+                     */
+                    const _applyDelta = (delta) => {
+                        delta.removed.forEach((campaignId) => {
+                            dt.row(`#${campaignId}`).remove();
+                        });
+
+                        _setReceivedAt(delta.changed).forEach((rowData) => {
+                            const row = dt.row(`#${rowData.campaign_id}`);
+
+                            if (!row.any()) {
+                                dt.row.add(rowData);
+
+                                return;
+                            }
+
+                            row.data(rowData);
+
+                            // createdRow only runs for new rows, so update the status class here
+                            $(row.node())
+                                .removeClass('aa-sovtimer-inactive-campaign aa-sovtimer-upcoming-campaign aa-sovtimer-active-campaign')
+                                .addClass(`aa-sovtimer-${rowData.campaign_status}-campaign`);
+                        });
+
+                        dt.draw(false);
+                    };
+
+                    let pollingInterval = null;
+
+                    /**
+                     * Poll the changes of the table data every 30 seconds.
+                     *
+                     * @private
+                     */
+                    const _startPolling = () => {
+                        if (pollingInterval !== null) {
+                            return;
+                        }
+
+                        pollingInterval = setInterval(() => {
+                            _fetchDashboardData()
+                                .then((changes) => {
+                                    // Nothing changed since the last update
+                                    if (changes === null) {
+                                        return;
+                                    }
+
+                                    if (changes.full) {
+                                        _replaceTableData(changes.rows);
+
+                                        return;
+                                    }
+
+                                    if (changes.changed.length > 0 || changes.removed.length > 0) {
+                                        _applyDelta(changes);
+                                    }
+                                })
+                                .catch(console.error);
+                        }, 30000);
+                    };
+
+                    /**
+                     * Receive table updates via Server-Sent Events.
+                     * Falls back to polling when the connection fails repeatedly.
+                     *
+                     * @private
+                     */
+                    const _subscribeToEvents = () => {
+                        const eventSource = new EventSource(sovtimerSettings.url.events);
+                        let failedAttempts = 0;
+
+                        eventSource.addEventListener('open', () => {
+                            failedAttempts = 0;
+                        });
+
+                        eventSource.addEventListener('snapshot', (event) => {
+                            _replaceTableData(JSON.parse(event.data));
+                        });
+
+                        eventSource.addEventListener('delta', (event) => {
+                            _applyDelta(JSON.parse(event.data));
+                        });
+
+                        eventSource.addEventListener('error', () => {
+                            failedAttempts++;
+
+                            // The browser reconnects on its own, unless the connection is closed
+                            if (eventSource.readyState === EventSource.CLOSED || failedAttempts >= 3) {
+                                eventSource.close();
+
+                                _startPolling();
+                            }
+                        });
+                    };
+
+                    // Update the table data via Server-Sent Events, if enabled, or by polling
+                    if (sovtimerSettings.url.events && typeof EventSource !== 'undefined') {
+                        _subscribeToEvents();
+                    } else {
+                        _startPolling();
+                    }
 
                     // Define filters
                     const _filters = [
@@ -1,2 +1,2 @@
-$(document).ready(()=>{'use strict';const a='undefined'!=typeof sovtimerJsSettingsOverride?objectDeepMerge(sovtimerJsSettingsDefaults,sovtimerJsSettingsOverride):sovtimerJsSettingsDefaults,t={campaignsTotal:$('.aa-sovtimer-campaigns-total'),campaignsUpcoming:$('.aa-sovtimer-campaigns-upcoming'),campaignsActive:$('.aa-sovtimer-campaigns-active')},e=({selector:a='body',namespace:t='aa-sovtimer'})=>{document.querySelectorAll(`${a} [data-bs-tooltip="${t}"]`).forEach(a=>{const t=bootstrap.Tooltip.getInstance(a);return t&&t.dispose(),$('.bs-tooltip-auto').remove(),new bootstrap.Tooltip(a)})},s=()=>a.dataTables.columnControl.map((a,t)=>1===t?{...a,content:[]}:a),o=a=>{const t=a<0,e=t?'-':'',s='aa-sovtimer-remaining'+(t?' aa-sovtimer-timer-elapsed':'');a=Math.abs(a)+(t?1:-1);return{countdown:`<span class="${s}">${e}${Math.floor(a/86400)}d ${String(Math.floor(a/3600)%24).padStart(2,'0')}h ${String(Math.floor(a/60)%60).padStart(2,'0')}m ${String(Math.floor(a)%60).padStart(2,'0')}s</span>`,remainingTimeInSeconds:e+a}},r=a=>{const e=a.reduce((a,t)=>(a.total++,t.campaign_status&&Object.prototype.hasOwnProperty.call(a,t.campaign_status)&&a[t.campaign_status]++,a),{total:0,upcoming:0,active:0});t.campaignsTotal.html(e.total),t.campaignsUpcoming.html(e.upcoming),t.campaignsActive.html(e.active)},i=$('.aa-sovtimer-campaigns');fetchGet({url:a.url.ajaxUpdate}).then(t=>{if(!t)return;new DataTable(i,{language:{url:a.dataTables.languageUrl},data:t,layout:a.dataTables.layout,ordering:a.dataTables.ordering,columnControl:a.dataTables.columnControl,columns:[{data:{display:a=>a.solar_system.display,sort:a=>a.solar_system.sort,filter:a=>a.solar_system.sort}},{data:{display:a=>a.constellation.display,sort:a=>a.constellation.sort,filter:a=>a.constellation.sort}},{data:{display:a=>a.region.display,sort:a=>a.region.sort,filter:a=>a.region.sort}},{data:{display:a=>a.defender.display,sort:a=>a.defender.sort,filter:a=>a.defender.sort}},{data:'adm'},{data:{display:t=>t.start_time?moment(t.start_time).utc().format(a.datetimeFormat.datetimeLong):'',sort:a=>a.start_time?moment(a.start_time).unix():0,filter:a=>a.start_time||''}},{data:{display:a=>a.remaining_time.display,sort:a=>a.remaining_time.seconds,filter:a=>a.remaining_time.seconds}},{data:{display:a=>a.campaign_progress.display,sort:a=>a.campaign_progress.current,filter:a=>a.campaign_status}}],columnDefs:[{targets:[4,5,6,7],columnControl:s()},{targets:[6,7],type:'float',width:175}],order:[[5,'asc']],createdRow:(a,t)=>{$(a).addClass(`aa-sovtimer-${t.campaign_status}-campaign`)},paging:!1,initComplete:()=>{const t=i.DataTable();let s=t.rows().indexes().toArray().map(a=>{const e=t.row(a).data();return{rowIdx:a,cellNode:t.cell(a,6).node(),remainingSeconds:Number(e.remaining_time.seconds)}});const n=()=>{s=t.rows().indexes().toArray().map(a=>{const e=t.row(a).data();return{rowIdx:a,cellNode:t.cell(a,6).node(),remainingSeconds:Number(e.remaining_time.seconds)}})},l=()=>{for(let a=0;a<s.length;a++){const t=s[a];t.remainingSeconds=Number(t.remainingSeconds)-1;const e=o(t.remainingSeconds);t.cellNode&&(t.cellNode.innerHTML=e.countdown)}},c=(a,e)=>{$(a).click(()=>{$.fn.dataTable.ext.search=[];const s=(a,t,s,o)=>!o||e(o);$.fn.dataTable.ext.search.push(s),$('.aa-sovtimer-filter-active').removeClass('aa-sovtimer-filter-active'),$(a).addClass('aa-sovtimer-filter-active'),t.draw()})};r(t.rows().data().toArray()),e({selector:'.aa-sovtimer'}),n(),l(),setInterval(l,1e3),setInterval(()=>{fetchGet({url:a.url.ajaxUpdate}).then(a=>{t.clear().rows.add(a).draw(),r(a),e({selector:'.aa-sovtimer'})}).catch(console.error)},3e4);[['#aa-sovtimer-filter-total-campaigns',()=>!0],['#aa-sovtimer-filter-upcoming-campaigns',a=>'upcoming'===a.campaign_status],['#aa-sovtimer-filter-active-campaigns',a=>'active'===a.campaign_status]].forEach(([a,t])=>c(a,t)),t.on('draw',()=>{n(),r(t.rows().data().toArray()),e({selector:'.aa-sovtimer'})})}})}).catch(console.error)});
+$(document).ready(()=>{'use strict';const sovtimerSettings=typeof sovtimerJsSettingsOverride!=='undefined'?objectDeepMerge(sovtimerJsSettingsDefaults,sovtimerJsSettingsOverride):sovtimerJsSettingsDefaults;const elements={campaignsTotal:$('.aa-sovtimer-campaigns-total'),campaignsUpcoming:$('.aa-sovtimer-campaigns-upcoming'),campaignsActive:$('.aa-sovtimer-campaigns-active')};const _bootstrapTooltip=({selector='body',namespace='aa-sovtimer'})=>{document.querySelectorAll(`${selector} [data-bs-tooltip="${namespace}"]`).forEach((tooltipTriggerEl)=>{const existing=bootstrap.Tooltip.getInstance(tooltipTriggerEl);if(existing){existing.dispose();}$('.bs-tooltip-auto').remove();return new bootstrap.Tooltip(tooltipTriggerEl);});};const _removeSearchFromColumnControl=()=>{return sovtimerSettings.dataTables.columnControl.map((control,index)=>index===1?{...control,content:[]}:control);};const _removeColumnControl=()=>{return sovtimerSettings.dataTables.columnControl.map((control)=>({...control,content:[]}));};const _secondsToRemainingTime=(secondsRemaining)=>{const isElapsed=secondsRemaining<0;const prefix=isElapsed?'-':'';const spanClasses=`aa-sovtimer-remaining${isElapsed?' aa-sovtimer-timer-elapsed':''}`;secondsRemaining=Math.abs(secondsRemaining)+(isElapsed?1:-1);const days=Math.floor(secondsRemaining/86400);const hours=String(Math.floor(secondsRemaining/3600)%24).padStart(2,'0');const minutes=String(Math.floor(secondsRemaining/60)%60).padStart(2,'0');const seconds=String(Math.floor(secondsRemaining)%60).padStart(2,'0');return{countdown:`<span class="${spanClasses}">${prefix}${days}d ${hours}h ${minutes}m ${seconds}s</span>`,remainingTimeInSeconds:prefix+secondsRemaining};};const _escapeHtml=(text)=>{const entities={'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;','\'':'&#39;'};return String(text).replace(/[&<>"']/g,(character)=>entities[character]);};const _externalLink=(url,content)=>{return`<a href="${url}" target="_blank" rel="noopener noreferer">${content}</a>`;};const _dotlanRegionUrl=(regionId)=>{return`https://evemaps.dotlan.net/map/${regionId}`;};const _percentage=(value)=>{return`${String(Math.round(value*100)).padStart(2,'0')}%`;};const _renderDefender=(d)=>{const defenderName=_escapeHtml(d.defender_name);const logoUrl=`https://images.evetech.net/alliances/${d.defender_id}/logo?size=32`;return _externalLink(`https://evemaps.dotlan.net/alliance/${d.defender_id}`,`<img class="aa-sovtimer-entity-logo-left me-2" src="${logoUrl}" alt="${defenderName}">${defenderName}`);};const _renderCampaignProgress=(d)=>{const current=_percentage(d.progress_current);if(d.campaign_status!=='active'){return current;}let trend={title:sovtimerSettings.translation.noProgress,cls:'aa-sovtimer-trend-flat',icon:'trending_flat'};if(d.progress_previous<d.progress_current){trend={title:sovtimerSettings.translation.defendersMakingProgress,cls:'aa-sovtimer-trend-up',icon:'trending_up'};}else if(d.progress_previous>d.progress_current){trend={title:sovtimerSettings.translation.attackersMakingProgress,cls:'aa-sovtimer-trend-down',icon:'trending_down'};}const trendIcon=`<i class="material-icons aa-sovtimer-trend ${trend.cls}" title="${trend.title}" data-bs-tooltip="aa-sovtimer">${trend.icon}</i>`;const zkbLink=`<a href="https://zkillboard.com/constellation/${d.constellation_id}/" target="_blank" rel="noopener noreferer" class="aa-sov-timer-zkb-icon ms-2">`+`<img src="${sovtimerSettings.url.zkillboardIcon}" alt="zKillboard"></a>`;return _percentage(d.progress_previous)+trendIcon+current+zkbLink;};const _updateCampaignCounts=(data)=>{const counts=data.reduce((campaigns,item)=>{campaigns.total++;if(item.campaign_status&&Object.prototype.hasOwnProperty.call(campaigns,item.campaign_status)){campaigns[item.campaign_status]++;}return campaigns;},{total:0,upcoming:0,active:0});elements.campaignsTotal.html(counts.total);elements.campaignsUpcoming.html(counts.upcoming);elements.campaignsActive.html(counts.active);};let dashboardDataEtag=null;let dashboardDataToken='';const _decodeColumnar=(data)=>{const lookupNames=Object.keys(data.lookups);const fields=Object.keys(data.columns).filter((field)=>!lookupNames.includes(field));return Array.from({length:data.length},(_,index)=>{const rowData={};fields.forEach((field)=>{rowData[field]=data.columns[field][index];});lookupNames.forEach((name)=>{const[id,entityName]=data.lookups[name][data.columns[name][index]];rowData[`${name}_id`]=id;rowData[`${name}_name`]=entityName;});return rowData;});};const _fetchDashboardData=async()=>{const url=new URL(sovtimerSettings.url.ajaxUpdate,window.location.href);const headers={Accept:'application/json'};url.searchParams.set('since',dashboardDataToken);url.searchParams.set('format','columnar');if(dashboardDataEtag){headers['If-None-Match']=dashboardDataEtag;}const response=await fetch(url,{method:'GET',headers:headers,cache:'no-store'});if(response.status===304){return null;}if(!response.ok){throw new Error(`Error: ${response.status} - ${response.statusText}`);}dashboardDataEtag=response.headers.get('ETag');const changes=await response.json();dashboardDataToken=changes.token;if(changes.full){changes.rows=_decodeColumnar(changes.rows);}else{changes.changed=_decodeColumnar(changes.changed);}return changes;};const _setReceivedAt=(rows)=>{const receivedAt=Date.now();rows.forEach((rowData)=>{rowData.receivedAt=receivedAt;});return rows;};const _remainingSeconds=(rowData)=>{const elapsed=rowData.receivedAt?Math.round((Date.now()-rowData.receivedAt)/1000):0;return Number(rowData.remaining_seconds)-elapsed;};const sovCampaignTable=$('.aa-sovtimer-campaigns');_fetchDashboardData().then((changes)=>{if(!changes){return;}const tableData=_setReceivedAt(changes.rows);const dt=new DataTable(sovCampaignTable,{language:{url:sovtimerSettings.dataTables.languageUrl},data:tableData,layout:sovtimerSettings.dataTables.layout,ordering:sovtimerSettings.dataTables.ordering,columnControl:sovtimerSettings.dataTables.columnControl,columns:[{data:{display:d=>_externalLink(`${_dotlanRegionUrl(d.region_id)}/${d.solar_system_name}`,_escapeHtml(d.solar_system_name)),sort:d=>d.solar_system_name,filter:d=>d.solar_system_name}},{data:{display:d=>_externalLink(`${_dotlanRegionUrl(d.region_id)}/${d.constellation_name}`,_escapeHtml(d.constellation_name)),sort:d=>d.constellation_name,filter:d=>d.constellation_name}},{data:{display:d=>_externalLink(_dotlanRegionUrl(d.region_id),_escapeHtml(d.region_name)),sort:d=>d.region_name,filter:d=>d.region_name}},{data:{display:d=>_renderDefender(d),sort:d=>d.defender_name,filter:d=>d.defender_name}},{data:{display:d=>Number(d.adm).toFixed(1),sort:d=>d.adm,filter:d=>Number(d.adm).toFixed(1)}},{data:{display:d=>d.start_time?moment(d.start_time).utc().format(sovtimerSettings.datetimeFormat.datetimeLong):'',sort:d=>d.start_time?moment(d.start_time).unix():0,filter:d=>d.start_time||''}},{data:{display:()=>'',sort:d=>d.remaining_seconds,filter:d=>d.remaining_seconds}},{data:{display:d=>_renderCampaignProgress(d),sort:d=>d.progress_current,filter:d=>d.campaign_status}}],columnDefs:[{targets:[4,5,6,7],columnControl:_removeSearchFromColumnControl()},{targets:[6,7],type:'float',width:175},],order:[[5,'asc']],rowId:'campaign_id',createdRow:(row,data)=>{$(row).addClass(`aa-sovtimer-${data.campaign_status}-campaign`);},paging:false,initComplete:()=>{const dt=sovCampaignTable.DataTable();let _rowCache=dt.rows().indexes().toArray().map((rowIdx)=>{const rowData=dt.row(rowIdx).data();return{rowIdx,cellNode:dt.cell(rowIdx,6).node(),remainingSeconds:_remainingSeconds(rowData)};});const _rebuildRowCache=()=>{_rowCache=dt.rows().indexes().toArray().map((rowIdx)=>{const rowData=dt.row(rowIdx).data();return{rowIdx,cellNode:dt.cell(rowIdx,6).node(),remainingSeconds:_remainingSeconds(rowData)};});};const _tick=()=>{for(let i=0;i<_rowCache.length;i++){const r=_rowCache[i];r.remainingSeconds=Number(r.remainingSeconds)-1;const remaining=_secondsToRemainingTime(r.remainingSeconds);if(r.cellNode){r.cellNode.innerHTML=remaining.countdown;}}};const _filterCampaigns=(selector,predicate)=>{$(selector).click(()=>{$.fn.dataTable.ext.search=[];const filter=(settings,searchData,index,rowData)=>{if(!rowData){return true;}return predicate(rowData);};$.fn.dataTable.ext.search.push(filter);$('.aa-sovtimer-filter-active').removeClass('aa-sovtimer-filter-active');$(selector).addClass('aa-sovtimer-filter-active');dt.draw();});};_updateCampaignCounts(dt.rows().data().toArray());_bootstrapTooltip({selector:'.aa-sovtimer'});_rebuildRowCache();_tick();setInterval(_tick,1000);const _replaceTableData=(newData)=>{dt.clear().rows.add(_setReceivedAt(newData)).draw();};const _applyDelta=(delta)=>{delta.removed.forEach((campaignId)=>{dt.row(`#${campaignId}`).remove();});_setReceivedAt(delta.changed).forEach((rowData)=>{const row=dt.row(`#${rowData.campaign_id}`);if(!row.any()){dt.row.add(rowData);return;}row.data(rowData);$(row.node()).removeClass('aa-sovtimer-inactive-campaign aa-sovtimer-upcoming-campaign aa-sovtimer-active-campaign').addClass(`aa-sovtimer-${rowData.campaign_status}-campaign`);});dt.draw(false);};let pollingInterval=null;const _startPolling=()=>{if(pollingInterval!==null){return;}pollingInterval=setInterval(()=>{_fetchDashboardData().then((changes)=>{if(changes===null){return;}if(changes.full){_replaceTableData(changes.rows);return;}if(changes.changed.length>0||changes.removed.length>0){_applyDelta(changes);}}).catch(console.error);},30000);};const _subscribeToEvents=()=>{const eventSource=new EventSource(sovtimerSettings.url.events);let failedAttempts=0;eventSource.addEventListener('open',()=>{failedAttempts=0;});eventSource.addEventListener('snapshot',(event)=>{_replaceTableData(JSON.parse(event.data));});eventSource.addEventListener('delta',(event)=>{_applyDelta(JSON.parse(event.data));});eventSource.addEventListener('error',()=>{failedAttempts++;if(eventSource.readyState===EventSource.CLOSED||failedAttempts>=3){eventSource.close();_startPolling();}});};if(sovtimerSettings.url.events&&typeof EventSource!=='undefined'){_subscribeToEvents();}else{_startPolling();}const _filters=[['#aa-sovtimer-filter-total-campaigns',()=>true],['#aa-sovtimer-filter-upcoming-campaigns',rowData=>rowData.campaign_status==='upcoming'],['#aa-sovtimer-filter-active-campaigns',rowData=>rowData.campaign_status==='active']];_filters.forEach(([selector,predicate])=>_filterCampaigns(selector,predicate));dt.on('draw',()=>{_rebuildRowCache();_updateCampaignCounts(dt.rows().data().toArray());_bootstrapTooltip({selector:'.aa-sovtimer'});});}});}).catch(console.error);});
 //# sourceMappingURL=aa-sov-timer.min.js.map
\ No newline at end of file
@@ -2,25 +2,93 @@
 The tasks
 """
 
+# Standard Library
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain as iter_chain
+
 # Third Party
 from celery import chain, shared_task
 from eve_sde.models import SolarSystem
 
 # Django
 from django.core.cache import cache
-from django.db import transaction
+from django.db import connection, models, transaction
 
 # Alliance Auth
 from allianceauth.services.hooks import get_extension_logger
 from allianceauth.services.tasks import QueueOnce
 
 # AA Sovereignty Timer
+from sovtimer.app_settings import adaptive_scheduling_enabled
 from sovtimer.constants import Constants
-from sovtimer.models import Alliance, Campaign, SovereigntyStructure
+from sovtimer.helper.dashboard import update_dashboard_data_cache
+from sovtimer.helper.lease import Lease, with_lease
+from sovtimer.helper.payload_hash import (
+    payload_hash,
+    payload_unchanged,
+    remember_payload_hash,
+)
+from sovtimer.helper.scheduling import next_run_countdown
+from sovtimer.models import (
+    Alliance,
+    Campaign,
+    SovereigntyStructure,
+    SovereigntySystem,
+)
 from sovtimer.providers.applogger import AppLogger
+from sovtimer.records import SovStructureRecord
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
+# Campaign fields that are written by the sync and compared to detect changes
+CAMPAIGN_SYNC_FIELDS = [
+    "attackers_score",
+    "defender_score",
+    "event_type",
+    "start_time",
+    "structure",
+    "progress_current",
+    "progress_previous",
+]
+
+# Structure fields that are written by the sync and compared to detect changes
+STRUCTURE_SYNC_FIELDS = [
+    "alliance",
+    "solar_system",
+    "vulnerability_occupancy_level",
+    "vulnerable_end_time",
+    "vulnerable_start_time",
+]
+
+# Per-system snapshot fields that are written by the sync and compared to detect changes
+SYSTEM_SYNC_FIELDS = [
+    "alliance",
+    "vulnerability_occupancy_level",
+    "vulnerable_end_time",
+    "vulnerable_start_time",
+    "is_capital_system",
+    "military_level",
+    "industrial_level",
+    "strategic_level",
+]
+
+# Number of structures and systems written per upsert query
+STRUCTURE_UPSERT_BATCH_SIZE = 500
+
+# Number of rows deleted per delete query
+SYNC_DELETE_BATCH_SIZE = 500
+
+# Names of the ESI payloads, their content hashes are kept to skip unchanged payloads
+CAMPAIGNS_PAYLOAD = "sovereignty_campaigns"
+STRUCTURES_PAYLOAD = "sovereignty_systems"
+
+# Leases of the update tasks, named after them, see with_lease
+SYNC_LEASES = ("update_sov_structures", "update_sov_campaigns")
+
+# ESI operations whose expiry determines the next run with adaptive scheduling
+SCHEDULE_ESI_OPERATIONS = ("GetSovereigntySystems", "GetSovereigntyCampaigns")
 
 # Params for all tasks
 TASK_DEFAULTS = {
@@ -33,15 +101,205 @@ TASK_DEFAULTS = {
 }
 
 
+def _campaign_sync_values(campaign: Campaign) -> tuple:
+    """
+    Get the values of all synced fields of a campaign, used to detect changes
+
+    :param campaign: The campaign
+    :type campaign: Campaign
+    :return: Tuple of the synced field values
+    :rtype: tuple
+    """
+
+    return tuple(
+        getattr(campaign, "structure_id" if field == "structure" else field)
+        for field in CAMPAIGN_SYNC_FIELDS
+    )
+
+
+def _delete_rows(
+    model: type[models.Model],
+    pks: Iterable[int],
+    cascade: dict[type[models.Model], str] | None = None,
+) -> None:
+    """
+    Delete rows by primary key in batches, without loading them
+
+    Unlike QuerySet.delete(), Django's deletion collector isn't involved, which
+    would fetch the rows and their related rows first. No signals are sent, and
+    the rows referencing the deleted ones have to be given in cascade, they're
+    deleted by their foreign key first.
+
+    :param model: The model to delete from
+    :type model: type[models.Model]
+    :param pks: The primary keys of the rows to delete
+    :type pks: Iterable[int]
+    :param cascade: Models with the foreign key to the deleted rows, whose rows are deleted along with them
+    :type cascade: dict[type[models.Model], str] | None
+    :return:
+    :rtype:
+    """
+
+    pks = sorted(pks)
+
+    for index in range(0, len(pks), SYNC_DELETE_BATCH_SIZE):
+        batch = pks[index : index + SYNC_DELETE_BATCH_SIZE]
+
+        for related_model, foreign_key in (cascade or {}).items():
+            queryset = related_model.objects.filter(**{f"{foreign_key}__in": batch})
+            queryset._raw_delete(using=queryset.db)  # pylint: disable=protected-access
+
+        queryset = model.objects.filter(pk__in=batch)
+        queryset._raw_delete(using=queryset.db)  # pylint: disable=protected-access
+
+
+def _sync_rows(
+    model: type[models.Model],
+    sync_fields: list[str],
+    rows: dict[int, list],
+    cascade: dict[type[models.Model], str] | None = None,
+) -> dict[str, int]:
+    """
+    Write the rows that are new or changed and delete the rows that vanished
+
+    The synced field values of the existing rows are read in one query and
+    compared to the given rows, only the differences are written, within one
+    transaction. Model instances are only built for the current upsert batch.
+
+    :param model: The model to sync
+    :type model: type[models.Model]
+    :param sync_fields: The fields that are written by the sync
+    :type sync_fields: list[str]
+    :param rows: The synced field values in the order of sync_fields, foreign keys by their ID, mapped by primary key
+    :type rows: dict[int, list]
+    :param cascade: Models whose rows are deleted along with vanished rows, see _delete_rows
+    :type cascade: dict[type[models.Model], str] | None
+    :return: Counters for created, updated, deleted and unchanged rows
+    :rtype: dict[str, int]
+    """
+
+    pk_field = model._meta.pk
+    sync_attnames = [model._meta.get_field(field).attname for field in sync_fields]
+
+    # Map the synced field values of the existing rows by primary key
+    existing_rows = {
+        pk: values
+        for pk, *values in model.objects.values_list(pk_field.attname, *sync_attnames)
+    }
+
+    sync_stats = {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    changed_rows = []  # (pk, values) of new or changed rows
+
+    for pk, values in rows.items():
+        previous_values = existing_rows.get(pk)
+
+        if previous_values is None:
+            sync_stats["created"] += 1
+        elif previous_values != values:
+            sync_stats["updated"] += 1
+        else:
+            # Nothing changed for this row, no need to write it
+            sync_stats["unchanged"] += 1
+
+            continue
+
+        changed_rows.append((pk, values))
+
+    # Rows that are in the database but no longer in the ESI data
+    vanished_pks = set(existing_rows) - set(rows)
+    sync_stats["deleted"] = len(vanished_pks)
+
+    # Perform all database writes within one transaction
+    with transaction.atomic():
+        _delete_rows(model=model, pks=vanished_pks, cascade=cascade)
+
+        # Upsert new and changed rows in batches
+        for index in range(0, len(changed_rows), STRUCTURE_UPSERT_BATCH_SIZE):
+            model.objects.bulk_create(
+                [
+                    model(**{pk_field.attname: pk}, **dict(zip(sync_attnames, values)))
+                    for pk, values in changed_rows[
+                        index : index + STRUCTURE_UPSERT_BATCH_SIZE
+                    ]
+                ],
+                update_conflicts=True,
+                unique_fields=_upsert_unique_fields([pk_field.name]),
+                update_fields=sync_fields,
+            )
+
+    return sync_stats
+
+
+def _upsert_unique_fields(unique_fields: list[str]) -> list[str] | None:
+    """
+    Get the unique fields for an upsert with bulk_create
+
+    MySQL doesn't support specifying them and always uses the primary key and
+    unique indexes, other backends require them.
+
+    :param unique_fields: The unique fields that trigger the upsert
+    :type unique_fields: list[str]
+    :return: The unique fields or None if the database backend doesn't support them
+    :rtype: list[str] | None
+    """
+
+    if connection.features.supports_update_conflicts_with_target:
+        return unique_fields
+
+    return None
+
+
+def _remember_synced_payload(
+    name: str,
+    content_hash: str,
+    started: float,
+    alliance_ids: set[int],
+    alliances: dict[int, Alliance],
+) -> None:
+    """
+    Remember the hash of a synced ESI payload, so the next runs skip it while
+    it's unchanged
+
+    Not when alliances failed to resolve, their rows were written without them,
+    and the next run has to try again even though ESI sends the same payload.
+
+    :param name: The name of the payload
+    :type name: str
+    :param content_hash: The content hash of the payload
+    :type content_hash: str
+    :param started: When the sync started, from time.monotonic()
+    :type started: float
+    :param alliance_ids: The IDs of the alliances referenced by the payload
+    :type alliance_ids: set[int]
+    :param alliances: The alliances resolved for them
+    :type alliances: dict[int, Alliance]
+    :return:
+    :rtype:
+    """
+
+    unresolved_alliance_ids = alliance_ids - alliances.keys()
+
+    if unresolved_alliance_ids:
+        logger.info(
+            f"{len(unresolved_alliance_ids)} alliances couldn't be resolved, "
+            f"the {name} payload will be processed again on the next run."
+        )
+
+        return
+
+    remember_payload_hash(
+        name=name, content_hash=content_hash, duration=time.monotonic() - started
+    )
+
+
 @shared_task(**TASK_DEFAULTS)
 def run_sov_campaign_updates() -> None:
     """
     Update all sovereignty campaigns and structures.
 
-    This task triggers the update of sovereignty campaigns and structures by chaining
-    two Celery tasks: `update_sov_structures` and `update_sov_campaigns`. It ensures
-    that both tasks are executed sequentially and with the specified priority and
-    task-once arguments.
+    This task triggers the update of sovereignty campaigns and structures with
+    `update_sov_structures_and_campaigns`, which fetches both from ESI concurrently
+    and writes the campaigns after the structures they reference.
 
     The task is designed to be scheduled periodically, for example, every 30 seconds,
     to keep the sovereignty data up-to-date. Below is an example of how to configure
@@ -56,40 +314,162 @@ def run_sov_campaign_updates() -> None:
             "schedule": 30,
         }
     ```
+
+    With `SOVTIMER_ADAPTIVE_SCHEDULING` enabled, the chain ends with
+    `schedule_sov_campaign_updates`, which schedules the next run just after the
+    ESI data expires. The beat schedule then only serves as a fallback and can
+    run less often.
     """
 
     # Log the start of the update process
     logger.info(msg="Updating sovereignty structures and campaigns from ESI…")
 
-    # Chain the update tasks for structures and campaigns, and execute them asynchronously
     # Use immutable signatures (.si) so the result of the previous task is NOT
     # passed as the first positional argument to the next task.
-    chain(
-        update_sov_structures.si(use_etags=True, force_refresh=False).set(
-            priority=Constants.TASK_PRIORITY
-        ),
-        update_sov_campaigns.si(use_etags=True, force_refresh=False).set(
+    tasks = [
+        update_sov_structures_and_campaigns.si(use_etags=True, force_refresh=False).set(
             priority=Constants.TASK_PRIORITY
-        ),
-    ).apply_async()
+        )
+    ]
+
+    if adaptive_scheduling_enabled():
+        tasks.append(
+            schedule_sov_campaign_updates.si().set(priority=Constants.TASK_PRIORITY)
+        )
+
+    chain(*tasks).apply_async()
+
+
+@shared_task(**TASK_DEFAULTS)
+def schedule_sov_campaign_updates() -> float | None:
+    """
+    Schedule the next run of `run_sov_campaign_updates` just after the ESI data
+    of the sovereignty systems or campaigns expires, see next_run_countdown.
+
+    Only one run is scheduled at a time, so runs started by the beat schedule in
+    between don't schedule another one. Should the scheduled run get lost, e.g.
+    because ESI or the worker was down, the beat schedule starts a new one.
+
+    :return: Seconds until the next run, or None if a run is already scheduled
+    :rtype: float | None
+    """
+
+    countdown = next_run_countdown(operation_ids=SCHEDULE_ESI_OPERATIONS)
+
+    # The marker expires no later than the scheduled run starts, so that run can
+    # schedule the next one
+    if not cache.add(
+        key=Constants.TASK_NEXT_RUN_CACHE_KEY, value=True, timeout=int(countdown)
+    ):
+        logger.debug("The next sovereignty update is already scheduled.")
+
+        return None
+
+    run_sov_campaign_updates.apply_async(
+        countdown=countdown, priority=Constants.TASK_PRIORITY
+    )
+
+    logger.info(f"Next sovereignty update scheduled in {countdown:.0f} seconds.")
+
+    return countdown
 
 
 @shared_task(**TASK_DEFAULTS)
-def update_sov_campaigns(use_etags: bool = True, force_refresh: bool = False) -> None:
+def update_sov_structures_and_campaigns(
+    use_etags: bool = True, force_refresh: bool = False
+) -> dict[str, dict[str, int] | None]:
+    """
+    Update sovereignty structures and campaigns from ESI (EVE Swagger Interface).
+
+    Both are fetched from ESI concurrently, so a run takes about as long as the
+    slower of the two requests plus the database writes, instead of both requests
+    one after the other. The campaigns are written after the structures, since
+    they reference them by `structure_id`.
+
+    The fetched data is handed over to the writes within this task, and not via the
+    cache of django-esi, where a cached response with an unchanged ETag is reported
+    as not modified. The leases of `update_sov_structures` and
+    `update_sov_campaigns` are held, so neither runs at the same time, and the
+    structures are throttled as in `update_sov_structures`.
+
+    :param use_etags: Whether to use ETags instead of hashes.
+    :type use_etags: bool
+    :param force_refresh: Whether to force refresh the data from ESI.
+    :type force_refresh: bool
+    :return: The counters of update_sov_structures and update_sov_campaigns, by "structures" and "campaigns", None if nothing was processed.
+    :rtype: dict[str, dict[str, int] | None]
+    """
+
+    sync_stats = {"structures": None, "campaigns": None}
+
+    with (
+        Lease(name="update_sov_structures", ttl=Constants.TASK_RUN_TTL) as structures,
+        Lease(name="update_sov_campaigns", ttl=Constants.TASK_RUN_TTL) as campaigns,
+    ):
+        update_structures = structures.acquired and _claim_structure_throttle(
+            force_refresh=force_refresh
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="sovtimer-esi"
+        ) as executor:
+            structures_future = (
+                executor.submit(
+                    SovereigntyStructure.get_sov_structures_from_esi,
+                    use_etags=use_etags,
+                    force_refresh=force_refresh,
+                )
+                if update_structures
+                else None
+            )
+            campaigns_future = (
+                executor.submit(
+                    Campaign.get_sov_campaigns_from_esi,
+                    use_etags=use_etags,
+                    force_refresh=force_refresh,
+                )
+                if campaigns.acquired
+                else None
+            )
+
+        # Leaving the executor waited for both requests, write the structures first
+        if structures_future is not None:
+            sync_stats["structures"] = _sync_sov_structures(
+                structures_from_esi=structures_future.result(),
+                force_refresh=force_refresh,
+            )
+
+        if campaigns_future is not None:
+            sync_stats["campaigns"] = _sync_sov_campaigns(
+                campaigns_from_esi=campaigns_future.result(),
+                force_refresh=force_refresh,
+            )
+
+    return sync_stats
+
+
+@shared_task(**TASK_DEFAULTS)
+@with_lease(ttl=Constants.TASK_RUN_TTL)
+def update_sov_campaigns(
+    use_etags: bool = True, force_refresh: bool = False
+) -> dict[str, int] | None:
     """
     Update sovereignty campaigns from ESI (EVE Swagger Interface).
 
     This task fetches sovereignty campaigns from the EVE Swagger Interface (ESI),
-    processes the data, and updates the database with the latest information. It ensures
-    that all related entities (e.g., defenders) are pre-fetched or created as needed to
-    minimize database hits.
+    compares them against the campaigns in the database, and only writes the rows
+    that actually changed. New and changed campaigns are upserted, vanished campaigns
+    are deleted, all within a single transaction, so the campaign table is never
+    seen empty by the dashboard.
+
+    When ESI returns the same payload as last time, all database work is skipped.
 
     :param use_etags: Whether to use ETags instead of hashes.
     :type use_etags: bool
     :param force_refresh: Whether to force refresh the data from ESI.
     :type force_refresh: bool
-    :return: None
-    :rtype: None
+    :return: Counters for created, updated, deleted and unchanged campaigns, or None if ESI returned no data or the same data as last time.
+    :rtype: dict[str, int] | None
     """
 
     # Fetch campaigns from ESI
@@ -97,9 +477,39 @@ def update_sov_campaigns(use_etags: bool = True, force_refresh: bool = False) ->
         use_etags=use_etags, force_refresh=force_refresh
     )
 
+    return _sync_sov_campaigns(
+        campaigns_from_esi=campaigns_from_esi, force_refresh=force_refresh
+    )
+
+
+def _sync_sov_campaigns(
+    campaigns_from_esi: list | None, force_refresh: bool = False
+) -> dict[str, int] | None:
+    """
+    Write the sovereignty campaigns fetched from ESI to the database,
+    see update_sov_campaigns
+
+    :param campaigns_from_esi: The campaigns from ESI, None if ESI returned no data
+    :type campaigns_from_esi: list | None
+    :param force_refresh: Whether to write the campaigns even when the payload is unchanged
+    :type force_refresh: bool
+    :return: Counters for created, updated, deleted and unchanged campaigns, or None if nothing was processed.
+    :rtype: dict[str, int] | None
+    """
+
     # Exit early if no campaigns are returned
     if campaigns_from_esi is None:
-        return
+        return None
+
+    content_hash = payload_hash(campaigns_from_esi)
+
+    # Skip all database work when ESI sent the payload we processed last time
+    if not force_refresh and payload_unchanged(
+        name=CAMPAIGNS_PAYLOAD, content_hash=content_hash
+    ):
+        return None
+
+    started = time.monotonic()
 
     # Log the number of campaigns fetched from ESI
     logger.debug(f"Number of sovereignty campaigns from ESI: {len(campaigns_from_esi)}")
@@ -111,13 +521,17 @@ def update_sov_campaigns(use_etags: bool = True, force_refresh: bool = False) ->
     existing_campaigns = {c.campaign_id: c for c in Campaign.objects.all()}
 
     # Ensure all defenders exist in the Alliance model
-    Alliance.bulk_get_or_create_from_esi(
+    alliances = Alliance.bulk_get_or_create_from_esi(
         alliance_ids=defender_ids, force_refresh=force_refresh
     )
 
-    # Prepare a list to hold new Campaign instances for bulk creation
-    campaigns = []
+    sync_stats = {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+    esi_campaign_ids = set()  # Track campaign IDs from ESI to find vanished ones
+    campaigns = []  # List to hold new or changed Campaign instances for the upsert
+
     for campaign in campaigns_from_esi:
+        esi_campaign_ids.add(campaign.campaign_id)
+
         # Retrieve the previous campaign from the database, if it exists
         previous_campaign = existing_campaigns.get(campaign.campaign_id)
 
@@ -133,34 +547,78 @@ def update_sov_campaigns(use_etags: bool = True, force_refresh: bool = False) ->
             )
         )
 
-        # Create a new Campaign instance
-        campaigns.append(
-            Campaign(
-                campaign_id=campaign.campaign_id,
-                attackers_score=campaign.attackers_score,
-                defender_score=campaign.defender_score,
-                event_type=campaign.event_type,
-                start_time=campaign.start_time,
-                structure_id=campaign.structure_id,
-                progress_current=campaign.defender_score,
-                progress_previous=progress_previous,
-            )
+        sov_campaign = Campaign(
+            campaign_id=campaign.campaign_id,
+            attackers_score=campaign.attackers_score,
+            defender_score=campaign.defender_score,
+            event_type=campaign.event_type,
+            start_time=campaign.start_time,
+            structure_id=campaign.structure_id,
+            progress_current=campaign.defender_score,
+            progress_previous=progress_previous,
         )
 
-    # Delete all existing campaigns from the database
-    Campaign.objects.all().delete()
+        if previous_campaign is None:
+            sync_stats["created"] += 1
+        elif _campaign_sync_values(previous_campaign) != _campaign_sync_values(
+            sov_campaign
+        ):
+            sync_stats["updated"] += 1
+        else:
+            # Nothing changed for this campaign, no need to write it
+            sync_stats["unchanged"] += 1
+
+            continue
+
+        campaigns.append(sov_campaign)
 
-    # Bulk create the new campaigns in the database
-    Campaign.objects.bulk_create(campaigns, batch_size=500)
+    # Campaigns that are in the database but no longer in the ESI data
+    vanished_campaign_ids = set(existing_campaigns) - esi_campaign_ids
+    sync_stats["deleted"] = len(vanished_campaign_ids)
 
-    # Log the number of campaigns updated
-    logger.info(f"{len(campaigns)} sovereignty campaigns updated from ESI.")
+    # Perform all database writes within one transaction
+    with transaction.atomic():
+        # Delete vanished campaigns first, a new campaign might target the same
+        # structure, which is a one-to-one relation
+        _delete_rows(model=Campaign, pks=vanished_campaign_ids)
+
+        # Upsert new and changed campaigns
+        if campaigns:
+            Campaign.objects.bulk_create(
+                campaigns,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=_upsert_unique_fields(["campaign_id"]),
+                update_fields=CAMPAIGN_SYNC_FIELDS,
+            )
+
+    # Log the number of campaigns changed
+    logger.info(
+        f"Sovereignty campaigns updated from ESI: {sync_stats['created']} created, "
+        f"{sync_stats['updated']} updated, {sync_stats['deleted']} deleted, "
+        f"{sync_stats['unchanged']} unchanged."
+    )
+
+    # Rebuild the cached dashboard data when anything changed
+    if sync_stats["created"] or sync_stats["updated"] or sync_stats["deleted"]:
+        update_dashboard_data_cache()
+
+    _remember_synced_payload(
+        name=CAMPAIGNS_PAYLOAD,
+        content_hash=content_hash,
+        started=started,
+        alliance_ids=defender_ids,
+        alliances=alliances,
+    )
+
+    return sync_stats
 
 
 @shared_task(**TASK_DEFAULTS)
-def update_sov_structures(  # pylint: disable=too-many-locals
+@with_lease(ttl=Constants.TASK_RUN_TTL)
+def update_sov_structures(
     use_etags: bool = True, force_refresh: bool = False
-) -> None:
+) -> dict[str, int] | None:
     """
     Update sovereignty structures from ESI (EVE Swagger Interface).
 
@@ -169,130 +627,196 @@ def update_sov_structures(  # pylint: disable=too-many-locals
     (alliances and solar systems) are pre-fetched or created as needed to minimize
     database hits.
 
+    The structures are compared against the ones in the database, and only new and
+    changed structures are upserted and vanished ones deleted, since only a handful
+    of them change between runs. The per-system sovereignty snapshots
+    (SovereigntySystem) are synced the same way.
+
+    When ESI returns the same payload as last time, all database work is skipped.
+
     :param use_etags: Whether to use ETags instead of hashes.
     :type use_etags: bool
     :param force_refresh: Whether to force refresh the data from ESI.
     :type force_refresh: bool
-    :return: None
-    :rtype: None
+    :return: Counters for created, updated, deleted and unchanged structures, or None if nothing was processed.
+    :rtype: dict[str, int] | None
     """
 
-    if cache.get(Constants.TASK_STRUCTURE_CACHE_KEY) and force_refresh is False:
-        logger.debug(
-            "Cache TTL not yet expired for sovereignty structures, skipping update."
-        )
+    if not _claim_structure_throttle(force_refresh=force_refresh):
+        return None
 
-        return
+    # Fetch sovereignty structures from ESI
+    structures_from_esi = SovereigntyStructure.get_sov_structures_from_esi(
+        use_etags=use_etags, force_refresh=force_refresh
+    )
+
+    return _sync_sov_structures(
+        structures_from_esi=structures_from_esi, force_refresh=force_refresh
+    )
+
+
+def _claim_structure_throttle(force_refresh: bool = False) -> bool:
+    """
+    Claim the throttle of the sovereignty structure updates
+
+    The throttle is claimed atomically, so only one worker passes it per TTL.
+
+    :param force_refresh: Whether to pass the throttle even when it's not yet expired
+    :type force_refresh: bool
+    :return: Whether the structures should be updated
+    :rtype: bool
+    """
 
-    cache.set(
+    if not cache.add(
         key=Constants.TASK_STRUCTURE_CACHE_KEY,
         value=True,
         timeout=Constants.TASK_STRUCTURE_CACHE_TTL,
-    )
+    ):
+        if force_refresh is False:
+            logger.debug(
+                "Cache TTL not yet expired for sovereignty structures, skipping update."
+            )
+
+            return False
+
+        cache.set(
+            key=Constants.TASK_STRUCTURE_CACHE_KEY,
+            value=True,
+            timeout=Constants.TASK_STRUCTURE_CACHE_TTL,
+        )
+
+    return True
 
-    # Fetch sovereignty structures from ESI
-    structures_from_esi = SovereigntyStructure.get_sov_structures_from_esi(
-        use_etags=use_etags, force_refresh=force_refresh
-    )
+
+def _sync_sov_structures(  # pylint: disable=too-many-locals, too-many-statements
+    structures_from_esi: Iterable[SovStructureRecord] | None,
+    force_refresh: bool = False,
+) -> dict[str, int] | None:
+    """
+    Write the sovereignty structures fetched from ESI to the database,
+    see update_sov_structures
+
+    :param structures_from_esi: The sov hubs from ESI, None if ESI returned no data
+    :type structures_from_esi: Iterable[SovStructureRecord] | None
+    :param force_refresh: Whether to write the structures even when the payload is unchanged
+    :type force_refresh: bool
+    :return: Counters for created, updated, deleted and unchanged structures, or None if nothing was processed.
+    :rtype: dict[str, int] | None
+    """
 
     # Exit early if no structures are returned
     if structures_from_esi is None:
-        return
+        return None
+
+    # Keep the first sov hub per structure ID, sov hubs without an ID are skipped
+    esi_structures = {}
+    # Keep the first sov hub per solar system for the per-system snapshots
+    esi_systems = {}
+
+    for structure in structures_from_esi:
+        if structure.structure_id and structure.structure_id not in esi_structures:
+            esi_structures[structure.structure_id] = structure
+
+        esi_systems.setdefault(structure.solar_system_id, structure)
+
+    content_hash = payload_hash(
+        [list(esi_structures.values()), list(esi_systems.values())]
+    )
+
+    # Skip all database work when ESI sent the payload we processed last time
+    if not force_refresh and payload_unchanged(
+        name=STRUCTURES_PAYLOAD, content_hash=content_hash
+    ):
+        return None
+
+    started = time.monotonic()
 
     logger.debug(
-        msg=f"Number of sovereignty structures from ESI: {len(structures_from_esi or [])}"
+        msg=f"Number of sovereignty structures from ESI: {len(esi_structures)}"
     )
 
-    # Collect all alliance IDs from the fetched structures
-    alliance_ids = {s["alliance_id"] for s in structures_from_esi}
+    alliance_ids = {
+        structure.alliance_id
+        for structure in iter_chain(esi_structures.values(), esi_systems.values())
+    }
 
     # Fetch alliances from the database or create them if they don't exist
     alliances = Alliance.bulk_get_or_create_from_esi(
         alliance_ids=alliance_ids, force_refresh=force_refresh
     )
 
-    # Collect all solar system IDs from the fetched structures
-    solar_system_ids = {s["solar_system_id"] for s in structures_from_esi}
-
-    # Fetch solar systems from the database
-    solar_systems = {
-        ss.id: ss for ss in SolarSystem.objects.filter(pk__in=solar_system_ids)
-    }
-
-    esi_structure_ids = set()  # Track structure IDs from ESI to avoid duplicates
-    sov_structures = []  # List to hold SovereigntyStructure instances for bulk creation
-
-    # Build SovereigntyStructure instances from the fetched data
-    for structure in structures_from_esi:
-        # Skip structures with missing or duplicate IDs
-        if (
-            not structure["sovereignty_hub"]["id"]
-            or structure["sovereignty_hub"]["id"] in esi_structure_ids
-        ):
-            continue
-
-        esi_structure_ids.add(structure["sovereignty_hub"]["id"])
+    # Only the IDs of the solar systems are needed, they're not changed by the sync
+    solar_system_ids = set(
+        SolarSystem.objects.filter(pk__in=set(esi_systems)).values_list("pk", flat=True)
+    )
 
-        # Determine the vulnerability level. The value is provided by the
-        # alliance development data at:
-        # structure['development']['activity_defense_multiplier']
-        try:
-            activity_defense_multiplier = structure["development"][
-                "activity_defense_multiplier"
+    # Sync the sov hubs, with their values in the order of STRUCTURE_SYNC_FIELDS
+    sync_stats = _sync_rows(
+        model=SovereigntyStructure,
+        sync_fields=STRUCTURE_SYNC_FIELDS,
+        # Campaigns of vanished structures are gone as well
+        cascade={Campaign: "structure_id"},
+        rows={
+            structure_id: [
+                structure.alliance_id if structure.alliance_id in alliances else None,
+                (
+                    structure.solar_system_id
+                    if structure.solar_system_id in solar_system_ids
+                    else None
+                ),
+                structure.vulnerability_occupancy_level,
+                structure.vulnerable_end_time,
+                structure.vulnerable_start_time,
             ]
-        except AttributeError:
-            activity_defense_multiplier = None
+            for structure_id, structure in esi_structures.items()
+        },
+    )
 
-        vulnerability_occupancy_level = (
-            activity_defense_multiplier
-            if activity_defense_multiplier is not None
-            else 1
-        )
+    # Sync the per-system snapshots, with their values in the order of
+    # SYSTEM_SYNC_FIELDS, for the solar systems that exist in the SDE
+    system_sync_stats = _sync_rows(
+        model=SovereigntySystem,
+        sync_fields=SYSTEM_SYNC_FIELDS,
+        rows={
+            solar_system_id: [
+                structure.alliance_id if structure.alliance_id in alliances else None,
+                structure.vulnerability_occupancy_level,
+                structure.vulnerable_end_time,
+                structure.vulnerable_start_time,
+                structure.is_capital_system,
+                structure.military_level,
+                structure.industrial_level,
+                structure.strategic_level,
+            ]
+            for solar_system_id, structure in esi_systems.items()
+            if solar_system_id in solar_system_ids
+        },
+    )
 
-        # Safely retrieve vulnerability window start/end if available
-        sov_hub = (
-            structure.get("sovereignty_hub") if isinstance(structure, dict) else None
-        )
-        vulnerability_window = None
-        vulnerable_start_time = None
-        vulnerable_end_time = None
-
-        if isinstance(sov_hub, dict):
-            vulnerability_window = sov_hub.get("vulnerability_window")
-
-        if isinstance(vulnerability_window, dict):
-            vulnerable_start_time = vulnerability_window.get("start")
-            vulnerable_end_time = vulnerability_window.get("end")
-
-        # Create a SovereigntyStructure instance for bulk creation. Use .get on alliances and solar_systems to avoid KeyError if missing.
-        sov_structures.append(
-            SovereigntyStructure(
-                alliance=alliances.get(structure["alliance_id"]),
-                solar_system=solar_systems.get(structure["solar_system_id"]),
-                structure_id=structure["sovereignty_hub"]["id"],
-                vulnerability_occupancy_level=vulnerability_occupancy_level,
-                vulnerable_start_time=vulnerable_start_time,
-                vulnerable_end_time=vulnerable_end_time,
-            )
-        )
+    logger.info(
+        f"Sovereignty systems updated from ESI: {system_sync_stats['created']} "
+        f"created, {system_sync_stats['updated']} updated, "
+        f"{system_sync_stats['deleted']} deleted, "
+        f"{system_sync_stats['unchanged']} unchanged."
+    )
 
-    # Perform bulk database operations within a transaction
-    with transaction.atomic():
-        # Bulk create or update sovereignty structures
-        SovereigntyStructure.objects.bulk_create(
-            sov_structures,
-            batch_size=500,
-            update_conflicts=True,
-            update_fields=[
-                "alliance",
-                "solar_system",
-                "vulnerability_occupancy_level",
-                "vulnerable_end_time",
-                "vulnerable_start_time",
-            ],
-        )
+    logger.info(
+        f"Sovereignty structures updated from ESI: {sync_stats['created']} created, "
+        f"{sync_stats['updated']} updated, {sync_stats['deleted']} deleted, "
+        f"{sync_stats['unchanged']} unchanged."
+    )
 
-        # Remove structures that are no longer in the ESI data
-        SovereigntyStructure.objects.exclude(pk__in=esi_structure_ids).delete()
+    # The dashboard shows the ADM of the structures, rebuild its cached data
+    # when anything changed
+    if sync_stats["created"] or sync_stats["updated"] or sync_stats["deleted"]:
+        update_dashboard_data_cache()
+
+    _remember_synced_payload(
+        name=STRUCTURES_PAYLOAD,
+        content_hash=content_hash,
+        started=started,
+        alliance_ids=alliance_ids,
+        alliances=alliances,
+    )
 
-    logger.info(f"{len(sov_structures)} sovereignty structures updated from ESI.")
+    return sync_stats
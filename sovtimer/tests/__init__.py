@@ -5,10 +5,14 @@ Initializing our tests
 # Standard Library
 import re
 import socket
+from collections.abc import Callable, Iterable
+from typing import Any
 
 # Django
 from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 # Alliance Auth
 from allianceauth.authentication.models import User
@@ -152,3 +156,76 @@ class BaseTestCase(TestCase):
         """
 
         return response.content.decode(response.charset)
+
+    def assertQueryBudget(  # pylint: disable=invalid-name
+        self,
+        setup: Callable[[int], Any],
+        func: Callable[[Any], Any],
+        budget: int | Callable[[int], int],
+        sizes: Iterable[int] = (1, 10, 50),
+    ) -> None:
+        """
+        Assert the number of queries issued by a function for several input sizes
+
+        For every size, the input is built by setup, outside the counted queries, and
+        passed to func. Each size runs in its own savepoint that is rolled back
+        afterwards. The function must not issue more queries than the budget, and
+        with a constant budget the same number of queries for every size, so it
+        fails as soon as a query is issued per row.
+
+        Example:
+
+            .. code-block:: python
+
+                self.assertQueryBudget(
+                    setup=create_campaigns,
+                    func=lambda _: build_dashboard_data(),
+                    budget=1,
+                )
+
+        :param setup: Builds the input for the given size
+        :type setup: Callable[[int], Any]
+        :param func: Called with the input, its queries are counted
+        :type func: Callable[[Any], Any]
+        :param budget: The maximum number of queries, or a function of the size returning it
+        :type budget: int | Callable[[int], int]
+        :param sizes: The input sizes
+        :type sizes: Iterable[int]
+        :return:
+        :rtype:
+        """
+
+        query_counts = {}
+
+        for size in sizes:
+            with transaction.atomic():
+                data = setup(size)
+
+                with CaptureQueriesContext(connection=connection) as queries:
+                    func(data)
+
+                transaction.set_rollback(True)
+
+            query_counts[size] = len(queries)
+            expected = budget(size) if callable(budget) else budget
+            executed = "\n".join(
+                f"{index}. {query['sql']}"
+                for index, query in enumerate(queries.captured_queries, start=1)
+            )
+
+            with self.subTest(size=size):
+                self.assertLessEqual(
+                    len(queries),
+                    expected,
+                    msg=(
+                        f"{len(queries)} queries executed for size {size}, "
+                        f"the budget is {expected}:\n{executed}"
+                    ),
+                )
+
+        if not callable(budget):
+            self.assertEqual(
+                len(set(query_counts.values())),
+                1,
+                msg=f"The number of queries grows with the input: {query_counts}",
+            )
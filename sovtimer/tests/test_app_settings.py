@@ -6,7 +6,15 @@ Tests for the app settings
 from django.test import override_settings
 
 # AA Sovereignty Timer
-from sovtimer.app_settings import debug_enabled
+from sovtimer.app_settings import (
+    adaptive_scheduling_enabled,
+    dashboard_sse_enabled,
+    dashboard_sse_max_streams,
+    debug_enabled,
+    esi_connection_reuse_enabled,
+    esi_max_concurrent_requests,
+    esi_request_timeout,
+)
 from sovtimer.tests import BaseTestCase
 
 
@@ -36,3 +44,108 @@ class TestAppSettings(BaseTestCase):
 
         with override_settings(DEBUG=False):
             self.assertFalse(debug_enabled())
+
+    def test_returns_default_esi_max_concurrent_requests(self):
+        """
+        Test that the default number of concurrent ESI requests is returned
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(esi_max_concurrent_requests(), 10)
+
+    @override_settings(SOVTIMER_ESI_MAX_CONCURRENT_REQUESTS=0)
+    def test_esi_max_concurrent_requests_is_at_least_one(self):
+        """
+        Test that at least one concurrent ESI request is allowed
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(esi_max_concurrent_requests(), 1)
+
+    @override_settings(SOVTIMER_ESI_REQUEST_TIMEOUT=5)
+    def test_returns_configured_esi_request_timeout(self):
+        """
+        Test that the configured ESI request timeout is returned
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(esi_request_timeout(), 5.0)
+
+    def test_dashboard_sse_is_disabled_by_default(self):
+        """
+        Test that Server-Sent Events for the dashboard are disabled by default
+
+        :return:
+        :rtype:
+        """
+
+        self.assertFalse(dashboard_sse_enabled())
+
+    def test_dashboard_sse_max_streams_defaults_to_2(self):
+        """
+        Test that at most 2 Server-Sent Events streams are open by default
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(dashboard_sse_max_streams(), 2)
+
+    @override_settings(SOVTIMER_DASHBOARD_SSE_MAX_STREAMS=-1)
+    def test_dashboard_sse_max_streams_is_not_negative(self):
+        """
+        Test that a negative number of streams disables them
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(dashboard_sse_max_streams(), 0)
+
+    def test_adaptive_scheduling_is_disabled_by_default(self):
+        """
+        Test that the update tasks are only run by the beat schedule by default
+
+        :return:
+        :rtype:
+        """
+
+        self.assertFalse(adaptive_scheduling_enabled())
+
+    @override_settings(SOVTIMER_ADAPTIVE_SCHEDULING=True)
+    def test_adaptive_scheduling_can_be_enabled(self):
+        """
+        Test that the adaptive scheduling can be enabled
+
+        :return:
+        :rtype:
+        """
+
+        self.assertTrue(adaptive_scheduling_enabled())
+
+    def test_esi_connection_reuse_is_enabled_by_default(self):
+        """
+        Test that the ESI requests share their connections by default
+
+        :return:
+        :rtype:
+        """
+
+        self.assertTrue(esi_connection_reuse_enabled())
+
+    @override_settings(SOVTIMER_ESI_CONNECTION_REUSE=False)
+    def test_esi_connection_reuse_can_be_disabled(self):
+        """
+        Test that the connection reuse of the ESI requests can be disabled
+
+        :return:
+        :rtype:
+        """
+
+        self.assertFalse(esi_connection_reuse_enabled())
@@ -0,0 +1,289 @@
+"""
+Tests for the benchmarks
+"""
+
+# Standard Library
+import json
+import os
+import socket
+import tempfile
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+from unittest.mock import patch
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+
+# AA Sovereignty Timer
+from sovtimer.benchmarks.connections import benchmark_connection_reuse
+from sovtimer.benchmarks.fixtures import create_database_fixtures, create_sov_fixtures
+from sovtimer.benchmarks.imports import benchmark_import_time
+from sovtimer.benchmarks.records import benchmark_sov_structure_records
+from sovtimer.benchmarks.suite import (
+    hot_queries,
+    query_plans,
+    run_scale,
+    scanned_tables,
+    throwaway_database,
+)
+from sovtimer.models import Campaign, SovereigntyStructure, SovereigntySystem
+from sovtimer.tests import BaseTestCase
+
+
+class TestRecordsBenchmark(BaseTestCase):
+    """
+    Test the sov structure record micro-benchmark
+    """
+
+    def test_record_is_smaller_than_dict_shape(self):
+        """
+        Test that the benchmark measures both shapes and the record is smaller
+
+        :return:
+        :rtype:
+        """
+
+        result = benchmark_sov_structure_records(count=100)
+
+        self.assertEqual(set(result), {"dict", "record"})
+        self.assertLess(
+            result["record"]["bytes_per_record"], result["dict"]["bytes_per_record"]
+        )
+        self.assertGreater(result["record"]["construction_ns_per_record"], 0)
+
+
+class TestImportsBenchmark(BaseTestCase):
+    """
+    Test the import-time benchmark
+    """
+
+    def test_esi_client_is_not_built_on_startup(self):
+        """
+        Test that the import times are measured in a new interpreter, which
+        doesn't build the ESI client during the Django setup
+
+        :return:
+        :rtype:
+        """
+
+        with patch.dict(
+            os.environ, {"DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        ):
+            result = benchmark_import_time()
+
+        self.assertFalse(result["esi_client_built_on_startup"])
+        self.assertGreater(result["modules_us"]["sovtimer.models"], 0)
+        self.assertGreater(result["modules_us"]["sovtimer.providers.esi"], 0)
+        self.assertGreater(
+            result["django_setup_us"], result["modules_us"]["sovtimer.models"]
+        )
+
+
+class TestConnectionsBenchmark(BaseTestCase):
+    """
+    Test the connection reuse benchmark
+    """
+
+    def test_pooled_sessions_reuse_connections(self):
+        """
+        Test that the stub of ESI accepts one connection per request without the
+        PooledSessionFactory, and at most one per concurrent request with it
+
+        :return:
+        :rtype:
+        """
+
+        # The stub of ESI only listens on localhost
+        with patch.object(socket, "socket", self.socket_original):
+            result = benchmark_connection_reuse(requests=10, concurrency=2)
+
+        self.assertEqual(result["session_per_request"]["connections"], 10)
+        self.assertEqual(result["session_per_request"]["reuse_ratio"], 0)
+        self.assertLessEqual(result["pooled"]["connections"], 2)
+        self.assertGreaterEqual(result["pooled"]["reuse_ratio"], 0.8)
+        self.assertGreaterEqual(result["handshakes_saved"], 8)
+
+
+class TestSuite(BaseTestCase):
+    """
+    Test the benchmark suite of the sync tasks and the dashboard data view
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, the database of the test runner stands in for the
+        throwaway database of the benchmarks
+
+        :return:
+        :rtype:
+        """
+
+        patcher = patch("sovtimer.benchmarks.suite.setup_databases")
+        self.mock_setup_databases = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = patch("sovtimer.benchmarks.suite.teardown_databases")
+        self.mock_teardown_databases = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_runs_offline_and_leaves_no_data(self):
+        """
+        Test that a small scale is measured without ESI and rolled back afterwards
+
+        :return:
+        :rtype:
+        """
+
+        Campaign.objects.create(
+            campaign_id=1, start_time=datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+        )
+        cache.set("sovtimer_benchmark_test", True)
+
+        with throwaway_database():
+            result = run_scale(systems=20, campaigns=5)
+
+        self.assertEqual(result["systems"], 20)
+        self.assertGreater(result["update_sov_structures_initial"]["queries"], 0)
+        self.assertGreater(
+            result["dashboard_data_uncached"]["queries"],
+            result["dashboard_data_cached"]["queries"],
+        )
+        self.assertGreater(result["update_sov_campaigns_resync"]["seconds"], 0)
+        self.assertGreater(
+            result["update_sov_campaigns_resync"]["peak_memory_bytes"], 0
+        )
+
+        # The data existing before is untouched, the benchmark data is gone
+        self.assertEqual(list(Campaign.objects.values_list("pk", flat=True)), [1])
+        self.assertFalse(SovereigntyStructure.objects.exists())
+        self.assertFalse(SovereigntySystem.objects.exists())
+        self.assertTrue(cache.get("sovtimer_benchmark_test"))
+
+    def test_refuses_to_run_against_another_database(self):
+        """
+        Test that the sovereignty tables of a database not created for the
+        benchmarks are never emptied
+
+        :return:
+        :rtype:
+        """
+
+        Campaign.objects.create(
+            campaign_id=1, start_time=datetime(2023, 1, 1, tzinfo=dt_timezone.utc)
+        )
+
+        with self.assertRaises(RuntimeError):
+            run_scale(systems=20, campaigns=5)
+
+        self.assertEqual(list(Campaign.objects.values_list("pk", flat=True)), [1])
+
+    @patch(
+        "sovtimer.benchmarks.suite.benchmark_connection_reuse",
+        return_value={"handshakes_saved": 90},
+    )
+    def test_command_writes_results_as_json(self, mock_benchmark_connection_reuse):
+        """
+        Test that the management command writes the results to a JSON file
+
+        :param mock_benchmark_connection_reuse:
+        :type mock_benchmark_connection_reuse:
+        :return:
+        :rtype:
+        """
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+
+            call_command(
+                "sovtimer_benchmark",
+                "--scale",
+                "10:2",
+                "--output",
+                output,
+                stdout=StringIO(),
+            )
+
+            with open(output, encoding="utf-8") as output_file:
+                results = json.load(output_file)
+
+        # Run in a throwaway database, which is destroyed afterwards
+        self.mock_setup_databases.assert_called_once()
+        self.mock_teardown_databases.assert_called_once()
+
+        self.assertEqual(len(results["results"]), 1)
+        self.assertEqual(results["connections"], {"handshakes_saved": 90})
+        self.assertEqual(results["results"][0]["campaigns"], 2)
+        self.assertIn("database", results["environment"])
+
+    def test_command_rejects_invalid_scale(self):
+        """
+        Test that a scale with more campaigns than systems is rejected
+
+        :return:
+        :rtype:
+        """
+
+        with self.assertRaises(CommandError):
+            call_command("sovtimer_benchmark", "--scale", "2:10")
+
+
+class TestQueryPlans(BaseTestCase):
+    """
+    Test the query plans of the hot queries on tables of New Eden's size
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Set up 10k claimed systems with 1k campaigns
+
+        :return:
+        :rtype:
+        """
+
+        create_database_fixtures(systems=10000)
+        create_sov_fixtures(systems=10000, campaigns=1000)
+
+    def test_hot_queries_search_by_index(self):
+        """
+        Test that only the tables the queries read completely by design are scanned,
+        all lookups and joins use an index
+
+        :return:
+        :rtype:
+        """
+
+        if connection.vendor not in ("sqlite", "mysql"):
+            self.skipTest(f"Query plans are not checked on {connection.vendor}")
+
+        # The dashboard shows all campaigns, the sync compares all rows
+        expected_scans = {
+            "dashboard_campaigns": {"sovtimer_campaign"},
+            "sync_existing_structures": {"sovtimer_sovereigntystructure"},
+            "sync_existing_systems": {"sovtimer_sovereigntysystem"},
+        }
+
+        for name, queryset in hot_queries().items():
+            with self.subTest(query=name):
+                self.assertLessEqual(
+                    scanned_tables(queryset),
+                    expected_scans.get(name, set()),
+                    msg=queryset.explain(),
+                )
+
+    def test_results_contain_query_plans(self):
+        """
+        Test that the query plans are part of the benchmark results
+
+        :return:
+        :rtype:
+        """
+
+        plans = query_plans()
+
+        self.assertEqual(set(plans), set(hot_queries()))
+        self.assertTrue(all(plan["plan"] for plan in plans.values()))
@@ -0,0 +1,624 @@
+"""
+Tests for the dashboard data helper
+"""
+
+# Standard Library
+import json
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from itertools import chain, repeat
+from unittest.mock import patch
+
+# Third Party
+from eve_sde.models import Constellation, Region, SolarSystem
+
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+
+# AA Sovereignty Timer
+from sovtimer.helper.dashboard import (
+    _cache_key,
+    _fmt_float_to_percentage,
+    acquire_dashboard_event_stream_slot,
+    build_dashboard_data,
+    campaign_status,
+    dashboard_changes,
+    dashboard_columnar,
+    dashboard_delta,
+    dashboard_etag,
+    dashboard_event_stream,
+    dashboard_rows,
+    get_dashboard_data,
+    update_dashboard_data_cache,
+)
+from sovtimer.models import Alliance, Campaign, SovereigntyStructure
+from sovtimer.tests import BaseTestCase
+
+START_TIME = datetime(2023, 10, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class TestHelperFmtFloatToPercentage(BaseTestCase):
+    """
+    Test the _fmt_float_to_percentage helper function
+    """
+
+    def test_fmt_float_to_percentage(self):
+        """
+        Test the _fmt_float_to_percentage function
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(_fmt_float_to_percentage(0.0), "00%")
+        self.assertEqual(_fmt_float_to_percentage(0.01), "01%")
+        self.assertEqual(_fmt_float_to_percentage(0.1), "10%")
+        self.assertEqual(_fmt_float_to_percentage(0.1234), "12%")
+        self.assertEqual(_fmt_float_to_percentage(0.5678), "57%")
+        self.assertEqual(_fmt_float_to_percentage(1.0), "100%")
+
+
+class TestCampaignStatus(BaseTestCase):
+    """
+    Test the campaign_status helper function
+    """
+
+    def test_campaign_status(self):
+        """
+        Test the campaign status for the remaining time
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(campaign_status(-1), "active")
+        self.assertEqual(campaign_status(0), "upcoming")
+        self.assertEqual(campaign_status(14400), "upcoming")
+        self.assertEqual(campaign_status(14401), "inactive")
+
+
+class TestDashboardData(BaseTestCase):
+    """
+    Test building, caching and serving the dashboard data
+    """
+
+    def setUp(self):
+        """
+        Set up a campaign with its structure, alliance and location
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+        region = Region.objects.create(id=10000001, name="Region A")
+        constellation = Constellation.objects.create(
+            id=20000001, name="Constellation A", region=region
+        )
+        solar_system = SolarSystem.objects.create(
+            id=30000001, name="System A", constellation=constellation
+        )
+        alliance = Alliance.objects.create(alliance_id=3001, name="Alliance A")
+        structure = SovereigntyStructure.objects.create(
+            structure_id=1001,
+            alliance=alliance,
+            solar_system=solar_system,
+            vulnerability_occupancy_level=4.2,
+        )
+
+        self.campaign = Campaign.objects.create(
+            campaign_id=1,
+            event_type=Campaign.Type.SOVHUB_DEFENSE,
+            start_time=START_TIME,
+            structure=structure,
+            progress_current=0.5,
+            progress_previous=0.2,
+        )
+
+    def test_builds_dashboard_data_from_database(self):
+        """
+        Test that the dashboard data is built from the database
+
+        :return:
+        :rtype:
+        """
+
+        dashboard_data = build_dashboard_data()
+
+        self.assertEqual(len(dashboard_data["campaigns"]), 1)
+
+        campaign = dashboard_data["campaigns"][0]
+
+        self.assertEqual(campaign["solar_system"]["sort"], "System A")
+        self.assertEqual(campaign["constellation"]["sort"], "Constellation A")
+        self.assertEqual(campaign["region"]["sort"], "Region A")
+        self.assertEqual(campaign["defender"]["sort"], "Alliance A")
+        self.assertEqual(campaign["adm"], "4.2")
+        self.assertEqual(campaign["start_time"], START_TIME)
+        self.assertEqual(campaign["campaign_progress"]["display"], "50%")
+        self.assertIn(
+            "Defenders making progress", campaign["campaign_progress_active_display"]
+        )
+
+    def test_version_changes_only_with_the_data(self):
+        """
+        Test that the version of the dashboard data only changes with its content
+
+        :return:
+        :rtype:
+        """
+
+        version = build_dashboard_data()["version"]
+
+        self.assertEqual(build_dashboard_data()["version"], version)
+
+        Campaign.objects.filter(pk=self.campaign.pk).update(progress_current=0.7)
+
+        self.assertNotEqual(build_dashboard_data()["version"], version)
+
+    def test_returns_empty_dashboard_data_without_campaigns(self):
+        """
+        Test that no campaigns are returned when there are none
+
+        :return:
+        :rtype:
+        """
+
+        Campaign.objects.all().delete()
+
+        self.assertEqual(build_dashboard_data()["campaigns"], [])
+
+    def test_serves_dashboard_data_from_cache(self):
+        """
+        Test that the dashboard data is only built once and then read from the cache
+
+        :return:
+        :rtype:
+        """
+
+        with patch(
+            "sovtimer.helper.dashboard.build_dashboard_data",
+            wraps=build_dashboard_data,
+        ) as mock_build:
+            first = get_dashboard_data()
+            second = get_dashboard_data()
+
+        mock_build.assert_called_once()
+        self.assertEqual(first, second)
+
+    def test_update_replaces_cached_dashboard_data(self):
+        """
+        Test that updating the cache replaces stale dashboard data
+
+        :return:
+        :rtype:
+        """
+
+        get_dashboard_data()
+
+        Campaign.objects.filter(pk=self.campaign.pk).update(progress_current=0.7)
+        update_dashboard_data_cache()
+
+        self.assertEqual(
+            get_dashboard_data()["campaigns"][0]["campaign_progress"]["current"], 0.7
+        )
+
+    def test_update_drops_cached_dashboard_data_of_other_languages(self):
+        """
+        Test that updating the cache drops the data cached for other languages
+
+        :return:
+        :rtype:
+        """
+
+        cache.set(_cache_key("de"), {"version": "stale", "campaigns": []})
+
+        update_dashboard_data_cache()
+
+        self.assertIsNone(cache.get(_cache_key("de")))
+
+    @patch("sovtimer.helper.dashboard.Constants.DASHBOARD_DATA_CACHE_LOCK_WAIT", 0)
+    def test_builds_uncached_dashboard_data_while_locked(self):
+        """
+        Test that the dashboard data is built without caching it when another
+        process holds the lock for too long
+
+        :return:
+        :rtype:
+        """
+
+        cache.set(f"{_cache_key()}_lock", True)
+
+        dashboard_data = get_dashboard_data()
+
+        self.assertEqual(len(dashboard_data["campaigns"]), 1)
+        self.assertIsNone(cache.get(_cache_key()))
+
+    def test_dashboard_rows_add_time_relative_fields(self):
+        """
+        Test that the rows get the remaining time and the campaign status
+
+        :return:
+        :rtype:
+        """
+
+        dashboard_data = build_dashboard_data()
+
+        upcoming = dashboard_rows(dashboard_data, now=START_TIME - timedelta(hours=1))
+        active = dashboard_rows(dashboard_data, now=START_TIME + timedelta(hours=1))
+
+        self.assertEqual(upcoming[0]["campaign_status"], "upcoming")
+        self.assertEqual(upcoming[0]["remaining_time"]["seconds"], 3600)
+        self.assertEqual(upcoming[0]["campaign_progress"]["display"], "50%")
+        self.assertNotIn("campaign_progress_active_display", upcoming[0])
+
+        self.assertEqual(active[0]["campaign_status"], "active")
+        self.assertIn("20%", active[0]["campaign_progress"]["display"])
+        self.assertIn("zkillboard.com", active[0]["campaign_progress"]["display"])
+
+        # The cached data itself must not be changed
+        self.assertEqual(
+            dashboard_data["campaigns"][0]["campaign_progress"]["display"], "50%"
+        )
+
+    def test_etag_changes_with_campaign_status(self):
+        """
+        Test that the ETag changes when a campaign becomes active, even though the
+        data version is the same
+
+        :return:
+        :rtype:
+        """
+
+        dashboard_data = build_dashboard_data()
+
+        upcoming = dashboard_rows(dashboard_data, now=START_TIME - timedelta(hours=1))
+        upcoming_later = dashboard_rows(
+            dashboard_data, now=START_TIME - timedelta(minutes=1)
+        )
+        active = dashboard_rows(dashboard_data, now=START_TIME + timedelta(hours=1))
+
+        self.assertEqual(
+            dashboard_etag(dashboard_data, upcoming),
+            dashboard_etag(dashboard_data, upcoming_later),
+        )
+        self.assertNotEqual(
+            dashboard_etag(dashboard_data, upcoming),
+            dashboard_etag(dashboard_data, active),
+        )
+
+    def test_etag_of_changes_depends_on_token_and_sync_version(self):
+        """
+        Test that the changes since a token get their own ETag, which changes with
+        the token and the sync version
+
+        :return:
+        :rtype:
+        """
+
+        dashboard_data = build_dashboard_data(sync_version=1)
+        rows = dashboard_rows(dashboard_data, now=START_TIME)
+        etag = dashboard_etag(dashboard_data, rows, since="1:100")
+
+        self.assertNotEqual(etag, dashboard_etag(dashboard_data, rows))
+        self.assertNotEqual(etag, dashboard_etag(dashboard_data, rows, since="0:100"))
+        self.assertNotEqual(
+            etag,
+            dashboard_etag(build_dashboard_data(sync_version=2), rows, since="1:100"),
+        )
+        self.assertEqual(etag, dashboard_etag(dashboard_data, rows, since="1:100"))
+
+    def test_changes_returns_full_data_for_invalid_token(self):
+        """
+        Test that all rows are returned for an empty or invalid token
+
+        :return:
+        :rtype:
+        """
+
+        for since in ("", "foo", "1:2:3"):
+            changes = dashboard_changes(since=since, now=START_TIME)
+
+            self.assertTrue(changes["full"])
+            self.assertEqual(len(changes["rows"]), 1)
+
+    def test_changes_returns_changed_and_removed_campaigns(self):
+        """
+        Test that only the campaigns changed by a sync are returned
+
+        :return:
+        :rtype:
+        """
+
+        update_dashboard_data_cache()
+        token = dashboard_changes(since="", now=START_TIME)["token"]
+
+        # Nothing changed, the token stays the same
+        changes = dashboard_changes(since=token, now=START_TIME)
+
+        self.assertFalse(changes["full"])
+        self.assertEqual(changes["token"], token)
+        self.assertEqual(changes["changed"], [])
+        self.assertEqual(changes["removed"], [])
+
+        Campaign.objects.filter(pk=self.campaign.pk).update(progress_current=0.7)
+        update_dashboard_data_cache()
+
+        changes = dashboard_changes(since=token, now=START_TIME)
+
+        self.assertFalse(changes["full"])
+        self.assertNotEqual(changes["token"], token)
+        self.assertEqual(changes["changed"][0]["campaign_progress"]["current"], 0.7)
+        self.assertEqual(changes["removed"], [])
+
+        token = changes["token"]
+        Campaign.objects.all().delete()
+        update_dashboard_data_cache()
+
+        changes = dashboard_changes(since=token, now=START_TIME)
+
+        self.assertEqual(changes["changed"], [])
+        self.assertEqual(changes["removed"], [1])
+
+    def test_changes_returns_campaigns_that_changed_status(self):
+        """
+        Test that campaigns that became active since the last update are returned
+
+        :return:
+        :rtype:
+        """
+
+        update_dashboard_data_cache()
+        token = dashboard_changes(since="", now=START_TIME - timedelta(hours=1))[
+            "token"
+        ]
+
+        changes = dashboard_changes(since=token, now=START_TIME + timedelta(hours=1))
+
+        self.assertEqual(len(changes["changed"]), 1)
+        self.assertEqual(changes["changed"][0]["campaign_status"], "active")
+        self.assertNotEqual(changes["token"], token)
+
+    @patch("sovtimer.helper.dashboard.Constants.DASHBOARD_CHANGE_LOG_SIZE", 1)
+    def test_changes_returns_full_data_when_change_log_is_too_short(self):
+        """
+        Test that all rows are returned when the change log doesn't reach back to
+        the token
+
+        :return:
+        :rtype:
+        """
+
+        update_dashboard_data_cache()
+        token = dashboard_changes(since="", now=START_TIME)["token"]
+
+        for progress in (0.7, 0.8):
+            Campaign.objects.filter(pk=self.campaign.pk).update(
+                progress_current=progress
+            )
+            update_dashboard_data_cache()
+
+        self.assertTrue(dashboard_changes(since=token, now=START_TIME)["full"])
+
+
+class TestDashboardColumnar(BaseTestCase):
+    """
+    Test the columnar format of the plain data rows
+    """
+
+    @staticmethod
+    def _row(campaign_id: int, region_id: int, defender_id: int) -> dict:
+        """
+        Build a plain data row
+
+        :param campaign_id:
+        :type campaign_id:
+        :param region_id:
+        :type region_id:
+        :param defender_id:
+        :type defender_id:
+        :return:
+        :rtype:
+        """
+
+        return {
+            "campaign_id": campaign_id,
+            "solar_system_id": 30000000 + campaign_id,
+            "solar_system_name": f"System {campaign_id}",
+            "constellation_id": 20000000 + region_id,
+            "constellation_name": f"Constellation {region_id}",
+            "region_id": region_id,
+            "region_name": f"Region {region_id}",
+            "defender_id": defender_id,
+            "defender_name": f"Alliance {defender_id}",
+            "adm": 1.0,
+            "start_time": START_TIME,
+            "progress_current": 0.6,
+            "progress_previous": 0.5,
+            "remaining_seconds": 60.0,
+            "campaign_status": "upcoming",
+        }
+
+    def test_interns_shared_entities_into_lookup_tables(self):
+        """
+        Test that regions, constellations and defenders are sent only once
+
+        :return:
+        :rtype:
+        """
+
+        rows = [self._row(1, 10, 3001), self._row(2, 10, 3002), self._row(3, 11, 3001)]
+
+        data = dashboard_columnar(rows)
+
+        self.assertEqual(data["length"], 3)
+        self.assertEqual(data["columns"]["campaign_id"], [1, 2, 3])
+        self.assertEqual(
+            data["lookups"]["region"], [[10, "Region 10"], [11, "Region 11"]]
+        )
+        self.assertEqual(data["columns"]["region"], [0, 0, 1])
+        self.assertEqual(data["columns"]["defender"], [0, 1, 0])
+        self.assertNotIn("region_name", data["columns"])
+
+    def test_columnar_data_decodes_to_the_rows(self):
+        """
+        Test that the rows can be rebuilt from the columnar data
+
+        :return:
+        :rtype:
+        """
+
+        rows = [self._row(1, 10, 3001), self._row(2, 11, 3002)]
+        data = dashboard_columnar(rows)
+
+        decoded = []
+
+        for index in range(data["length"]):
+            row = {}
+
+            for field, values in data["columns"].items():
+                if field in data["lookups"]:
+                    entity_id, name = data["lookups"][field][values[index]]
+                    row[f"{field}_id"] = entity_id
+                    row[f"{field}_name"] = name
+                else:
+                    row[field] = values[index]
+
+            decoded.append(row)
+
+        self.assertEqual(decoded, rows)
+
+    def test_returns_empty_columns_without_rows(self):
+        """
+        Test that no rows give empty columns
+
+        :return:
+        :rtype:
+        """
+
+        data = dashboard_columnar([])
+
+        self.assertEqual(data["length"], 0)
+        self.assertEqual(data["columns"]["campaign_id"], [])
+        self.assertEqual(data["lookups"]["defender"], [])
+
+
+class TestDashboardEvents(BaseTestCase):
+    """
+    Test the dashboard deltas and the Server-Sent Events stream
+    """
+
+    @staticmethod
+    def _row(campaign_id: int, adm: str = "1.0", seconds: float = 60) -> dict:
+        """
+        Build a dashboard row
+
+        :param campaign_id:
+        :type campaign_id:
+        :param adm:
+        :type adm:
+        :param seconds:
+        :type seconds:
+        :return:
+        :rtype:
+        """
+
+        return {
+            "campaign_id": campaign_id,
+            "adm": adm,
+            "remaining_time": {"display": "", "seconds": seconds},
+            "campaign_status": "upcoming",
+        }
+
+    def test_delta_contains_changed_and_removed_rows(self):
+        """
+        Test that the delta contains new, changed and removed rows only
+
+        :return:
+        :rtype:
+        """
+
+        previous_rows = {1: self._row(1), 2: self._row(2), 3: self._row(3)}
+        rows = [self._row(1, seconds=30), self._row(2, adm="2.0"), self._row(4)]
+
+        delta = dashboard_delta(previous_rows, rows)
+
+        self.assertEqual([row["campaign_id"] for row in delta["changed"]], [2, 4])
+        self.assertEqual(delta["removed"], [3])
+
+    @patch("sovtimer.helper.dashboard.Constants.DASHBOARD_SSE_MAX_LIFETIME", 1)
+    @patch("sovtimer.helper.dashboard.time.sleep")
+    @patch("sovtimer.helper.dashboard.dashboard_rows")
+    @patch("sovtimer.helper.dashboard.get_dashboard_data")
+    def test_stream_sends_snapshot_and_delta(
+        self, mock_get_dashboard_data, mock_dashboard_rows, mock_sleep
+    ):
+        """
+        Test that the stream starts with a snapshot, followed by a delta
+
+        :param mock_get_dashboard_data:
+        :type mock_get_dashboard_data:
+        :param mock_dashboard_rows:
+        :type mock_dashboard_rows:
+        :param mock_sleep:
+        :type mock_sleep:
+        :return:
+        :rtype:
+        """
+
+        mock_dashboard_rows.side_effect = [
+            [self._row(1), self._row(2)],
+            [self._row(1, adm="2.0")],
+        ]
+
+        # The stream ends after the first delta
+        with patch(
+            "sovtimer.helper.dashboard.time.monotonic",
+            side_effect=chain([0, 0, 0], repeat(2)),
+        ):
+            events = list(dashboard_event_stream(language_code="en"))
+
+        self.assertEqual(events[0], "retry: 5000\n\n")
+        self.assertTrue(events[1].startswith("event: snapshot\n"))
+        self.assertTrue(events[2].startswith("event: delta\n"))
+
+        delta = json.loads(events[2].split("data: ", 1)[1])
+
+        self.assertEqual(delta["changed"][0]["adm"], "2.0")
+        self.assertEqual(delta["removed"], [2])
+        self.assertEqual(len(events), 3)
+
+    @override_settings(SOVTIMER_DASHBOARD_SSE_MAX_STREAMS=2)
+    @patch("sovtimer.helper.dashboard._dashboard_events")
+    def test_stream_releases_its_slot(self, mock_dashboard_events):
+        """
+        Test that the slots are shared by all streams, and released when a stream
+        ends, also when it failed
+
+        :param mock_dashboard_events:
+        :type mock_dashboard_events:
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+        first_slot = acquire_dashboard_event_stream_slot()
+        second_slot = acquire_dashboard_event_stream_slot()
+
+        self.assertNotEqual(first_slot, second_slot)
+        self.assertIsNone(acquire_dashboard_event_stream_slot())
+
+        mock_dashboard_events.return_value = iter(["retry: 5000\n\n"])
+        list(dashboard_event_stream(language_code="en", slot=first_slot))
+
+        mock_dashboard_events.side_effect = RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            list(dashboard_event_stream(language_code="en", slot=second_slot))
+
+        self.assertIsNotNone(acquire_dashboard_event_stream_slot())
+        self.assertIsNotNone(acquire_dashboard_event_stream_slot())
+        self.assertIsNone(acquire_dashboard_event_stream_slot())
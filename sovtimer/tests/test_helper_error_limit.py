@@ -0,0 +1,291 @@
+"""
+Tests for the ESI error limit governor
+"""
+
+# Standard Library
+from io import StringIO
+from unittest.mock import patch
+
+# Django
+from django.core.cache import cache
+from django.core.management import call_command
+
+# AA Sovereignty Timer
+from sovtimer.helper.error_limit import (
+    error_limit_state,
+    remember_error_limit,
+    remember_error_limit_exceeded,
+    wait_for_error_budget,
+)
+from sovtimer.tests import BaseTestCase
+
+NOW = 1_900_000_000.0
+
+
+def _headers(remain: int, reset: int) -> dict[str, str]:
+    """
+    Build the error limit headers of an ESI response
+
+    :param remain:
+    :type remain:
+    :param reset:
+    :type reset:
+    :return:
+    :rtype:
+    """
+
+    return {
+        "X-ESI-Error-Limit-Remain": str(remain),
+        "X-ESI-Error-Limit-Reset": str(reset),
+    }
+
+
+@patch("sovtimer.helper.error_limit.time.time", return_value=NOW)
+class TestErrorLimitState(BaseTestCase):
+    """
+    Test tracking the error budget
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, the error budget is kept in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def tearDown(self):
+        """
+        Tear down the test case, so the budget left doesn't hold back other tests
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_normal_without_known_budget(self, mock_time):
+        """
+        Test that requests aren't held back while the budget is unknown
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        remember_error_limit(headers={})
+        remember_error_limit(headers=None)
+
+        state = error_limit_state()
+
+        self.assertIsNone(state["remain"])
+        self.assertEqual(state["mode"], "normal")
+        self.assertEqual(state["delay"], 0)
+
+    def test_slows_down_while_the_budget_runs_low(self, mock_time):
+        """
+        Test that the remaining budget is spread over the rest of the window
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        remember_error_limit(headers=_headers(remain=90, reset=40))
+
+        self.assertEqual(error_limit_state()["mode"], "normal")
+
+        remember_error_limit(headers=_headers(remain=30, reset=40))
+
+        state = error_limit_state()
+
+        self.assertEqual(state["remain"], 30)
+        self.assertEqual(state["reset_in"], 40)
+        self.assertEqual(state["mode"], "slowed")
+        # 40 seconds for the 20 errors left before the pause
+        self.assertEqual(state["delay"], 2)
+
+        remember_error_limit(headers=_headers(remain=12, reset=40))
+
+        # Limited to the maximum delay
+        self.assertEqual(error_limit_state()["delay"], 5)
+
+    def test_keeps_the_lowest_budget_of_a_window(self, mock_time):
+        """
+        Test that a late response with more budget left doesn't raise the budget
+        of the same window, but the budget of a new window is taken
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        remember_error_limit(headers=_headers(remain=20, reset=30))
+        remember_error_limit(headers=_headers(remain=40, reset=31))
+
+        self.assertEqual(error_limit_state()["remain"], 20)
+
+        remember_error_limit(headers=_headers(remain=99, reset=59))
+
+        self.assertEqual(error_limit_state()["remain"], 99)
+
+    def test_pauses_until_the_window_resets(self, mock_time):
+        """
+        Test that requests are paused just before the budget is used up, and
+        continue once the window reset
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        remember_error_limit_exceeded(reset=20)
+
+        state = error_limit_state()
+
+        self.assertEqual(state["remain"], 0)
+        self.assertEqual(state["mode"], "paused")
+        self.assertEqual(state["delay"], 20)
+
+        mock_time.return_value = NOW + 20
+
+        self.assertEqual(error_limit_state()["mode"], "normal")
+
+    def test_window_counts_from_when_esi_answered(self, mock_time):
+        """
+        Test that the headers of a response served from django-esi's cache don't
+        outlive the window they were sent in
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        # Answered 10 seconds ago
+        remember_error_limit(
+            headers={
+                **_headers(remain=30, reset=40),
+                "Date": "Sat, 17 Mar 2030 17:46:30 GMT",
+            }
+        )
+
+        self.assertEqual(error_limit_state()["reset_in"], 30)
+
+        cache.clear()
+
+        # Answered before the window reset
+        remember_error_limit(
+            headers={
+                **_headers(remain=5, reset=40),
+                "Date": "Sat, 17 Mar 2030 17:45:00 GMT",
+            }
+        )
+
+        self.assertIsNone(error_limit_state()["remain"])
+
+    def test_exceeded_without_reset_pauses_for_a_window(self, mock_time):
+        """
+        Test that a full window is assumed when ESI didn't tell the reset
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        remember_error_limit_exceeded(reset=None)
+
+        self.assertEqual(error_limit_state()["reset_in"], 60)
+
+
+@patch("sovtimer.helper.error_limit.time.sleep")
+class TestWaitForErrorBudget(BaseTestCase):
+    """
+    Test holding back requests while the error budget runs low
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, the error budget is kept in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def tearDown(self):
+        """
+        Tear down the test case, so the budget left doesn't hold back other tests
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_counts_slowed_and_paused_requests(self, mock_sleep):
+        """
+        Test that requests are delayed while slowed down and refused while paused
+
+        :param mock_sleep:
+        :type mock_sleep:
+        :return:
+        :rtype:
+        """
+
+        self.assertTrue(wait_for_error_budget(operation_id="GetSomething"))
+        mock_sleep.assert_not_called()
+
+        remember_error_limit(headers=_headers(remain=30, reset=40))
+
+        self.assertTrue(wait_for_error_budget(operation_id="GetSomething"))
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args.args[0], 2, delta=0.1)
+
+        remember_error_limit(headers=_headers(remain=5, reset=40))
+
+        with patch("sovtimer.helper.error_limit.logger.warning") as mock_warning:
+            self.assertFalse(wait_for_error_budget(operation_id="GetSomething"))
+
+        mock_warning.assert_called_once()
+        self.assertEqual(mock_sleep.call_count, 1)
+
+        state = error_limit_state()
+
+        self.assertEqual(state["slowed"], 1)
+        self.assertEqual(state["paused"], 1)
+
+    def test_metrics_command_shows_the_error_budget(self, mock_sleep):
+        """
+        Test that the task metrics command shows the state of the governor
+
+        :param mock_sleep:
+        :type mock_sleep:
+        :return:
+        :rtype:
+        """
+
+        out = StringIO()
+        call_command("sovtimer_task_metrics", stdout=out)
+
+        self.assertIn(
+            "ESI error limit: budget unknown, requests normal, 0 slowed down, 0 paused",
+            out.getvalue(),
+        )
+
+        remember_error_limit(headers=_headers(remain=5, reset=40))
+        wait_for_error_budget(operation_id="GetSomething")
+
+        out = StringIO()
+        call_command("sovtimer_task_metrics", stdout=out)
+
+        self.assertIn("ESI error limit: 5 errors left, resets in", out.getvalue())
+        self.assertIn("requests paused, 0 slowed down, 1 paused", out.getvalue())
@@ -0,0 +1,224 @@
+"""
+Tests for the leases
+"""
+
+# Standard Library
+from io import StringIO
+from unittest.mock import MagicMock, patch
+
+# Third Party
+from redis.exceptions import WatchError
+
+# Django
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+
+# AA Sovereignty Timer
+from sovtimer.constants import Constants
+from sovtimer.helper.lease import Lease, lease_holder, lease_metrics, with_lease
+from sovtimer.tests import BaseTestCase
+
+LOCMEM_CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sovtimer-tests",
+    }
+}
+
+
+class TestLease(BaseTestCase):
+    """
+    Test the leases
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, leases and their metrics are kept in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_held_by_one_owner_at_a_time(self):
+        """
+        Test that a lease can't be acquired while someone else holds it
+
+        :return:
+        :rtype:
+        """
+
+        first = Lease(name="test", ttl=60)
+        second = Lease(name="test", ttl=60)
+
+        self.assertTrue(first.acquire())
+        self.assertFalse(second.acquire())
+        self.assertEqual(lease_holder(name="test"), first.token)
+
+        self.assertFalse(second.release())
+        self.assertTrue(first.release())
+        self.assertIsNone(lease_holder(name="test"))
+
+        self.assertTrue(second.acquire())
+
+    def test_does_not_release_the_lease_of_someone_else(self):
+        """
+        Test that an expired lease, acquired by someone else since, stays theirs
+
+        :return:
+        :rtype:
+        """
+
+        first = Lease(name="test", ttl=60)
+        second = Lease(name="test", ttl=60)
+
+        first.acquire()
+
+        # The lease expires while the first owner still works
+        cache.delete(f"{Constants.LEASE_CACHE_KEY}_test")
+
+        second.acquire()
+
+        with patch("sovtimer.helper.lease.logger.warning") as mock_warning:
+            self.assertFalse(first.release())
+
+        mock_warning.assert_called_once()
+        self.assertEqual(lease_holder(name="test"), second.token)
+        self.assertEqual(lease_metrics(names=("test",))["test"]["expired"], 1)
+
+    def test_does_not_release_a_lease_changed_during_the_release(self):
+        """
+        Test that the lease is kept when it changes between comparing and deleting
+
+        :return:
+        :rtype:
+        """
+
+        lease = Lease(name="test", ttl=60)
+        lease.acquire()
+
+        pipe = MagicMock()
+        pipe.__enter__.return_value = pipe
+        pipe.get.return_value = cache.client.encode(lease.token)
+        pipe.execute.side_effect = WatchError
+
+        with (
+            patch("sovtimer.helper.lease.get_redis_client") as mock_get_redis_client,
+            patch("sovtimer.helper.lease.logger.warning"),
+        ):
+            mock_get_redis_client.return_value.pipeline.return_value = pipe
+
+            self.assertFalse(lease.release())
+
+        pipe.delete.assert_called_once()
+        self.assertEqual(lease_holder(name="test"), lease.token)
+
+    def test_counts_acquisitions_and_contention(self):
+        """
+        Test that acquired and contended attempts are counted with their duration
+
+        :return:
+        :rtype:
+        """
+
+        with Lease(name="test", ttl=60) as lease:
+            self.assertTrue(lease.acquired)
+
+            with Lease(name="test", ttl=60) as other_lease:
+                self.assertFalse(other_lease.acquired)
+
+        metrics = lease_metrics(names=("test", "unused"))
+
+        self.assertIsNone(metrics["test"]["holder"])
+        self.assertEqual(metrics["test"]["acquired"], 1)
+        self.assertEqual(metrics["test"]["contended"], 1)
+        self.assertEqual(metrics["test"]["expired"], 0)
+        self.assertGreaterEqual(metrics["test"]["avg_acquisition_ms"], 0)
+        self.assertEqual(
+            metrics["unused"],
+            {
+                "holder": None,
+                "acquired": 0,
+                "contended": 0,
+                "expired": 0,
+                "avg_acquisition_ms": 0.0,
+            },
+        )
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_works_without_redis(self):
+        """
+        Test that leases work with other cache backends as well
+
+        :return:
+        :rtype:
+        """
+
+        first = Lease(name="test", ttl=60)
+
+        self.assertTrue(first.acquire())
+        self.assertFalse(Lease(name="test", ttl=60).acquire())
+        self.assertTrue(first.release())
+        self.assertIsNone(lease_holder(name="test"))
+
+    def test_with_lease_skips_while_held(self):
+        """
+        Test that a function decorated with with_lease doesn't run while its lease
+        is held by someone else
+
+        :return:
+        :rtype:
+        """
+
+        func = MagicMock(__name__="sync", return_value="synced")
+        decorated = with_lease(ttl=60)(func)
+
+        with Lease(name="sync", ttl=60):
+            self.assertIsNone(decorated(1, force=True))
+
+        func.assert_not_called()
+
+        self.assertEqual(decorated(1, force=True), "synced")
+        func.assert_called_once_with(1, force=True)
+        self.assertIsNone(lease_holder(name="sync"))
+
+    def test_with_lease_releases_on_error(self):
+        """
+        Test that the lease is released when the decorated function fails
+
+        :return:
+        :rtype:
+        """
+
+        decorated = with_lease(ttl=60)(
+            MagicMock(__name__="sync", side_effect=RuntimeError)
+        )
+
+        with self.assertRaises(RuntimeError):
+            decorated()
+
+        self.assertIsNone(lease_holder(name="sync"))
+
+    def test_metrics_command_shows_the_leases(self):
+        """
+        Test that the task metrics command shows the lease holders and contention
+
+        :return:
+        :rtype:
+        """
+
+        out = StringIO()
+
+        with Lease(name="update_sov_campaigns", ttl=60) as lease:
+            call_command("sovtimer_task_metrics", stdout=out)
+
+        self.assertIn(
+            f"update_sov_campaigns lease: held by {lease.token}, 1 acquired, "
+            "0 contended, 0 expired",
+            out.getvalue(),
+        )
+        self.assertIn(
+            "update_sov_structures lease: held by nobody, 0 acquired", out.getvalue()
+        )
@@ -0,0 +1,92 @@
+"""
+Tests for the ESI payload hash helper
+"""
+
+# Standard Library
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from io import StringIO
+
+# Django
+from django.core.cache import cache
+from django.core.management import call_command
+
+# AA Sovereignty Timer
+from sovtimer.helper.payload_hash import (
+    payload_hash,
+    payload_hash_metrics,
+    payload_unchanged,
+    remember_payload_hash,
+)
+from sovtimer.tests import BaseTestCase
+
+
+class TestPayloadHash(BaseTestCase):
+    """
+    Test the ESI payload hashes
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, hashes and metrics are kept in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_hash_depends_on_the_content_only(self):
+        """
+        Test that equal payloads have the same hash and different payloads don't
+
+        :return:
+        :rtype:
+        """
+
+        start = datetime(2023, 10, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+        self.assertEqual(
+            payload_hash([{"a": 1, "start": start}]),
+            payload_hash([{"start": start, "a": 1}]),
+        )
+        self.assertNotEqual(payload_hash([{"a": 1}]), payload_hash([{"a": 2}]))
+
+    def test_counts_hits_misses_and_time_saved(self):
+        """
+        Test that only a remembered hash is a hit and the metrics are counted
+
+        :return:
+        :rtype:
+        """
+
+        self.assertFalse(payload_unchanged(name="test", content_hash="abc"))
+
+        remember_payload_hash(name="test", content_hash="abc", duration=1.5)
+
+        self.assertTrue(payload_unchanged(name="test", content_hash="abc"))
+        self.assertTrue(payload_unchanged(name="test", content_hash="abc"))
+        self.assertFalse(payload_unchanged(name="test", content_hash="def"))
+
+        self.assertEqual(
+            payload_hash_metrics(names=("test", "other")),
+            {
+                "test": {"hits": 2, "misses": 2, "time_saved_ms": 3000},
+                "other": {"hits": 0, "misses": 0, "time_saved_ms": 0},
+            },
+        )
+
+    def test_command_prints_the_metrics(self):
+        """
+        Test that the management command prints the metrics of both tasks
+
+        :return:
+        :rtype:
+        """
+
+        out = StringIO()
+
+        call_command("sovtimer_task_metrics", stdout=out)
+
+        self.assertIn("sovereignty_systems: 0 hits, 0 misses", out.getvalue())
+        self.assertIn("sovereignty_campaigns: 0 hits, 0 misses", out.getvalue())
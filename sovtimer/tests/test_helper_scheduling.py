@@ -0,0 +1,226 @@
+"""
+Tests for the adaptive scheduling helper
+"""
+
+# Standard Library
+from unittest.mock import patch
+
+# Django
+from django.core.cache import cache
+
+# AA Sovereignty Timer
+from sovtimer.helper.scheduling import (
+    next_run_countdown,
+    remember_esi_expiry,
+    seconds_until_expiry,
+)
+from sovtimer.tests import BaseTestCase
+
+NOW = 1_900_000_000.0
+# Tue, 01 Jan 2030 12:00:00 GMT
+DATE = 1_893_499_200.0
+
+
+class TestSecondsUntilExpiry(BaseTestCase):
+    """
+    Test reading the expiry from the ESI response headers
+    """
+
+    def test_max_age_minus_age(self):
+        """
+        Test that the max-age of Cache-Control is used, reduced by the Age
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            seconds_until_expiry({"Cache-Control": "public, max-age=300", "Age": "20"}),
+            280,
+        )
+
+    @patch("sovtimer.helper.scheduling.time.time", return_value=DATE)
+    def test_max_age_takes_precedence_over_expires(self, mock_time):
+        """
+        Test that Expires is ignored when Cache-Control has a max-age
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            seconds_until_expiry(
+                {
+                    "cache-control": "max-age=60",
+                    "expires": "Tue, 01 Jan 2030 12:10:00 GMT",
+                    "date": "Tue, 01 Jan 2030 12:00:00 GMT",
+                }
+            ),
+            60,
+        )
+
+    @patch("sovtimer.helper.scheduling.time.time", return_value=DATE)
+    def test_expires_relative_to_date(self, mock_time):
+        """
+        Test that Expires is compared to the Date of the response
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            seconds_until_expiry(
+                {
+                    "Expires": "Tue, 01 Jan 2030 12:05:00 GMT",
+                    "Date": "Tue, 01 Jan 2030 12:00:00 GMT",
+                }
+            ),
+            300,
+        )
+
+    @patch("sovtimer.helper.scheduling.time.time", return_value=NOW)
+    def test_expires_relative_to_now_without_date(self, mock_time):
+        """
+        Test that Expires is compared to the current time when the Date is missing
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        # 2030-03-17 17:46:40 UTC is NOW
+        self.assertEqual(
+            seconds_until_expiry({"Expires": "Sun, 17 Mar 2030 17:47:40 GMT"}), 60
+        )
+
+    @patch("sovtimer.helper.scheduling.time.time", return_value=DATE + 250)
+    def test_stale_cached_headers(self, mock_time):
+        """
+        Test that the time passed since the Date of a response served from
+        django-esi's cache is subtracted from its expiry
+
+        :param mock_time:
+        :type mock_time:
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            seconds_until_expiry(
+                {
+                    "Cache-Control": "public, max-age=300",
+                    "Date": "Tue, 01 Jan 2030 12:00:00 GMT",
+                }
+            ),
+            50,
+        )
+        self.assertEqual(
+            seconds_until_expiry(
+                {
+                    "Expires": "Tue, 01 Jan 2030 12:05:00 GMT",
+                    "Date": "Tue, 01 Jan 2030 12:00:00 GMT",
+                }
+            ),
+            50,
+        )
+        # Already expired
+        self.assertEqual(
+            seconds_until_expiry(
+                {
+                    "Cache-Control": "public, max-age=200",
+                    "Date": "Tue, 01 Jan 2030 12:00:00 GMT",
+                }
+            ),
+            -50,
+        )
+
+    def test_unknown_expiry(self):
+        """
+        Test that None is returned when the headers don't tell the expiry
+
+        :return:
+        :rtype:
+        """
+
+        self.assertIsNone(seconds_until_expiry({}))
+        self.assertIsNone(seconds_until_expiry({"Cache-Control": "no-cache"}))
+        self.assertIsNone(seconds_until_expiry({"Expires": "never"}))
+
+
+@patch("sovtimer.helper.scheduling.random.uniform", return_value=5)
+@patch("sovtimer.helper.scheduling.time.time", return_value=NOW)
+class TestNextRunCountdown(BaseTestCase):
+    """
+    Test the countdown to the next run of the update tasks
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, the expiries are kept in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_runs_just_after_the_earliest_expiry(self, mock_time, mock_uniform):
+        """
+        Test that the next run is after the earliest expiry, plus margin and jitter
+
+        :param mock_time:
+        :type mock_time:
+        :param mock_uniform:
+        :type mock_uniform:
+        :return:
+        :rtype:
+        """
+
+        remember_esi_expiry(operation_id="A", headers={"Cache-Control": "max-age=600"})
+        remember_esi_expiry(operation_id="B", headers={"Cache-Control": "max-age=120"})
+
+        # 120 seconds, 2 seconds margin and 5 seconds jitter
+        self.assertEqual(next_run_countdown(operation_ids=("A", "B")), 127)
+        mock_uniform.assert_called_once_with(0, 10)
+
+    def test_countdown_is_limited(self, mock_time, mock_uniform):
+        """
+        Test that the countdown stays within its minimum and maximum
+
+        :param mock_time:
+        :type mock_time:
+        :param mock_uniform:
+        :type mock_uniform:
+        :return:
+        :rtype:
+        """
+
+        remember_esi_expiry(operation_id="A", headers={"Cache-Control": "max-age=1"})
+        remember_esi_expiry(
+            operation_id="B", headers={"Cache-Control": "max-age=86400"}
+        )
+
+        self.assertEqual(next_run_countdown(operation_ids=("A",)), 30)
+        self.assertEqual(next_run_countdown(operation_ids=("B",)), 900)
+
+    def test_minimum_countdown_without_known_expiry(self, mock_time, mock_uniform):
+        """
+        Test that the minimum countdown is used when no expiry is known
+
+        :param mock_time:
+        :type mock_time:
+        :param mock_uniform:
+        :type mock_uniform:
+        :return:
+        :rtype:
+        """
+
+        # Headers without an expiry don't replace a known one, but there's none yet
+        remember_esi_expiry(operation_id="A", headers={})
+
+        self.assertEqual(next_run_countdown(operation_ids=("A", "B")), 30)
@@ -144,7 +144,6 @@ class TestAlliance(BaseTestCase):
         ]
         mock_qs = MagicMock()
         mock_qs.__iter__.return_value = iter(mock_existing_alliances)
-        mock_qs.values_list.return_value = [1, 2]
         mock_filter.return_value = mock_qs
 
         result = Alliance.bulk_get_or_create_from_esi(
@@ -158,11 +157,12 @@ class TestAlliance(BaseTestCase):
         mock_bulk_create.assert_not_called()
         mock_get_alliance.assert_not_called()
 
+    @patch("sovtimer.models.ESIHandler.get_alliance_names", return_value={})
     @patch("sovtimer.models.ESIHandler.get_alliances_alliance_id")
     @patch("sovtimer.models.Alliance.objects.bulk_create")
     @patch("sovtimer.models.Alliance.objects.filter")
     def test_creates_new_alliances_when_some_ids_do_not_exist(
-        self, mock_filter, mock_bulk_create, mock_get_alliance
+        self, mock_filter, mock_bulk_create, mock_get_alliance, mock_get_names
     ):
         """
         Test that new alliances are created when some IDs do not exist in the database
@@ -173,6 +173,8 @@ class TestAlliance(BaseTestCase):
         :type mock_bulk_create:
         :param mock_get_alliance:
         :type mock_get_alliance:
+        :param mock_get_names:
+        :type mock_get_names:
         :return:
         :rtype:
         """
@@ -182,7 +184,6 @@ class TestAlliance(BaseTestCase):
         ]
         mock_qs = MagicMock()
         mock_qs.__iter__.return_value = iter(mock_existing_alliances)
-        mock_qs.values_list.return_value = [1]
         mock_filter.return_value = mock_qs
 
         a2 = MagicMock()
@@ -209,11 +210,12 @@ class TestAlliance(BaseTestCase):
         mock_get_alliance.assert_any_call(alliance_id=3, force_refresh=False)
         mock_bulk_create.assert_called_once()
 
+    @patch("sovtimer.models.ESIHandler.get_alliance_names", return_value={})
     @patch("sovtimer.models.ESIHandler.get_alliances_alliance_id")
     @patch("sovtimer.models.Alliance.objects.bulk_create")
     @patch("sovtimer.models.Alliance.objects.filter")
     def test_skips_creation_when_esi_returns_no_data(
-        self, mock_filter, mock_bulk_create, mock_get_alliance
+        self, mock_filter, mock_bulk_create, mock_get_alliance, mock_get_names
     ):
         """
         Test that creation is skipped when ESI returns no data for an alliance ID
@@ -224,13 +226,14 @@ class TestAlliance(BaseTestCase):
         :type mock_bulk_create:
         :param mock_get_alliance:
         :type mock_get_alliance:
+        :param mock_get_names:
+        :type mock_get_names:
         :return:
         :rtype:
         """
 
         mock_qs = MagicMock()
         mock_qs.__iter__.return_value = iter([])
-        mock_qs.values_list.return_value = []
         mock_filter.return_value = mock_qs
         mock_get_alliance.return_value = None
 
@@ -244,6 +247,72 @@ class TestAlliance(BaseTestCase):
         mock_bulk_create.assert_not_called()
 
 
+class TestAllianceBulkNameResolution(BaseTestCase):
+    """
+    Test the bulk name resolution of Alliance.bulk_get_or_create_from_esi
+    """
+
+    @patch("sovtimer.models.ESIHandler.get_alliances")
+    @patch("sovtimer.models.ESIHandler.get_alliance_names")
+    def test_creates_alliances_from_bulk_names_without_per_id_lookups(
+        self, mock_get_names, mock_get_alliances
+    ):
+        """
+        Test that no per-ID lookup is made when the bulk endpoint resolves all IDs
+
+        :param mock_get_names:
+        :type mock_get_names:
+        :param mock_get_alliances:
+        :type mock_get_alliances:
+        :return:
+        :rtype:
+        """
+
+        Alliance.objects.create(alliance_id=1, name="Alliance 1")
+        mock_get_names.return_value = {2: "Alliance 2", 3: "Alliance 3"}
+
+        result = Alliance.bulk_get_or_create_from_esi(alliance_ids={1, 2, 3})
+
+        self.assertEqual(
+            {pk: alliance.name for pk, alliance in result.items()},
+            {1: "Alliance 1", 2: "Alliance 2", 3: "Alliance 3"},
+        )
+        mock_get_names.assert_called_once_with(alliance_ids={2, 3})
+        mock_get_alliances.assert_not_called()
+        self.assertEqual(Alliance.objects.count(), 3)
+
+    @patch("sovtimer.models.ESIHandler.get_alliances")
+    @patch("sovtimer.models.ESIHandler.get_alliance_names")
+    def test_falls_back_to_per_id_lookups_for_unresolved_ids(
+        self, mock_get_names, mock_get_alliances
+    ):
+        """
+        Test that only IDs missing from the bulk result are looked up one by one
+
+        :param mock_get_names:
+        :type mock_get_names:
+        :param mock_get_alliances:
+        :type mock_get_alliances:
+        :return:
+        :rtype:
+        """
+
+        alliance_3 = MagicMock()
+        alliance_3.name = "Alliance 3"
+        mock_get_names.return_value = {2: "Alliance 2"}
+        mock_get_alliances.return_value = {3: alliance_3}
+
+        result = Alliance.bulk_get_or_create_from_esi(
+            alliance_ids={2, 3}, force_refresh=True
+        )
+
+        self.assertEqual(
+            {pk: alliance.name for pk, alliance in result.items()},
+            {2: "Alliance 2", 3: "Alliance 3"},
+        )
+        mock_get_alliances.assert_called_once_with(alliance_ids={3}, force_refresh=True)
+
+
 class TestSovereigntyStructure(BaseTestCase):
     """
     Test cases for the SovereigntyStructure model
@@ -310,22 +379,29 @@ class TestSovereigntyStructure(BaseTestCase):
 
         mock_get.return_value = MagicMock(solar_systems=[sov_system])
 
-        result = SovereigntyStructure.get_sov_structures_from_esi(
-            use_etags=True, force_refresh=True
+        result = list(
+            SovereigntyStructure.get_sov_structures_from_esi(
+                use_etags=True, force_refresh=True
+            )
         )
 
-        self.assertIsInstance(result, list)
-        self.assertEqual(len(result), 1)
-
-        structure = result[0]
-        self.assertIn("solar_system_id", structure)
-        self.assertIn("alliance_id", structure)
-        self.assertIn("sovereignty_hub", structure)
-        self.assertEqual(structure["solar_system_id"], 3001)
-        self.assertEqual(structure["alliance_id"], 2001)
-        self.assertEqual(structure["sovereignty_hub"]["id"], 12345)
-        self.assertIn("vulnerability_window", structure["sovereignty_hub"])
-        self.assertEqual(structure["development"]["activity_defense_multiplier"], 0.5)
+        self.assertEqual(
+            result,
+            [
+                (
+                    12345,
+                    3001,
+                    2001,
+                    0.5,
+                    "2023-01-01T12:00:00Z",
+                    "2023-01-01T18:00:00Z",
+                    True,
+                    1,
+                    2,
+                    3,
+                )
+            ],
+        )
         mock_get.assert_called_once_with(use_etags=True, force_refresh=True)
 
     @patch("sovtimer.models.ESIHandler.get_sovereignty_systems")
@@ -388,11 +464,10 @@ class TestSovereigntyStructure(BaseTestCase):
 
         mock_get.return_value = MagicMock(solar_systems=[bad_system, good_system])
 
-        result = SovereigntyStructure.get_sov_structures_from_esi()
+        result = list(SovereigntyStructure.get_sov_structures_from_esi())
 
-        self.assertIsInstance(result, list)
-        self.assertEqual(len(result), 1)
-        self.assertEqual(result[0]["solar_system_id"], 4001)
+        # Without ADM and vulnerability window, the defaults are used
+        self.assertEqual(result, [(22222, 4001, 3001, 1, None, None, False, 0, 0, 0)])
         mock_get.assert_called_once_with(use_etags=True, force_refresh=False)
 
     @patch("sovtimer.models.ESIHandler.get_sovereignty_systems")
@@ -475,10 +550,9 @@ class TestSovereigntyStructure(BaseTestCase):
 
         mock_get.return_value = MagicMock(solar_systems=[bad_system])
 
-        result = SovereigntyStructure.get_sov_structures_from_esi()
+        result = list(SovereigntyStructure.get_sov_structures_from_esi())
 
-        self.assertIsInstance(result, list)
-        self.assertEqual(len(result), 0)
+        self.assertEqual(result, [])
         mock_get.assert_called_once_with(use_etags=True, force_refresh=False)
 
     @patch("sovtimer.models.ESIHandler.get_sovereignty_systems")
@@ -501,12 +575,13 @@ class TestSovereigntyStructure(BaseTestCase):
 
         mock_get.return_value = MagicMock(solar_systems=[sov_system])
 
-        result = SovereigntyStructure.get_sov_structures_from_esi(
-            use_etags=True, force_refresh=True
+        result = list(
+            SovereigntyStructure.get_sov_structures_from_esi(
+                use_etags=True, force_refresh=True
+            )
         )
 
-        self.assertIsInstance(result, list)
-        self.assertEqual(len(result), 0)
+        self.assertEqual(result, [])
         mock_get.assert_called_once_with(use_etags=True, force_refresh=True)
 
 
@@ -6,6 +6,8 @@ Test for the providers module.
 import importlib
 import logging
 import sys
+import threading
+import time
 import types
 import typing
 from unittest.mock import MagicMock, patch
@@ -13,13 +15,26 @@ from unittest.mock import MagicMock, patch
 # Third Party
 from aiopenapi3 import ContentTypeError, RequestError
 
+# Django
+from django.core.cache import cache
+from django.test import override_settings
+
 # Alliance Auth
-from esi.exceptions import HTTPClientError, HTTPNotModified
+from esi.exceptions import (
+    ESIErrorLimitException,
+    HTTPClientError,
+    HTTPNotModified,
+    HTTPServerError,
+)
 
 # AA Sovereignty Timer
 from sovtimer import __title__
 from sovtimer.providers.applogger import AppLogger
-from sovtimer.providers.esi import ESIHandler
+from sovtimer.providers.esi import (
+    ESIHandler,
+    PooledSessionFactory,
+    ThreadSafeESIClientProvider,
+)
 from sovtimer.tests import BaseTestCase
 
 
@@ -70,6 +85,16 @@ class TestESIHandlerResult(BaseTestCase):
     Test the ESIHandler.result method.
     """
 
+    def setUp(self):
+        """
+        Set up the test case, the error budget is kept in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
     def test_returns_result_when_operation_succeeds(self):
         """
         Test returning an ESIHandler result.
@@ -80,7 +105,8 @@ class TestESIHandlerResult(BaseTestCase):
 
         operation = MagicMock()
         operation.operation = MagicMock(operationId="GetSomething")
-        operation.result.return_value = {"data": 1}
+        # The response is always requested, for its headers
+        operation.result.return_value = ({"data": 1}, MagicMock(headers={}))
 
         result = ESIHandler.result(
             operation=operation,
@@ -92,7 +118,7 @@ class TestESIHandlerResult(BaseTestCase):
 
         self.assertEqual(result, {"data": 1})
         operation.result.assert_called_once_with(
-            use_etag=True, return_response=False, force_refresh=False, use_cache=True
+            use_etag=True, return_response=True, force_refresh=False, use_cache=True
         )
 
     def test_returns_result_and_response_when_return_response_true(self):
@@ -207,7 +233,7 @@ class TestESIHandlerResult(BaseTestCase):
 
         operation = MagicMock()
         operation.operation = MagicMock(operationId="GetSomething")
-        operation.result.return_value = "ok"
+        operation.result.return_value = ("ok", MagicMock(headers={}))
 
         result = ESIHandler.result(
             operation=operation,
@@ -221,12 +247,184 @@ class TestESIHandlerResult(BaseTestCase):
         self.assertEqual(result, "ok")
         operation.result.assert_called_once_with(
             use_etag=False,
-            return_response=False,
+            return_response=True,
             force_refresh=True,
             use_cache=False,
             foo="bar",
         )
 
+    @patch("sovtimer.providers.esi.remember_esi_expiry")
+    def test_remembers_expiry_when_tracked(self, mock_remember_esi_expiry):
+        """
+        Test that the expiry is read from the response without returning it
+
+        :param mock_remember_esi_expiry:
+        :type mock_remember_esi_expiry:
+        :return:
+        :rtype:
+        """
+
+        operation = MagicMock()
+        operation.operation = MagicMock(operationId="GetSomething")
+        response_obj = MagicMock(headers={"Cache-Control": "max-age=300"})
+        operation.result.return_value = ([1, 2, 3], response_obj)
+
+        result = ESIHandler.result(operation=operation, track_expiry=True)
+
+        self.assertEqual(result, [1, 2, 3])
+        operation.result.assert_called_once_with(
+            use_etag=True, return_response=True, force_refresh=False, use_cache=True
+        )
+        mock_remember_esi_expiry.assert_called_once_with(
+            operation_id="GetSomething", headers={"Cache-Control": "max-age=300"}
+        )
+
+    @patch("sovtimer.providers.esi.remember_esi_expiry")
+    def test_remembers_expiry_on_http_not_modified(self, mock_remember_esi_expiry):
+        """
+        Test that the expiry is also read from a 304 Not Modified response
+
+        :param mock_remember_esi_expiry:
+        :type mock_remember_esi_expiry:
+        :return:
+        :rtype:
+        """
+
+        operation = MagicMock()
+        operation.operation = MagicMock(operationId="GetSomething")
+        operation.result.side_effect = HTTPNotModified(
+            304, {"Cache-Control": "max-age=300"}
+        )
+
+        result = ESIHandler.result(operation=operation, track_expiry=True)
+
+        self.assertIsNone(result)
+        mock_remember_esi_expiry.assert_called_once_with(
+            operation_id="GetSomething", headers={"Cache-Control": "max-age=300"}
+        )
+
+    @patch("sovtimer.providers.esi.remember_esi_expiry")
+    def test_does_not_remember_expiry_by_default(self, mock_remember_esi_expiry):
+        """
+        Test that the expiry is only remembered when tracked
+
+        :param mock_remember_esi_expiry:
+        :type mock_remember_esi_expiry:
+        :return:
+        :rtype:
+        """
+
+        operation = MagicMock()
+        operation.operation = MagicMock(operationId="GetSomething")
+        operation.result.return_value = ([1], MagicMock())
+
+        ESIHandler.result(operation=operation, return_response=True)
+
+        mock_remember_esi_expiry.assert_not_called()
+
+    @patch("sovtimer.providers.esi.remember_error_limit")
+    def test_remembers_error_limit_from_responses(self, mock_remember_error_limit):
+        """
+        Test that the error budget is read from successful and failed responses
+
+        :param mock_remember_error_limit:
+        :type mock_remember_error_limit:
+        :return:
+        :rtype:
+        """
+
+        headers = {"X-ESI-Error-Limit-Remain": "99", "X-ESI-Error-Limit-Reset": "30"}
+        operation = MagicMock()
+        operation.operation = MagicMock(operationId="GetSomething")
+        operation.result.return_value = ([1], MagicMock(headers=headers))
+
+        # Also without returning the response or tracking the expiry, like the
+        # alliance lookups
+        self.assertEqual(ESIHandler.result(operation=operation), [1])
+
+        operation.result.side_effect = HTTPNotModified(304, headers)
+
+        self.assertIsNone(ESIHandler.result(operation=operation))
+
+        operation.result.side_effect = HTTPClientError(404, headers, None)
+
+        self.assertIsNone(ESIHandler.result(operation=operation))
+
+        self.assertEqual(
+            mock_remember_error_limit.call_args_list,
+            [((), {"headers": headers})] * 3,
+        )
+
+    @patch("sovtimer.providers.esi.remember_error_limit")
+    def test_remembers_error_limit_and_reraises_on_server_error(
+        self, mock_remember_error_limit
+    ):
+        """
+        Test that server errors count against the error budget, and are still
+        raised for the callers to retry
+
+        :param mock_remember_error_limit:
+        :type mock_remember_error_limit:
+        :return:
+        :rtype:
+        """
+
+        headers = {"X-ESI-Error-Limit-Remain": "42", "X-ESI-Error-Limit-Reset": "30"}
+        operation = MagicMock()
+        operation.operation = MagicMock(operationId="GetSomething")
+        operation.result.side_effect = HTTPServerError(503, headers, None)
+
+        with self.assertRaises(HTTPServerError):
+            ESIHandler.result(operation=operation)
+
+        mock_remember_error_limit.assert_called_once_with(headers=headers)
+
+    @patch("sovtimer.providers.esi.remember_error_limit_exceeded")
+    def test_returns_none_when_error_limit_exceeded(
+        self, mock_remember_error_limit_exceeded
+    ):
+        """
+        Test returns `None` and pauses the requests when ESI reports the error limit
+        as exceeded
+
+        :param mock_remember_error_limit_exceeded:
+        :type mock_remember_error_limit_exceeded:
+        :return:
+        :rtype:
+        """
+
+        operation = MagicMock()
+        operation.operation = MagicMock(operationId="GetSomething")
+        operation.result.side_effect = ESIErrorLimitException(reset=25)
+
+        result = ESIHandler.result(operation=operation, return_response=True)
+
+        self.assertEqual(result, (None, None))
+        mock_remember_error_limit_exceeded.assert_called_once_with(reset=25)
+
+    @patch("sovtimer.providers.esi.wait_for_error_budget", return_value=False)
+    def test_skips_operation_while_paused(self, mock_wait_for_error_budget):
+        """
+        Test that no request is made while the error limit governor pauses them
+
+        :param mock_wait_for_error_budget:
+        :type mock_wait_for_error_budget:
+        :return:
+        :rtype:
+        """
+
+        operation = MagicMock()
+        operation.operation = MagicMock(operationId="GetSomething")
+
+        self.assertIsNone(ESIHandler.result(operation=operation))
+        self.assertEqual(
+            ESIHandler.result(operation=operation, return_response=True),
+            (None, None),
+        )
+
+        operation.result.assert_not_called()
+        mock_wait_for_error_budget.assert_called_with(operation_id="GetSomething")
+
 
 class TestESIHandlerGetSovereigntyCampaigns(BaseTestCase):
     """
@@ -256,6 +454,7 @@ class TestESIHandlerGetSovereigntyCampaigns(BaseTestCase):
 
             self.assertIn("operation", called_kwargs)
             self.assertFalse(called_kwargs.get("force_refresh"))
+            self.assertTrue(called_kwargs.get("track_expiry"))
 
     def test_raises_exception_when_result_raises(self):
         """
@@ -356,6 +555,495 @@ class TestESIHandlerGetAlliancesAllianceId(BaseTestCase):
         self.assertTrue(called_kwargs.get("force_refresh"))
 
 
+class TestThreadSafeESIClientProvider(BaseTestCase):
+    """
+    Test the ThreadSafeESIClientProvider class.
+    """
+
+    @patch("esi.openapi_clients.ESIClient")
+    @patch("esi.openapi_clients.esi_client_factory_sync")
+    def test_builds_the_client_once_on_first_use(
+        self, mock_client_factory, mock_esi_client
+    ):
+        """
+        Test that the client is built on first use, and only once when several
+        threads use it at the same time.
+
+        :param mock_client_factory:
+        :type mock_client_factory:
+        :param mock_esi_client:
+        :type mock_esi_client:
+        :return:
+        :rtype:
+        """
+
+        def build_api(**kwargs):
+            # Building the client from the spec takes a while
+            time.sleep(0.05)
+
+            return MagicMock()
+
+        mock_client_factory.side_effect = build_api
+        mock_esi_client.side_effect = lambda api: MagicMock(api=api)
+
+        provider = ThreadSafeESIClientProvider(
+            compatibility_date="2025-09-30",
+            ua_appname="Test",
+            ua_version="1.0.0",
+            operations=["GetSovereigntyCampaigns"],
+        )
+
+        mock_client_factory.assert_not_called()
+
+        barrier = threading.Barrier(parties=8, timeout=5)
+        clients = []
+
+        def use_client():
+            barrier.wait()
+            clients.append(provider.client)
+
+        threads = [threading.Thread(target=use_client) for _ in range(8)]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        mock_client_factory.assert_called_once()
+        self.assertEqual(len(clients), 8)
+        self.assertTrue(all(client is clients[0] for client in clients))
+
+    @patch("esi.openapi_clients.ESIClient")
+    @patch("esi.openapi_clients.esi_client_factory_sync")
+    def test_requests_share_one_session(self, mock_client_factory, mock_esi_client):
+        """
+        Test that the requests of the client share one session, unless disabled.
+
+        :param mock_client_factory:
+        :type mock_client_factory:
+        :param mock_esi_client:
+        :type mock_esi_client:
+        :return:
+        :rtype:
+        """
+
+        mock_esi_client.side_effect = lambda api: MagicMock(api=api)
+
+        for enabled in (True, False):
+            with (
+                self.subTest(enabled=enabled),
+                override_settings(SOVTIMER_ESI_CONNECTION_REUSE=enabled),
+            ):
+                session_factory = MagicMock()
+                mock_client_factory.return_value = MagicMock(
+                    _session_factory=session_factory
+                )
+
+                client = ThreadSafeESIClientProvider(
+                    compatibility_date="2025-09-30",
+                    ua_appname="Test",
+                    ua_version="1.0.0",
+                    operations=["GetSovereigntyCampaigns"],
+                ).client
+
+                if enabled:
+                    self.assertIsInstance(
+                        client.api._session_factory, PooledSessionFactory
+                    )
+                    self.assertIs(
+                        client.api._session_factory.session_factory, session_factory
+                    )
+                else:
+                    self.assertIs(client.api._session_factory, session_factory)
+
+    @patch("esi.openapi_clients.ESIClient")
+    @patch("esi.openapi_clients.esi_client_factory_sync")
+    def test_client_is_not_used_before_it_is_set_up(
+        self, mock_client_factory, mock_esi_client
+    ):
+        """
+        Test that another thread doesn't get the client before the pooled session
+        factory is installed on it.
+
+        :param mock_client_factory:
+        :type mock_client_factory:
+        :param mock_esi_client:
+        :type mock_esi_client:
+        :return:
+        :rtype:
+        """
+
+        mock_client_factory.return_value = MagicMock(_session_factory=MagicMock())
+        mock_esi_client.side_effect = lambda api: MagicMock(api=api)
+
+        provider = ThreadSafeESIClientProvider(
+            compatibility_date="2025-09-30",
+            ua_appname="Test",
+            ua_version="1.0.0",
+            operations=["GetSovereigntyCampaigns"],
+        )
+
+        pooled = []
+
+        def use_client():
+            pooled.append(
+                isinstance(provider.client.api._session_factory, PooledSessionFactory)
+            )
+
+        other_thread = threading.Thread(target=use_client)
+
+        def connection_reuse_enabled():
+            # The parent provider has built the client, the pool isn't set up yet
+            other_thread.start()
+            other_thread.join(timeout=0.1)
+
+            return True
+
+        with patch(
+            "sovtimer.providers.esi.esi_connection_reuse_enabled",
+            side_effect=connection_reuse_enabled,
+        ):
+            client = provider.client
+
+        other_thread.join()
+
+        self.assertIsInstance(client.api._session_factory, PooledSessionFactory)
+        self.assertEqual(pooled, [True])
+        self.assertIs(provider.client, client)
+
+
+class TestPooledSessionFactory(BaseTestCase):
+    """
+    Test the PooledSessionFactory class.
+    """
+
+    def test_shares_one_client_that_stays_open(self):
+        """
+        Test that all sessions share one client, which isn't closed with them.
+
+        :return:
+        :rtype:
+        """
+
+        session_factory = MagicMock()
+        factory = PooledSessionFactory(session_factory=session_factory)
+
+        first = factory(cert=None, auth=None, headers={})
+        first.close()
+        second = factory(cert=None, auth=None, headers={})
+
+        session_factory.assert_called_once_with(cert=None, auth=None, headers={})
+        session_factory.return_value.close.assert_not_called()
+        self.assertIs(first.send, session_factory.return_value.send)
+        self.assertIs(second.send, session_factory.return_value.send)
+
+    def test_builds_a_client_per_process(self):
+        """
+        Test that a forked worker process doesn't use the client of its parent.
+
+        :return:
+        :rtype:
+        """
+
+        session_factory = MagicMock(side_effect=lambda **kwargs: MagicMock())
+        factory = PooledSessionFactory(session_factory=session_factory)
+
+        with patch("sovtimer.providers.esi.os.getpid", return_value=1):
+            parent = factory()
+
+        with patch("sovtimer.providers.esi.os.getpid", return_value=2):
+            child = factory()
+
+        self.assertEqual(session_factory.call_count, 2)
+        self.assertIsNot(parent.send, child.send)
+
+    def test_requests_with_credentials_get_a_session_of_their_own(self):
+        """
+        Test that a session with credentials isn't shared.
+
+        :return:
+        :rtype:
+        """
+
+        session_factory = MagicMock()
+        factory = PooledSessionFactory(session_factory=session_factory)
+
+        session = factory(cert=None, auth="token")
+
+        self.assertIs(session, session_factory.return_value)
+
+
+class TestESIHandlerGetAlliances(BaseTestCase):
+    """
+    Test the ESIHandler.get_alliances method.
+    """
+
+    @patch("sovtimer.providers.esi.ESIHandler.get_alliances_alliance_id")
+    def test_returns_empty_dict_without_requests_when_no_ids_given(
+        self, mock_get_alliance
+    ):
+        """
+        Test that no request is made when no alliance IDs are given.
+
+        :param mock_get_alliance:
+        :type mock_get_alliance:
+        :return:
+        :rtype:
+        """
+
+        result = ESIHandler.get_alliances(alliance_ids=[])
+
+        self.assertEqual(result, {})
+        mock_get_alliance.assert_not_called()
+
+    @patch("sovtimer.providers.esi.ESIHandler.get_alliances_alliance_id")
+    def test_maps_alliance_ids_to_data_and_omits_failed_requests(
+        self, mock_get_alliance
+    ):
+        """
+        Test that the results are mapped by alliance ID and failed requests are omitted.
+
+        :param mock_get_alliance:
+        :type mock_get_alliance:
+        :return:
+        :rtype:
+        """
+
+        mock_get_alliance.side_effect = lambda alliance_id, force_refresh: (
+            None if alliance_id == 3 else {"name": f"Alliance {alliance_id}"}
+        )
+
+        result = ESIHandler.get_alliances(alliance_ids={1, 2, 3}, force_refresh=True)
+
+        self.assertEqual(result, {1: {"name": "Alliance 1"}, 2: {"name": "Alliance 2"}})
+        mock_get_alliance.assert_any_call(alliance_id=1, force_refresh=True)
+        mock_get_alliance.assert_any_call(alliance_id=2, force_refresh=True)
+        mock_get_alliance.assert_any_call(alliance_id=3, force_refresh=True)
+
+    @override_settings(SOVTIMER_ESI_MAX_CONCURRENT_REQUESTS=4)
+    @patch("sovtimer.providers.esi.ESIHandler.get_alliances_alliance_id")
+    def test_runs_requests_concurrently_within_the_limit(self, mock_get_alliance):
+        """
+        Test that requests run concurrently, but never more than the configured limit.
+
+        :param mock_get_alliance:
+        :type mock_get_alliance:
+        :return:
+        :rtype:
+        """
+
+        lock = threading.Lock()
+        in_flight = {"current": 0, "max": 0}
+
+        def fake_request(alliance_id, force_refresh):
+            with lock:
+                in_flight["current"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["current"])
+
+            time.sleep(0.05)
+
+            with lock:
+                in_flight["current"] -= 1
+
+            return {"name": f"Alliance {alliance_id}"}
+
+        mock_get_alliance.side_effect = fake_request
+
+        result = ESIHandler.get_alliances(alliance_ids=range(1, 13))
+
+        self.assertEqual(len(result), 12)
+        self.assertGreater(in_flight["max"], 1)
+        self.assertLessEqual(in_flight["max"], 4)
+
+    @override_settings(SOVTIMER_ESI_REQUEST_TIMEOUT=0.05)
+    @patch("sovtimer.providers.esi.logger.warning")
+    @patch("sovtimer.providers.esi.ESIHandler.get_alliances_alliance_id")
+    def test_skips_requests_that_time_out(self, mock_get_alliance, mock_warning):
+        """
+        Test that requests exceeding the timeout are skipped and logged.
+
+        :param mock_get_alliance:
+        :type mock_get_alliance:
+        :param mock_warning:
+        :type mock_warning:
+        :return:
+        :rtype:
+        """
+
+        def fake_request(alliance_id, force_refresh):
+            if alliance_id == 2:
+                time.sleep(0.5)
+
+            return {"name": f"Alliance {alliance_id}"}
+
+        mock_get_alliance.side_effect = fake_request
+
+        result = ESIHandler.get_alliances(alliance_ids={1, 2})
+
+        self.assertEqual(result, {1: {"name": "Alliance 1"}})
+        mock_warning.assert_called_once_with(
+            "Timed out after 0.05 seconds while fetching alliance ID 2 from ESI."
+        )
+
+    @override_settings(
+        SOVTIMER_ESI_MAX_CONCURRENT_REQUESTS=1, SOVTIMER_ESI_REQUEST_TIMEOUT=0.2
+    )
+    @patch("sovtimer.providers.esi.logger.warning")
+    @patch("sovtimer.providers.esi.ESIHandler.get_alliances_alliance_id")
+    def test_timeout_bounds_the_whole_call(self, mock_get_alliance, mock_warning):
+        """
+        Test that requests queued behind a hanging one don't get a timeout of their
+        own, the whole call is bounded by a single timeout.
+
+        :param mock_get_alliance:
+        :type mock_get_alliance:
+        :param mock_warning:
+        :type mock_warning:
+        :return:
+        :rtype:
+        """
+
+        released = threading.Event()
+
+        def hanging_request(alliance_id, force_refresh):
+            released.wait(timeout=5)
+
+            return {"name": f"Alliance {alliance_id}"}
+
+        mock_get_alliance.side_effect = hanging_request
+
+        started = time.monotonic()
+
+        try:
+            result = ESIHandler.get_alliances(alliance_ids=range(1, 6))
+        finally:
+            released.set()
+
+        self.assertLess(time.monotonic() - started, 0.6)
+        self.assertEqual(result, {})
+        self.assertEqual(mock_warning.call_count, 5)
+
+
+class TestESIHandlerPostUniverseNames(BaseTestCase):
+    """
+    Test the ESIHandler.post_universe_names method.
+    """
+
+    @patch("sovtimer.providers.esi.esi")
+    @patch("sovtimer.providers.esi.ESIHandler.result")
+    def test_posts_ids_without_etag_or_cache(self, mock_result, mock_esi):
+        """
+        Test that the IDs are posted as body and the response is never cached.
+
+        :param mock_result:
+        :type mock_result:
+        :param mock_esi:
+        :type mock_esi:
+        :return:
+        :rtype:
+        """
+
+        mock_result.return_value = ["resolved"]
+
+        result = ESIHandler.post_universe_names(ids=(1, 2))
+
+        self.assertEqual(result, ["resolved"])
+        mock_esi.client.Universe.PostUniverseNames.assert_called_once_with(body=[1, 2])
+        mock_result.assert_called_once_with(
+            operation=mock_esi.client.Universe.PostUniverseNames.return_value,
+            use_etag=False,
+            use_cache=False,
+            store_cache=False,
+        )
+
+
+class TestESIHandlerGetAllianceNames(BaseTestCase):
+    """
+    Test the ESIHandler.get_alliance_names method.
+    """
+
+    @staticmethod
+    def _resolved_name(entity_id: int, category: str) -> MagicMock:
+        """
+        Build a resolved name like it is returned from ESI.
+
+        :param entity_id:
+        :type entity_id:
+        :param category:
+        :type category:
+        :return:
+        :rtype:
+        """
+
+        resolved_name = MagicMock(id=entity_id, category=MagicMock(value=category))
+        resolved_name.name = f"Entity {entity_id}"
+
+        return resolved_name
+
+    @patch("sovtimer.providers.esi.Constants.ESI_UNIVERSE_NAMES_MAX_IDS", new=2)
+    @patch("sovtimer.providers.esi.ESIHandler.post_universe_names")
+    def test_resolves_ids_in_batches(self, mock_post_universe_names):
+        """
+        Test that the IDs are resolved in batches of the maximum size.
+
+        :param mock_post_universe_names:
+        :type mock_post_universe_names:
+        :return:
+        :rtype:
+        """
+
+        mock_post_universe_names.side_effect = lambda ids: [
+            self._resolved_name(entity_id=entity_id, category="alliance")
+            for entity_id in ids
+        ]
+
+        result = ESIHandler.get_alliance_names(alliance_ids={3, 1, 2})
+
+        self.assertEqual(result, {1: "Entity 1", 2: "Entity 2", 3: "Entity 3"})
+        self.assertEqual(mock_post_universe_names.call_count, 2)
+        mock_post_universe_names.assert_any_call(ids=[1, 2])
+        mock_post_universe_names.assert_any_call(ids=[3])
+
+    @patch("sovtimer.providers.esi.Constants.ESI_UNIVERSE_NAMES_MAX_IDS", new=2)
+    @patch("sovtimer.providers.esi.ESIHandler.post_universe_names")
+    def test_omits_failed_batches_and_non_alliances(self, mock_post_universe_names):
+        """
+        Test that failed batches and IDs of other categories are omitted.
+
+        :param mock_post_universe_names:
+        :type mock_post_universe_names:
+        :return:
+        :rtype:
+        """
+
+        mock_post_universe_names.side_effect = [
+            [
+                self._resolved_name(entity_id=1, category="alliance"),
+                self._resolved_name(entity_id=2, category="corporation"),
+            ],
+            None,
+        ]
+
+        result = ESIHandler.get_alliance_names(alliance_ids={1, 2, 3})
+
+        self.assertEqual(result, {1: "Entity 1"})
+
+    @patch("sovtimer.providers.esi.ESIHandler.post_universe_names")
+    def test_makes_no_request_without_ids(self, mock_post_universe_names):
+        """
+        Test that no request is made when no IDs are given.
+
+        :param mock_post_universe_names:
+        :type mock_post_universe_names:
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(ESIHandler.get_alliance_names(alliance_ids=[]), {})
+        mock_post_universe_names.assert_not_called()
+
+
 class TestESIHandlerGetSovereigntySystems(BaseTestCase):
     """
     Test the ESIHandler.get_sovereignty_systems method.
@@ -384,6 +1072,7 @@ class TestESIHandlerGetSovereigntySystems(BaseTestCase):
 
             self.assertIn("operation", called_kwargs)
             self.assertFalse(called_kwargs.get("force_refresh"))
+            self.assertTrue(called_kwargs.get("track_expiry"))
 
     def test_raises_exception_when_result_raises(self):
         """
@@ -0,0 +1,351 @@
+"""
+Performance contracts: the number of queries must not grow with the input size
+"""
+
+# Standard Library
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from unittest.mock import patch
+
+# Django
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory
+from django.urls import reverse
+
+# AA Sovereignty Timer
+from sovtimer.benchmarks.fixtures import (
+    ALLIANCE_ID_OFFSET,
+    campaigns_payload,
+    create_database_fixtures,
+    create_sov_fixtures,
+    sov_systems_payload,
+)
+from sovtimer.helper.dashboard import build_dashboard_data, get_dashboard_data
+from sovtimer.models import Alliance
+from sovtimer.tasks import update_sov_campaigns, update_sov_structures
+from sovtimer.tests import BaseTestCase
+from sovtimer.views import dashboard_data_v2
+
+NOW = datetime(2030, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def _create_structures(size: int) -> None:
+    """
+    Create the sov hubs and system snapshots of the synthetic payload
+
+    :param size: Number of solar systems
+    :type size: int
+    :return:
+    :rtype:
+    """
+
+    create_database_fixtures(systems=size)
+    create_sov_fixtures(systems=size)
+
+
+def _create_campaigns(size: int) -> None:
+    """
+    Create a campaign for each of the sov hubs of the synthetic payload
+
+    :param size: Number of solar systems and campaigns
+    :type size: int
+    :return:
+    :rtype:
+    """
+
+    create_database_fixtures(systems=size)
+    create_sov_fixtures(systems=size, campaigns=size, now=NOW)
+
+
+class TestDashboardQueryBudget(BaseTestCase):
+    """
+    Query budgets of the dashboard data
+    """
+
+    def setUp(self):
+        """
+        Set up a request for the dashboard data, without the queries of the
+        authentication and session middlewares
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+        self.request = RequestFactory().get(reverse("sovtimer:dashboard_data_v2"))
+        self.request.user = AnonymousUser()
+
+    def test_build_dashboard_data(self):
+        """
+        Test that the campaigns are fetched with their location, defender and ADM
+        in one query
+
+        :return:
+        :rtype:
+        """
+
+        self.assertQueryBudget(
+            setup=_create_campaigns,
+            func=lambda _: build_dashboard_data(),
+            budget=1,
+        )
+
+    def test_dashboard_data_view_uncached(self):
+        """
+        Test that the view only queries the database to build missing dashboard data
+
+        :return:
+        :rtype:
+        """
+
+        def setup(size: int) -> None:
+            _create_campaigns(size=size)
+
+            cache.clear()
+
+        self.assertQueryBudget(
+            setup=setup,
+            func=lambda _: dashboard_data_v2(self.request),
+            budget=1,
+        )
+
+    def test_dashboard_data_view_cached(self):
+        """
+        Test that the view serves cached dashboard data without any query
+
+        :return:
+        :rtype:
+        """
+
+        def setup(size: int) -> None:
+            _create_campaigns(size=size)
+
+            cache.clear()
+            get_dashboard_data()
+
+        self.assertQueryBudget(
+            setup=setup,
+            func=lambda _: dashboard_data_v2(self.request),
+            budget=0,
+        )
+
+
+@patch("sovtimer.models.ESIHandler.get_alliances", return_value={})
+@patch("sovtimer.models.ESIHandler.get_alliance_names")
+class TestAllianceQueryBudget(BaseTestCase):
+    """
+    Query budgets of Alliance.bulk_get_or_create_from_esi
+    """
+
+    def test_all_alliances_exist(self, mock_get_alliance_names, mock_get_alliances):
+        """
+        Test that known alliances are fetched with one query
+
+        :param mock_get_alliance_names:
+        :type mock_get_alliance_names:
+        :param mock_get_alliances:
+        :type mock_get_alliances:
+        :return:
+        :rtype:
+        """
+
+        def setup(size: int) -> set[int]:
+            Alliance.objects.bulk_create(
+                [
+                    Alliance(alliance_id=ALLIANCE_ID_OFFSET + index, name=f"A{index}")
+                    for index in range(size)
+                ]
+            )
+
+            return {ALLIANCE_ID_OFFSET + index for index in range(size)}
+
+        mock_get_alliance_names.return_value = {}
+
+        self.assertQueryBudget(
+            setup=setup,
+            func=lambda alliance_ids: Alliance.bulk_get_or_create_from_esi(
+                alliance_ids=alliance_ids
+            ),
+            budget=1,
+        )
+
+    def test_unknown_alliances_are_created_in_bulk(
+        self, mock_get_alliance_names, mock_get_alliances
+    ):
+        """
+        Test that unknown alliances are created with one more query
+
+        :param mock_get_alliance_names:
+        :type mock_get_alliance_names:
+        :param mock_get_alliances:
+        :type mock_get_alliances:
+        :return:
+        :rtype:
+        """
+
+        def setup(size: int) -> set[int]:
+            # Every other alliance is already known
+            Alliance.objects.bulk_create(
+                [
+                    Alliance(alliance_id=ALLIANCE_ID_OFFSET + index, name=f"A{index}")
+                    for index in range(0, size, 2)
+                ]
+            )
+
+            return {ALLIANCE_ID_OFFSET + index for index in range(size * 2)}
+
+        mock_get_alliance_names.side_effect = lambda alliance_ids: {
+            alliance_id: f"Alliance {alliance_id}" for alliance_id in alliance_ids
+        }
+
+        self.assertQueryBudget(
+            setup=setup,
+            func=lambda alliance_ids: Alliance.bulk_get_or_create_from_esi(
+                alliance_ids=alliance_ids
+            ),
+            budget=2,
+        )
+
+
+@patch("sovtimer.tasks.update_dashboard_data_cache")
+class TestTaskQueryBudget(BaseTestCase):
+    """
+    Query budgets of the update tasks
+
+    The dashboard data rebuild after a sync is covered by its own budget.
+    """
+
+    def setUp(self):
+        """
+        Start with an empty cache, so no payload is skipped as unchanged
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    @patch("sovtimer.models.ESIHandler.get_sovereignty_systems")
+    def test_update_sov_structures_initial(
+        self, mock_get_sovereignty_systems, mock_update_dashboard
+    ):
+        """
+        Test the structure sync into an empty table
+
+        :param mock_get_sovereignty_systems:
+        :type mock_get_sovereignty_systems:
+        :param mock_update_dashboard:
+        :type mock_update_dashboard:
+        :return:
+        :rtype:
+        """
+
+        def setup(size: int) -> None:
+            create_database_fixtures(systems=size)
+
+            mock_get_sovereignty_systems.return_value = sov_systems_payload(
+                systems=size
+            )
+
+        self.assertQueryBudget(
+            setup=setup,
+            func=lambda _: update_sov_structures(force_refresh=True),
+            # Alliances and solar systems, then for the structures and the systems
+            # each the existing rows and one upsert in a savepoint
+            budget=10,
+        )
+
+    @patch("sovtimer.models.ESIHandler.get_sovereignty_systems")
+    def test_update_sov_structures_resync(
+        self, mock_get_sovereignty_systems, mock_update_dashboard
+    ):
+        """
+        Test the structure sync when some structures changed and some vanished
+
+        :param mock_get_sovereignty_systems:
+        :type mock_get_sovereignty_systems:
+        :param mock_update_dashboard:
+        :type mock_update_dashboard:
+        :return:
+        :rtype:
+        """
+
+        def setup(size: int) -> None:
+            _create_structures(size=size * 2)
+
+            # Only the first half is still claimed, and every tenth ADM changed
+            mock_get_sovereignty_systems.return_value = sov_systems_payload(
+                systems=size, revision=1
+            )
+
+        self.assertQueryBudget(
+            setup=setup,
+            func=lambda _: update_sov_structures(force_refresh=True),
+            # Alliances and solar systems, the existing structures, then in a
+            # savepoint one delete each for the campaigns of the vanished structures
+            # and the structures, and one upsert, the same for the systems, which
+            # have no campaigns
+            budget=13,
+        )
+
+    @patch("sovtimer.models.ESIHandler.get_sovereignty_systems")
+    def test_update_sov_structures_unchanged_payload(
+        self, mock_get_sovereignty_systems, mock_update_dashboard
+    ):
+        """
+        Test that the structure sync doesn't query anything for an unchanged payload
+
+        :param mock_get_sovereignty_systems:
+        :type mock_get_sovereignty_systems:
+        :param mock_update_dashboard:
+        :type mock_update_dashboard:
+        :return:
+        :rtype:
+        """
+
+        def setup(size: int) -> None:
+            create_database_fixtures(systems=size)
+
+            mock_get_sovereignty_systems.return_value = sov_systems_payload(
+                systems=size
+            )
+
+            cache.clear()
+            update_sov_structures(force_refresh=True)
+
+        self.assertQueryBudget(
+            setup=setup,
+            func=lambda _: update_sov_structures(),
+            budget=0,
+        )
+
+    @patch("sovtimer.models.ESIHandler.get_sovereignty_campaigns")
+    def test_update_sov_campaigns(
+        self, mock_get_sovereignty_campaigns, mock_update_dashboard
+    ):
+        """
+        Test the campaign sync
+
+        :param mock_get_sovereignty_campaigns:
+        :type mock_get_sovereignty_campaigns:
+        :param mock_update_dashboard:
+        :type mock_update_dashboard:
+        :return:
+        :rtype:
+        """
+
+        def setup(size: int) -> None:
+            _create_structures(size=size)
+
+            mock_get_sovereignty_campaigns.return_value = campaigns_payload(
+                campaigns=size, now=NOW
+            )
+
+        self.assertQueryBudget(
+            setup=setup,
+            func=lambda _: update_sov_campaigns(force_refresh=True),
+            # Existing campaigns, alliances, one upsert in a savepoint
+            budget=5,
+        )
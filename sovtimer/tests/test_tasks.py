@@ -1,16 +1,33 @@
 # Standard Library
+import threading
+from collections.abc import Callable
+from datetime import datetime
+from datetime import timezone as dt_timezone
 from unittest.mock import MagicMock, patch
 
 # Third Party
-from eve_sde.models import SolarSystem
+from eve_sde.models import Constellation, Region, SolarSystem
+
+# Django
+from django.core.cache import cache
+from django.test import override_settings
 
 # AA Sovereignty Timer
 from sovtimer.constants import Constants
-from sovtimer.models import Alliance
+from sovtimer.helper.lease import Lease
+from sovtimer.models import (
+    Alliance,
+    Campaign,
+    SovereigntyStructure,
+    SovereigntySystem,
+)
+from sovtimer.records import SovStructureRecord
 from sovtimer.tasks import (
     run_sov_campaign_updates,
+    schedule_sov_campaign_updates,
     update_sov_campaigns,
     update_sov_structures,
+    update_sov_structures_and_campaigns,
 )
 from sovtimer.tests import BaseTestCase
 
@@ -20,7 +37,32 @@ class TestUpdateSovStructures(BaseTestCase):
     Test the update_sov_structures task
     """
 
-    @patch("sovtimer.tasks.cache.get")
+    def setUp(self):
+        """
+        Set up the test case, the cache is mocked in these tests, so neither the
+        dashboard data nor the payload hashes are used
+
+        :return:
+        :rtype:
+        """
+
+        patcher = patch("sovtimer.tasks.update_dashboard_data_cache")
+        self.mock_update_dashboard_data_cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for target in ("payload_unchanged", "remember_payload_hash"):
+            patcher = patch(f"sovtimer.tasks.{target}", return_value=False)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        # The alliances and solar systems only exist in the mocks
+        patcher = patch("sovtimer.tasks.SovereigntySystem.objects.bulk_create")
+        self.mock_system_bulk_create = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # The throttle of the previous run has expired
+        cache.delete(Constants.TASK_STRUCTURE_CACHE_KEY)
+
     @patch("sovtimer.tasks.cache.set")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.bulk_create")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.exclude")
@@ -35,7 +77,6 @@ class TestUpdateSovStructures(BaseTestCase):
         mock_exclude,
         mock_bulk_create,
         mock_cache_set,
-        mock_cache_get,
     ):
         """
         Test returns early and makes no db calls.
@@ -52,13 +93,10 @@ class TestUpdateSovStructures(BaseTestCase):
         :type mock_bulk_create:
         :param mock_cache_set:
         :type mock_cache_set:
-        :param mock_cache_get:
-        :type mock_cache_get:
         :return:
         :rtype:
         """
 
-        mock_cache_get.return_value = False
         mock_cache_set.return_value = None
 
         mock_get_sov_structures.return_value = None
@@ -66,7 +104,7 @@ class TestUpdateSovStructures(BaseTestCase):
         result = update_sov_structures(force_refresh=False)
 
         self.assertIsNone(result)
-        mock_cache_get.assert_called_once_with(Constants.TASK_STRUCTURE_CACHE_KEY)
+        self.assertTrue(cache.get(Constants.TASK_STRUCTURE_CACHE_KEY))
         mock_get_sov_structures.assert_called_once_with(
             use_etags=True, force_refresh=False
         )
@@ -74,20 +112,16 @@ class TestUpdateSovStructures(BaseTestCase):
         mock_solar_system_filter.assert_not_called()
         mock_bulk_create.assert_not_called()
         mock_exclude.assert_not_called()
+        self.mock_update_dashboard_data_cache.assert_not_called()
 
     @patch("sovtimer.tasks.SovereigntyStructure.get_sov_structures_from_esi")
-    @patch("sovtimer.tasks.cache.get")
-    def test_skips_update_when_cache_not_expired(
-        self, mock_cache_get, mock_get_sov_structures
-    ):
-        mock_cache_get.return_value = True
+    def test_skips_update_when_cache_not_expired(self, mock_get_sov_structures):
+        cache.set(Constants.TASK_STRUCTURE_CACHE_KEY, True)
 
         update_sov_structures(force_refresh=False)
 
-        mock_cache_get.assert_called_once_with(Constants.TASK_STRUCTURE_CACHE_KEY)
         mock_get_sov_structures.assert_not_called()
 
-    @patch("sovtimer.tasks.cache.get")
     @patch("sovtimer.tasks.cache.set")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.bulk_create")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.exclude")
@@ -102,7 +136,6 @@ class TestUpdateSovStructures(BaseTestCase):
         mock_exclude,
         mock_bulk_create,
         mock_cache_set,
-        mock_cache_get,
     ):
         """
         Test processes structure with default vulnerability.
@@ -119,40 +152,35 @@ class TestUpdateSovStructures(BaseTestCase):
         :type mock_bulk_create:
         :param mock_cache_set:
         :type mock_cache_set:
-        :param mock_cache_get:
-        :type mock_cache_get:
         :return:
         :rtype:
         """
 
-        mock_cache_get.return_value = False
         mock_cache_set.return_value = None
 
-        mock_get_sov_structures.return_value = [
-            {
-                "solar_system_id": 3001,
-                "alliance_id": 2001,
-                "sovereignty_hub": {
-                    "id": 1001,
-                    "vulnerability_window": {
-                        "start": "2023-01-01T12:00:00Z",
-                        "end": "2023-01-01T18:00:00Z",
-                    },
-                },
-                "development": {"activity_defense_multiplier": None},
-            }
-        ]
+        mock_get_sov_structures.return_value = iter(
+            [
+                SovStructureRecord(
+                    1001,
+                    3001,
+                    2001,
+                    1,
+                    datetime(2023, 1, 1, 12, 0, tzinfo=dt_timezone.utc),
+                    datetime(2023, 1, 1, 18, 0, tzinfo=dt_timezone.utc),
+                )
+            ]
+        )
 
         mock_bulk_get_or_create.return_value = {
             2001: Alliance(pk=2001, name="Alliance 2001")
         }
-        mock_solar_system_filter.return_value = [SolarSystem(id=3001)]
+        mock_solar_system_filter.return_value.values_list.return_value = [3001]
         mock_bulk_create.return_value = None
         mock_exclude.return_value.delete = MagicMock()
 
         update_sov_structures(force_refresh=False)
 
-        mock_cache_get.assert_called_once_with(Constants.TASK_STRUCTURE_CACHE_KEY)
+        self.assertTrue(cache.get(Constants.TASK_STRUCTURE_CACHE_KEY))
         mock_get_sov_structures.assert_called_once()
         mock_bulk_get_or_create.assert_called_once_with(
             alliance_ids={2001}, force_refresh=False
@@ -163,8 +191,10 @@ class TestUpdateSovStructures(BaseTestCase):
         self.assertEqual(len(created), 1)
         self.assertEqual(created[0].structure_id, 1001)
         self.assertEqual(created[0].vulnerability_occupancy_level, 1)
+        self.assertEqual(created[0].alliance_id, 2001)
+        self.assertEqual(created[0].solar_system_id, 3001)
+        self.mock_update_dashboard_data_cache.assert_called_once()
 
-    @patch("sovtimer.tasks.cache.get")
     @patch("sovtimer.tasks.cache.set")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.bulk_create")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.exclude")
@@ -179,7 +209,6 @@ class TestUpdateSovStructures(BaseTestCase):
         mock_exclude,
         mock_bulk_create,
         mock_cache_set,
-        mock_cache_get,
     ):
         """
         Test skips structure if hub_id is missing.
@@ -196,34 +225,24 @@ class TestUpdateSovStructures(BaseTestCase):
         :type mock_bulk_create:
         :param mock_cache_set:
         :type mock_cache_set:
-        :param mock_cache_get:
-        :type mock_cache_get:
         :return:
         :rtype:
         """
 
-        mock_cache_get.return_value = False
         mock_cache_set.return_value = None
 
         # first structure missing sovereignty_hub id, second is valid
-        mock_get_sov_structures.return_value = [
-            {
-                "solar_system_id": 3001,
-                "alliance_id": 2001,
-                "sovereignty_hub": {"id": None},
-            },
-            {
-                "solar_system_id": 3002,
-                "alliance_id": 2002,
-                "sovereignty_hub": {"id": 1002},
-                "development": {"activity_defense_multiplier": 0.5},
-            },
-        ]
+        mock_get_sov_structures.return_value = iter(
+            [
+                SovStructureRecord(None, 3001, 2001, 1, None, None),
+                SovStructureRecord(1002, 3002, 2002, 0.5, None, None),
+            ]
+        )
 
         mock_bulk_get_or_create.return_value = {
             2002: Alliance(alliance_id=2002, name="Alliance 2002")
         }
-        mock_solar_system_filter.return_value = [SolarSystem(id=3002)]
+        mock_solar_system_filter.return_value.values_list.return_value = [3002]
         mock_bulk_create.return_value = None
         mock_exclude.return_value.delete = MagicMock()
 
@@ -235,7 +254,6 @@ class TestUpdateSovStructures(BaseTestCase):
         self.assertEqual(len(created), 1)
         self.assertEqual(created[0].structure_id, 1002)
 
-    @patch("sovtimer.tasks.cache.get")
     @patch("sovtimer.tasks.cache.set")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.bulk_create")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.exclude")
@@ -250,7 +268,6 @@ class TestUpdateSovStructures(BaseTestCase):
         mock_exclude,
         mock_bulk_create,
         mock_cache_set,
-        mock_cache_get,
     ):
         """
         Test skips duplicate structure IDs.
@@ -267,37 +284,26 @@ class TestUpdateSovStructures(BaseTestCase):
         :type mock_bulk_create:
         :param mock_cache_set:
         :type mock_cache_set:
-        :param mock_cache_get:
-        :type mock_cache_get:
         :return:
         :rtype:
         """
 
-        mock_cache_get.return_value = False
         mock_cache_set.return_value = None
 
         # two structures with same sovereignty_hub id -> second should be skipped
-        mock_get_sov_structures.return_value = [
-            {
-                "solar_system_id": 3003,
-                "alliance_id": 2003,
-                "sovereignty_hub": {"id": 1003},
-                "development": {"activity_defense_multiplier": 0.7},
-            },
-            {
-                "solar_system_id": 3004,
-                "alliance_id": 2003,
-                "sovereignty_hub": {"id": 1003},
-                "development": {"activity_defense_multiplier": 0.9},
-            },
-        ]
+        mock_get_sov_structures.return_value = iter(
+            [
+                SovStructureRecord(1003, 3003, 2003, 0.7, None, None),
+                SovStructureRecord(1003, 3004, 2003, 0.9, None, None),
+            ]
+        )
 
         mock_bulk_get_or_create.return_value = {
             2003: Alliance(alliance_id=2003, name="Alliance 2003")
         }
-        mock_solar_system_filter.return_value = [
-            SolarSystem(id=3003),
-            SolarSystem(id=3004),
+        mock_solar_system_filter.return_value.values_list.return_value = [
+            3003,
+            3004,
         ]
         mock_bulk_create.return_value = None
         mock_exclude.return_value.delete = MagicMock()
@@ -309,210 +315,310 @@ class TestUpdateSovStructures(BaseTestCase):
         created = mock_bulk_create.call_args[0][0]
         self.assertEqual(len(created), 1)
         self.assertEqual(created[0].structure_id, 1003)
+        self.assertEqual(created[0].vulnerability_occupancy_level, 0.7)
+
+
+class TestUpdateSovStructuresDiffSync(BaseTestCase):
+    """
+    Test the differential sync of the update_sov_structures task
+    """
+
+    @staticmethod
+    def _esi_structure(structure_id: int, adm: float = 1.0) -> SovStructureRecord:
+        """
+        Build a structure like it is yielded from get_sov_structures_from_esi
+
+        :param structure_id:
+        :type structure_id:
+        :param adm:
+        :type adm:
+        :return:
+        :rtype:
+        """
+
+        return SovStructureRecord(
+            structure_id=structure_id,
+            solar_system_id=30000000 + structure_id,
+            alliance_id=2001,
+            vulnerability_occupancy_level=adm,
+            vulnerable_start_time=None,
+            vulnerable_end_time=None,
+        )
+
+    def setUp(self):
+        """
+        Set up existing structures
+
+        :return:
+        :rtype:
+        """
+
+        for structure_id, adm in ((1001, 1.0), (1002, 2.0), (1003, 3.0)):
+            SovereigntyStructure.objects.create(
+                structure_id=structure_id, vulnerability_occupancy_level=adm
+            )
+
+        patcher = patch("sovtimer.tasks.update_dashboard_data_cache")
+        self.mock_update_dashboard_data_cache = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
+    @patch("sovtimer.tasks.SovereigntyStructure.get_sov_structures_from_esi")
+    def test_only_writes_changed_structures(
+        self, mock_get_sov_structures, mock_bulk_get_or_create
+    ):
+        """
+        Test that only new and changed structures are written and vanished ones deleted
+
+        :param mock_get_sov_structures:
+        :type mock_get_sov_structures:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
+        :return:
+        :rtype:
+        """
+
+        mock_bulk_get_or_create.return_value = {}
+        mock_get_sov_structures.return_value = iter(
+            [
+                self._esi_structure(structure_id=1001, adm=1.0),
+                self._esi_structure(structure_id=1002, adm=2.5),
+                self._esi_structure(structure_id=1004, adm=4.0),
+            ]
+        )
+
+        result = update_sov_structures(force_refresh=True)
+
+        self.assertEqual(
+            result, {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1}
+        )
+        self.assertEqual(
+            dict(
+                SovereigntyStructure.objects.values_list(
+                    "structure_id", "vulnerability_occupancy_level"
+                )
+            ),
+            {1001: 1.0, 1002: 2.5, 1004: 4.0},
+        )
+        self.mock_update_dashboard_data_cache.assert_called_once()
 
-    @patch("sovtimer.tasks.cache.get")
-    @patch("sovtimer.tasks.cache.set")
     @patch("sovtimer.tasks.SovereigntyStructure.objects.bulk_create")
-    @patch("sovtimer.tasks.SovereigntyStructure.objects.exclude")
-    @patch("sovtimer.tasks.SolarSystem.objects.filter")
     @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
     @patch("sovtimer.tasks.SovereigntyStructure.get_sov_structures_from_esi")
-    def test_development_getitem_raises_attribute_error_defaults_to_one(
-        self,
-        mock_get_sov_structures,
-        mock_bulk_get_or_create,
-        mock_solar_system_filter,
-        mock_exclude,
-        mock_bulk_create,
-        mock_cache_set,
-        mock_cache_get,
+    def test_skips_writes_when_nothing_changed(
+        self, mock_get_sov_structures, mock_bulk_get_or_create, mock_bulk_create
     ):
         """
-        Test ADM is missing and defaults to 1.
+        Test that no upsert is issued when no structure changed
 
         :param mock_get_sov_structures:
         :type mock_get_sov_structures:
         :param mock_bulk_get_or_create:
         :type mock_bulk_get_or_create:
-        :param mock_solar_system_filter:
-        :type mock_solar_system_filter:
-        :param mock_exclude:
-        :type mock_exclude:
         :param mock_bulk_create:
         :type mock_bulk_create:
-        :param mock_cache_set:
-        :type mock_cache_set:
-        :param mock_cache_get:
-        :type mock_cache_get:
         :return:
         :rtype:
         """
 
-        mock_cache_get.return_value = False
-        mock_cache_set.return_value = None
+        mock_bulk_get_or_create.return_value = {}
+        mock_get_sov_structures.return_value = iter(
+            [
+                self._esi_structure(structure_id=1001, adm=1.0),
+                self._esi_structure(structure_id=1002, adm=2.0),
+                self._esi_structure(structure_id=1003, adm=3.0),
+            ]
+        )
 
-        class DevRaiser:
-            def __getitem__(self, key):
-                raise AttributeError("simulated attribute error")
-
-        mock_get_sov_structures.return_value = [
-            {
-                "solar_system_id": 3020,
-                "alliance_id": 2020,
-                "sovereignty_hub": {"id": 1200},
-                "development": DevRaiser(),
-            }
-        ]
+        result = update_sov_structures(force_refresh=True)
 
-        mock_bulk_get_or_create.return_value = {
-            2020: Alliance(alliance_id=2020, name="A2020")
-        }
-        mock_solar_system_filter.return_value = [SolarSystem(id=3020)]
-        mock_bulk_create.return_value = None
-        mock_exclude.return_value.delete = MagicMock()
+        self.assertEqual(
+            result, {"created": 0, "updated": 0, "deleted": 0, "unchanged": 3}
+        )
+        mock_bulk_create.assert_not_called()
+        self.assertEqual(SovereigntyStructure.objects.count(), 3)
+        self.mock_update_dashboard_data_cache.assert_not_called()
+
+    @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
+    @patch("sovtimer.tasks.SovereigntyStructure.get_sov_structures_from_esi")
+    def test_retries_owner_that_failed_to_resolve(
+        self, mock_get_sov_structures, mock_bulk_get_or_create
+    ):
+        """
+        Test that structures written without their owner, because the alliance
+        lookup failed, get it on the next run with the same payload
+
+        :param mock_get_sov_structures:
+        :type mock_get_sov_structures:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+        alliance = Alliance.objects.create(alliance_id=2001, name="Test Alliance")
+        mock_get_sov_structures.side_effect = lambda **kwargs: iter(
+            [self._esi_structure(structure_id=1001, adm=1.0)]
+        )
+
+        # The alliance lookup fails on the first run
+        mock_bulk_get_or_create.return_value = {}
 
         update_sov_structures(force_refresh=False)
 
-        mock_bulk_create.assert_called_once()
-        created = mock_bulk_create.call_args[0][0]
-        self.assertEqual(len(created), 1)
-        self.assertEqual(created[0].vulnerability_occupancy_level, 1)
+        self.assertIsNone(SovereigntyStructure.objects.get(pk=1001).alliance_id)
+
+        # The second run, once the throttle expired, gets the same payload, and
+        # the lookup succeeds
+        cache.delete(Constants.TASK_STRUCTURE_CACHE_KEY)
+        mock_bulk_get_or_create.return_value = {2001: alliance}
+
+        result = update_sov_structures(force_refresh=False)
+
+        self.assertEqual(result["updated"], 1)
+        self.assertEqual(SovereigntyStructure.objects.get(pk=1001).alliance_id, 2001)
+
+
+class TestUpdateSovSystems(BaseTestCase):
+    """
+    Test the per-system sovereignty snapshots maintained by update_sov_structures
+    """
+
+    def setUp(self):
+        """
+        Set up the solar systems and an alliance
+
+        :return:
+        :rtype:
+        """
+
+        region = Region.objects.create(id=10000001, name="Region A")
+        constellation = Constellation.objects.create(
+            id=20000001, name="Constellation A", region=region
+        )
+
+        for solar_system_id in (30000001, 30000002, 30000003):
+            SolarSystem.objects.create(
+                id=solar_system_id,
+                name=f"System {solar_system_id}",
+                constellation=constellation,
+            )
+
+        self.alliance = Alliance.objects.create(alliance_id=2001, name="Alliance A")
+
+        patcher = patch("sovtimer.tasks.update_dashboard_data_cache")
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
-    @patch("sovtimer.tasks.cache.get")
-    @patch("sovtimer.tasks.cache.set")
-    @patch("sovtimer.tasks.SovereigntyStructure.objects.bulk_create")
-    @patch("sovtimer.tasks.SovereigntyStructure.objects.exclude")
-    @patch("sovtimer.tasks.SolarSystem.objects.filter")
     @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
     @patch("sovtimer.tasks.SovereigntyStructure.get_sov_structures_from_esi")
-    def test_development_multiplier_value_is_used_when_present(
-        self,
-        mock_get_sov_structures,
-        mock_bulk_get_or_create,
-        mock_solar_system_filter,
-        mock_exclude,
-        mock_bulk_create,
-        mock_cache_set,
-        mock_cache_get,
+    def test_syncs_system_snapshots(
+        self, mock_get_sov_structures, mock_bulk_get_or_create
     ):
         """
-        Test ADM is used when present.
+        Test that a snapshot is kept per claimed system, including the development
+        levels, and that vanished systems are deleted
 
         :param mock_get_sov_structures:
         :type mock_get_sov_structures:
         :param mock_bulk_get_or_create:
         :type mock_bulk_get_or_create:
-        :param mock_solar_system_filter:
-        :type mock_solar_system_filter:
-        :param mock_exclude:
-        :type mock_exclude:
-        :param mock_bulk_create:
-        :type mock_bulk_create:
-        :param mock_cache_set:
-        :type mock_cache_set:
-        :param mock_cache_get:
-        :type mock_cache_get:
         :return:
         :rtype:
         """
 
-        mock_cache_get.return_value = False
-        mock_cache_set.return_value = None
+        mock_bulk_get_or_create.return_value = {2001: self.alliance}
+        mock_get_sov_structures.return_value = iter(
+            [
+                SovStructureRecord(1001, 30000001, 2001, 4.5, None, None, True, 5),
+                SovStructureRecord(1002, 30000002, 2001, 1.2, None, None, False, 1),
+                # Not in the SDE
+                SovStructureRecord(1003, 39999999, 2001, 2.0, None, None),
+            ]
+        )
 
-        mock_get_sov_structures.return_value = [
-            {
-                "solar_system_id": 3021,
-                "alliance_id": 2021,
-                "sovereignty_hub": {"id": 1201},
-                "development": {"activity_defense_multiplier": 0.33},
-            }
-        ]
+        update_sov_structures(force_refresh=True)
 
-        mock_bulk_get_or_create.return_value = {
-            2021: Alliance(alliance_id=2021, name="A2021")
-        }
-        mock_solar_system_filter.return_value = [SolarSystem(id=3021)]
-        mock_bulk_create.return_value = None
-        mock_exclude.return_value.delete = MagicMock()
+        capital = SovereigntySystem.objects.get(pk=30000001)
 
-        update_sov_structures(force_refresh=False)
+        self.assertEqual(
+            set(SovereigntySystem.objects.values_list("pk", flat=True)),
+            {30000001, 30000002},
+        )
+        self.assertEqual(capital.alliance_id, 2001)
+        self.assertEqual(capital.vulnerability_occupancy_level, 4.5)
+        self.assertTrue(capital.is_capital_system)
+        self.assertEqual(capital.military_level, 5)
+
+        # The second system lost its sov, the third one was claimed
+        mock_get_sov_structures.return_value = iter(
+            [
+                SovStructureRecord(1001, 30000001, 2001, 5.0, None, None, True, 5),
+                SovStructureRecord(1004, 30000003, 2001, 1.0, None, None),
+            ]
+        )
 
-        mock_bulk_create.assert_called_once()
-        created = mock_bulk_create.call_args[0][0]
-        self.assertEqual(len(created), 1)
-        self.assertEqual(created[0].vulnerability_occupancy_level, 0.33)
+        update_sov_structures(force_refresh=True)
 
-    @patch("sovtimer.tasks.cache.get")
-    @patch("sovtimer.tasks.cache.set")
-    @patch("sovtimer.tasks.SovereigntyStructure.objects.bulk_create")
-    @patch("sovtimer.tasks.SovereigntyStructure.objects.exclude")
-    @patch("sovtimer.tasks.SolarSystem.objects.filter")
+        self.assertEqual(
+            dict(
+                SovereigntySystem.objects.values_list(
+                    "pk", "vulnerability_occupancy_level"
+                )
+            ),
+            {30000001: 5.0, 30000003: 1.0},
+        )
+
+    @patch("sovtimer.tasks.SYNC_DELETE_BATCH_SIZE", 1)
     @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
     @patch("sovtimer.tasks.SovereigntyStructure.get_sov_structures_from_esi")
-    def test_sovereignty_hub_not_dict_results_in_no_vulnerability_window(
-        self,
-        mock_get_sov_structures,
-        mock_bulk_get_or_create,
-        mock_solar_system_filter,
-        mock_exclude,
-        mock_bulk_create,
-        mock_cache_set,
-        mock_cache_get,
+    def test_vanished_structures_are_deleted_with_their_campaigns(
+        self, mock_get_sov_structures, mock_bulk_get_or_create
     ):
         """
-        Test sovereignty_hub is not dict results in no vulnerability_window being set.
+        Test that vanished structures are deleted in batches, along with their campaigns
 
         :param mock_get_sov_structures:
         :type mock_get_sov_structures:
         :param mock_bulk_get_or_create:
         :type mock_bulk_get_or_create:
-        :param mock_solar_system_filter:
-        :type mock_solar_system_filter:
-        :param mock_exclude:
-        :type mock_exclude:
-        :param mock_bulk_create:
-        :type mock_bulk_create:
-        :param mock_cache_set:
-        :type mock_cache_set:
-        :param mock_cache_get:
-        :type mock_cache_get:
         :return:
         :rtype:
         """
 
-        mock_cache_get.return_value = False
-        mock_cache_set.return_value = None
+        mock_bulk_get_or_create.return_value = {2001: self.alliance}
+        mock_get_sov_structures.return_value = iter(
+            [
+                SovStructureRecord(1001, 30000001, 2001, 1.0, None, None),
+                SovStructureRecord(1002, 30000002, 2001, 1.0, None, None),
+                SovStructureRecord(1003, 30000003, 2001, 1.0, None, None),
+            ]
+        )
 
-        class HubLike:
-            def __getitem__(self, key):
-                if key == "id":
-                    return 3040
-                raise KeyError(key)
-
-        # sovereignty_hub is subscriptable but not a dict -> isinstance(sov_hub, dict) is False
-        mock_get_sov_structures.return_value = [
-            {
-                "solar_system_id": 3040,
-                "alliance_id": 2040,
-                "sovereignty_hub": HubLike(),
-                "development": {"activity_defense_multiplier": 0.55},
-            }
-        ]
+        update_sov_structures(force_refresh=True)
 
-        mock_bulk_get_or_create.return_value = {
-            2040: Alliance(alliance_id=2040, name="A2040")
-        }
-        mock_solar_system_filter.return_value = [SolarSystem(id=3040)]
-        mock_bulk_create.return_value = None
-        mock_exclude.return_value.delete = MagicMock()
+        start_time = datetime(2030, 1, 1, tzinfo=dt_timezone.utc)
 
-        update_sov_structures(force_refresh=False)
+        for campaign_id, structure_id in ((1, 1001), (2, 1002), (3, 1003)):
+            Campaign.objects.create(
+                campaign_id=campaign_id,
+                start_time=start_time,
+                structure_id=structure_id,
+            )
 
-        mock_bulk_create.assert_called_once()
-        created = mock_bulk_create.call_args[0][0]
-        self.assertEqual(len(created), 1)
-        self.assertIsNone(created[0].vulnerable_start_time)
-        self.assertIsNone(created[0].vulnerable_end_time)
+        # Only the first structure is left, the others are deleted one per batch
+        mock_get_sov_structures.return_value = iter(
+            [SovStructureRecord(1001, 30000001, 2001, 1.0, None, None)]
+        )
+
+        sync_stats = update_sov_structures(force_refresh=True)
+
+        self.assertEqual(sync_stats["deleted"], 2)
+        self.assertEqual(
+            list(SovereigntyStructure.objects.values_list("pk", flat=True)), [1001]
+        )
+        self.assertEqual(list(Campaign.objects.values_list("pk", flat=True)), [1])
 
 
 class TestUpdateSovCampaigns(BaseTestCase):
@@ -520,6 +626,22 @@ class TestUpdateSovCampaigns(BaseTestCase):
     Test the update_sov_campaigns task
     """
 
+    @patch("sovtimer.tasks.Campaign.get_sov_campaigns_from_esi")
+    def test_skips_while_another_worker_syncs(self, mock_get_sov_campaigns):
+        """
+        Test that the campaigns aren't synced twice at the same time
+
+        :param mock_get_sov_campaigns:
+        :type mock_get_sov_campaigns:
+        :return:
+        :rtype:
+        """
+
+        with Lease(name="update_sov_campaigns", ttl=60):
+            self.assertIsNone(update_sov_campaigns(force_refresh=True))
+
+        mock_get_sov_campaigns.assert_not_called()
+
     @patch("sovtimer.tasks.Campaign.get_sov_campaigns_from_esi")
     @patch("sovtimer.tasks.Campaign.objects.bulk_create")
     @patch("sovtimer.tasks.Campaign.objects.all")
@@ -729,7 +851,7 @@ class TestUpdateSovCampaigns(BaseTestCase):
     @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
     @patch("sovtimer.tasks.Campaign.objects.bulk_create")
     @patch("sovtimer.tasks.Campaign.objects.all")
-    def test_handles_empty_list_from_esi_and_performs_empty_bulk_create(
+    def test_handles_empty_list_from_esi_and_performs_no_writes(
         self,
         mock_campaign_all,
         mock_bulk_create,
@@ -737,7 +859,7 @@ class TestUpdateSovCampaigns(BaseTestCase):
         mock_get_sov_campaigns,
     ):
         """
-        Test handles empty list from ESI and performs bulk create.
+        Test handles empty list from ESI and performs no database writes.
 
         :param mock_campaign_all:
         :type mock_campaign_all:
@@ -754,11 +876,10 @@ class TestUpdateSovCampaigns(BaseTestCase):
         mock_get_sov_campaigns.return_value = []
         empty_qs = MagicMock()
         empty_qs.__iter__.return_value = iter([])
-        empty_qs.delete = MagicMock()
         mock_campaign_all.return_value = empty_qs
         mock_bulk_get_or_create.return_value = {}
 
-        update_sov_campaigns(force_refresh=False)
+        result = update_sov_campaigns(force_refresh=False)
 
         mock_get_sov_campaigns.assert_called_once_with(
             use_etags=True, force_refresh=False
@@ -766,65 +887,227 @@ class TestUpdateSovCampaigns(BaseTestCase):
         mock_bulk_get_or_create.assert_called_once_with(
             alliance_ids=set(), force_refresh=False
         )
-        # Campaign.objects.all() is invoked once to read existing campaigns and
-        # once to delete them, so expect two calls.
-        self.assertEqual(mock_campaign_all.call_count, 2)
-        # bulk_create should be called with an empty list
-        mock_bulk_create.assert_called_once()
-        created_arg = mock_bulk_create.call_args[0][0]
-        self.assertIsInstance(created_arg, list)
-        self.assertEqual(len(created_arg), 0)
+        # Campaign.objects.all() is only invoked to read existing campaigns
+        mock_campaign_all.assert_called_once()
+        mock_bulk_create.assert_not_called()
+        self.assertEqual(
+            result, {"created": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        )
 
 
-class TestRunSovCampaignUpdates(BaseTestCase):
+class TestUpdateSovCampaignsDiffSync(BaseTestCase):
     """
-    Test the run_sov_campaign_updates task
+    Test the differential sync of the update_sov_campaigns task
     """
 
-    @patch("sovtimer.tasks.chain")
-    @patch("sovtimer.tasks.update_sov_structures.si")
-    @patch("sovtimer.tasks.update_sov_campaigns.si")
-    def test_runs_both_tasks_in_sequence(
-        self, mock_update_campaigns, mock_update_structures, mock_chain
+    @staticmethod
+    def _esi_campaign(
+        campaign_id: int, defender_score: float = 0.6, attackers_score: float = 0.4
+    ) -> MagicMock:
+        """
+        Build a campaign like it is returned from ESI
+
+        :param campaign_id:
+        :type campaign_id:
+        :param defender_score:
+        :type defender_score:
+        :param attackers_score:
+        :type attackers_score:
+        :return:
+        :rtype:
+        """
+
+        return MagicMock(
+            campaign_id=campaign_id,
+            defender_id=2001,
+            attackers_score=attackers_score,
+            defender_score=defender_score,
+            event_type=Campaign.Type.SOVHUB_DEFENSE,
+            start_time=datetime(2023, 1, 1, 12, 0, tzinfo=dt_timezone.utc),
+            structure_id=None,
+        )
+
+    def setUp(self):
+        """
+        Set up existing campaigns
+
+        :return:
+        :rtype:
+        """
+
+        for campaign_id in (1, 2, 3):
+            Campaign.objects.create(
+                campaign_id=campaign_id,
+                attackers_score=0.4,
+                defender_score=0.6,
+                event_type=Campaign.Type.SOVHUB_DEFENSE,
+                start_time=datetime(2023, 1, 1, 12, 0, tzinfo=dt_timezone.utc),
+                progress_current=0.6,
+                progress_previous=0.6,
+            )
+
+    @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
+    @patch("sovtimer.tasks.Campaign.get_sov_campaigns_from_esi")
+    def test_only_writes_changed_campaigns(
+        self, mock_get_sov_campaigns, mock_bulk_get_or_create
     ):
         """
-        Test that the task runs both update tasks in sequence with the correct priority
+        Test that only new, changed and vanished campaigns are written
 
-        :param mock_update_campaigns:
-        :type mock_update_campaigns:
-        :param mock_update_structures:
-        :type mock_update_structures:
-        :param mock_chain:
-        :type mock_chain:
+        :param mock_get_sov_campaigns:
+        :type mock_get_sov_campaigns:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
         :return:
         :rtype:
         """
 
-        run_sov_campaign_updates()
+        mock_bulk_get_or_create.return_value = {}
+        mock_get_sov_campaigns.return_value = [
+            # Unchanged
+            self._esi_campaign(campaign_id=1),
+            # Changed
+            self._esi_campaign(campaign_id=2, defender_score=0.5, attackers_score=0.5),
+            # New, campaign 3 vanished
+            self._esi_campaign(campaign_id=4),
+        ]
 
-        mock_update_structures.assert_called_once_with(
-            use_etags=True, force_refresh=False
+        result = update_sov_campaigns(force_refresh=False)
+
+        self.assertEqual(
+            result, {"created": 1, "updated": 1, "deleted": 1, "unchanged": 1}
         )
-        mock_update_campaigns.assert_called_once_with(
-            use_etags=True, force_refresh=False
+        self.assertEqual(
+            set(Campaign.objects.values_list("campaign_id", flat=True)), {1, 2, 4}
         )
-        mock_update_structures.return_value.set.assert_called_once_with(priority=6)
-        mock_update_campaigns.return_value.set.assert_called_once_with(priority=6)
-        mock_chain.return_value.apply_async.assert_called_once()
 
-    @patch("sovtimer.tasks.chain")
-    @patch("sovtimer.tasks.update_sov_structures.si")
-    @patch("sovtimer.tasks.update_sov_campaigns.si")
-    def test_handles_no_priority_set(
-        self, mock_update_campaigns, mock_update_structures, mock_chain
+        changed_campaign = Campaign.objects.get(campaign_id=2)
+        self.assertEqual(changed_campaign.defender_score, 0.5)
+        self.assertEqual(changed_campaign.progress_current, 0.5)
+        self.assertEqual(changed_campaign.progress_previous, 0.6)
+
+    @patch("sovtimer.tasks.Campaign.objects.bulk_create")
+    @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
+    @patch("sovtimer.tasks.Campaign.get_sov_campaigns_from_esi")
+    def test_skips_writes_when_nothing_changed(
+        self, mock_get_sov_campaigns, mock_bulk_get_or_create, mock_bulk_create
+    ):
+        """
+        Test that no upsert is issued when no campaign changed
+
+        :param mock_get_sov_campaigns:
+        :type mock_get_sov_campaigns:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
+        :param mock_bulk_create:
+        :type mock_bulk_create:
+        :return:
+        :rtype:
+        """
+
+        mock_bulk_get_or_create.return_value = {}
+        mock_get_sov_campaigns.return_value = [
+            self._esi_campaign(campaign_id=campaign_id) for campaign_id in (1, 2, 3)
+        ]
+
+        result = update_sov_campaigns(force_refresh=False)
+
+        self.assertEqual(
+            result, {"created": 0, "updated": 0, "deleted": 0, "unchanged": 3}
+        )
+        mock_bulk_create.assert_not_called()
+        self.assertEqual(Campaign.objects.count(), 3)
+
+    @patch("sovtimer.tasks.payload_hash", return_value="same-payload")
+    @patch("sovtimer.tasks.Campaign.objects.all")
+    @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
+    @patch("sovtimer.tasks.Campaign.get_sov_campaigns_from_esi")
+    def test_skips_db_work_when_payload_is_unchanged(
+        self,
+        mock_get_sov_campaigns,
+        mock_bulk_get_or_create,
+        mock_campaign_all,
+        mock_payload_hash,  # pylint: disable=unused-argument
     ):
         """
-        Test that the task runs both update tasks in sequence even if no priority is set
+        Test that the same payload is only processed once, unless refresh is forced
 
-        :param mock_update_campaigns:
-        :type mock_update_campaigns:
-        :param mock_update_structures:
-        :type mock_update_structures:
+        :param mock_get_sov_campaigns:
+        :type mock_get_sov_campaigns:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
+        :param mock_campaign_all:
+        :type mock_campaign_all:
+        :param mock_payload_hash:
+        :type mock_payload_hash:
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+        mock_bulk_get_or_create.return_value = {}
+        mock_campaign_all.return_value = []
+        mock_get_sov_campaigns.return_value = []
+
+        self.assertIsNotNone(update_sov_campaigns(force_refresh=False))
+        self.assertIsNone(update_sov_campaigns(force_refresh=False))
+        self.assertEqual(mock_campaign_all.call_count, 1)
+
+        self.assertIsNotNone(update_sov_campaigns(force_refresh=True))
+        self.assertEqual(mock_campaign_all.call_count, 2)
+
+    @patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi")
+    @patch("sovtimer.tasks.Campaign.get_sov_campaigns_from_esi")
+    def test_processes_payload_again_when_defender_not_resolved(
+        self, mock_get_sov_campaigns, mock_bulk_get_or_create
+    ):
+        """
+        Test that an unchanged payload isn't skipped while one of its defenders
+        couldn't be resolved, so the next run tries again
+
+        :param mock_get_sov_campaigns:
+        :type mock_get_sov_campaigns:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+        mock_get_sov_campaigns.return_value = [self._esi_campaign(campaign_id=1)]
+
+        # The alliance lookup fails on the first run
+        mock_bulk_get_or_create.return_value = {}
+
+        self.assertIsNotNone(update_sov_campaigns(force_refresh=False))
+
+        # And succeeds on the second run, which isn't skipped
+        mock_bulk_get_or_create.return_value = {
+            2001: Alliance(alliance_id=2001, name="Test Alliance")
+        }
+
+        self.assertIsNotNone(update_sov_campaigns(force_refresh=False))
+        self.assertEqual(mock_bulk_get_or_create.call_count, 2)
+
+        # Now that all defenders are resolved, the same payload is skipped
+        self.assertIsNone(update_sov_campaigns(force_refresh=False))
+        self.assertEqual(mock_bulk_get_or_create.call_count, 2)
+
+
+class TestRunSovCampaignUpdates(BaseTestCase):
+    """
+    Test the run_sov_campaign_updates task
+    """
+
+    @patch("sovtimer.tasks.chain")
+    @patch("sovtimer.tasks.update_sov_structures_and_campaigns.si")
+    def test_runs_the_update_with_priority(self, mock_update, mock_chain):
+        """
+        Test that the task runs the update of structures and campaigns with the
+        correct priority
+
+        :param mock_update:
+        :type mock_update:
         :param mock_chain:
         :type mock_chain:
         :return:
@@ -833,28 +1116,22 @@ class TestRunSovCampaignUpdates(BaseTestCase):
 
         run_sov_campaign_updates()
 
-        mock_update_structures.return_value.set.assert_called_once_with(priority=6)
-        mock_update_campaigns.return_value.set.assert_called_once_with(priority=6)
+        mock_update.assert_called_once_with(use_etags=True, force_refresh=False)
+        mock_update.return_value.set.assert_called_once_with(priority=6)
+        mock_chain.assert_called_once_with(mock_update.return_value.set.return_value)
         mock_chain.return_value.apply_async.assert_called_once()
 
     @patch("sovtimer.tasks.logger.info")
     @patch("sovtimer.tasks.chain")
-    @patch("sovtimer.tasks.update_sov_structures.si")
-    @patch("sovtimer.tasks.update_sov_campaigns.si")
+    @patch("sovtimer.tasks.update_sov_structures_and_campaigns.si")
     def test_logs_start_of_update_process(
-        self,
-        mock_update_campaigns,
-        mock_update_structures,
-        mock_chain,
-        mock_logger_info,
+        self, mock_update, mock_chain, mock_logger_info
     ):
         """
         Test that the task logs the start of the update process
 
-        :param mock_update_campaigns:
-        :type mock_update_campaigns:
-        :param mock_update_structures:
-        :type mock_update_structures:
+        :param mock_update:
+        :type mock_update:
         :param mock_chain:
         :type mock_chain:
         :param mock_logger_info:
@@ -869,3 +1146,291 @@ class TestRunSovCampaignUpdates(BaseTestCase):
             msg="Updating sovereignty structures and campaigns from ESI…"
         )
         mock_chain.return_value.apply_async.assert_called_once()
+
+    @override_settings(SOVTIMER_ADAPTIVE_SCHEDULING=True)
+    @patch("sovtimer.tasks.chain")
+    @patch("sovtimer.tasks.schedule_sov_campaign_updates.si")
+    @patch("sovtimer.tasks.update_sov_structures_and_campaigns.si")
+    def test_schedules_next_run_with_adaptive_scheduling(
+        self, mock_update, mock_schedule, mock_chain
+    ):
+        """
+        Test that the chain ends with scheduling the next run when adaptive
+        scheduling is enabled
+
+        :param mock_update:
+        :type mock_update:
+        :param mock_schedule:
+        :type mock_schedule:
+        :param mock_chain:
+        :type mock_chain:
+        :return:
+        :rtype:
+        """
+
+        run_sov_campaign_updates()
+
+        mock_chain.assert_called_once_with(
+            mock_update.return_value.set.return_value,
+            mock_schedule.return_value.set.return_value,
+        )
+        mock_schedule.return_value.set.assert_called_once_with(priority=6)
+
+    @patch("sovtimer.tasks.chain")
+    @patch("sovtimer.tasks.schedule_sov_campaign_updates.si")
+    @patch("sovtimer.tasks.update_sov_structures_and_campaigns.si")
+    def test_does_not_schedule_next_run_by_default(
+        self, mock_update, mock_schedule, mock_chain
+    ):
+        """
+        Test that the beat schedule alone runs the updates by default
+
+        :param mock_update:
+        :type mock_update:
+        :param mock_schedule:
+        :type mock_schedule:
+        :param mock_chain:
+        :type mock_chain:
+        :return:
+        :rtype:
+        """
+
+        run_sov_campaign_updates()
+
+        mock_schedule.assert_not_called()
+        self.assertEqual(len(mock_chain.call_args.args), 1)
+
+
+@patch("sovtimer.tasks.update_dashboard_data_cache")
+@patch("sovtimer.tasks.Alliance.bulk_get_or_create_from_esi", return_value={})
+@patch("sovtimer.tasks.Campaign.get_sov_campaigns_from_esi")
+@patch("sovtimer.tasks.SovereigntyStructure.get_sov_structures_from_esi")
+class TestUpdateSovStructuresAndCampaigns(BaseTestCase):
+    """
+    Test the update_sov_structures_and_campaigns task
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, the throttle, the leases and the payload hashes are
+        kept in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    @staticmethod
+    def _esi_campaign(campaign_id: int, structure_id: int) -> MagicMock:
+        """
+        Build a campaign like it is returned from ESI
+
+        :param campaign_id:
+        :type campaign_id:
+        :param structure_id:
+        :type structure_id:
+        :return:
+        :rtype:
+        """
+
+        return MagicMock(
+            campaign_id=campaign_id,
+            defender_id=2001,
+            attackers_score=0.4,
+            defender_score=0.6,
+            event_type=Campaign.Type.SOVHUB_DEFENSE,
+            start_time=datetime(2023, 1, 1, 12, 0, tzinfo=dt_timezone.utc),
+            structure_id=structure_id,
+        )
+
+    def test_fetches_concurrently_and_writes_structures_first(
+        self,
+        mock_get_sov_structures,
+        mock_get_sov_campaigns,
+        mock_bulk_get_or_create,
+        mock_update_dashboard_data_cache,
+    ):
+        """
+        Test that both ESI requests are in flight at the same time, and that a
+        campaign of a new structure is written after the structure
+
+        :param mock_get_sov_structures:
+        :type mock_get_sov_structures:
+        :param mock_get_sov_campaigns:
+        :type mock_get_sov_campaigns:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
+        :param mock_update_dashboard_data_cache:
+        :type mock_update_dashboard_data_cache:
+        :return:
+        :rtype:
+        """
+
+        # Neither request returns before the other one started
+        barrier = threading.Barrier(parties=2, timeout=5)
+
+        def fetch(structures: list) -> Callable:
+            def wait_for_the_other_request(**kwargs):
+                barrier.wait()
+
+                return structures
+
+            return wait_for_the_other_request
+
+        mock_get_sov_structures.side_effect = fetch(
+            iter([SovStructureRecord(1001, 30000001, None, 1.0, None, None)])
+        )
+        mock_get_sov_campaigns.side_effect = fetch(
+            [self._esi_campaign(campaign_id=1, structure_id=1001)]
+        )
+
+        sync_stats = update_sov_structures_and_campaigns()
+
+        self.assertEqual(sync_stats["structures"]["created"], 1)
+        self.assertEqual(sync_stats["campaigns"]["created"], 1)
+        self.assertEqual(Campaign.objects.get(pk=1).structure_id, 1001)
+        mock_get_sov_structures.assert_called_once_with(
+            use_etags=True, force_refresh=False
+        )
+        mock_get_sov_campaigns.assert_called_once_with(
+            use_etags=True, force_refresh=False
+        )
+
+    def test_only_fetches_campaigns_while_structures_are_throttled(
+        self,
+        mock_get_sov_structures,
+        mock_get_sov_campaigns,
+        mock_bulk_get_or_create,
+        mock_update_dashboard_data_cache,
+    ):
+        """
+        Test that the structures are throttled as in update_sov_structures
+
+        :param mock_get_sov_structures:
+        :type mock_get_sov_structures:
+        :param mock_get_sov_campaigns:
+        :type mock_get_sov_campaigns:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
+        :param mock_update_dashboard_data_cache:
+        :type mock_update_dashboard_data_cache:
+        :return:
+        :rtype:
+        """
+
+        cache.set(key=Constants.TASK_STRUCTURE_CACHE_KEY, value=True, timeout=60)
+        mock_get_sov_campaigns.return_value = [
+            self._esi_campaign(campaign_id=1, structure_id=None)
+        ]
+
+        sync_stats = update_sov_structures_and_campaigns()
+
+        mock_get_sov_structures.assert_not_called()
+        self.assertIsNone(sync_stats["structures"])
+        self.assertEqual(sync_stats["campaigns"]["created"], 1)
+
+    def test_skips_what_another_worker_syncs(
+        self,
+        mock_get_sov_structures,
+        mock_get_sov_campaigns,
+        mock_bulk_get_or_create,
+        mock_update_dashboard_data_cache,
+    ):
+        """
+        Test that the leases of the single update tasks are respected
+
+        :param mock_get_sov_structures:
+        :type mock_get_sov_structures:
+        :param mock_get_sov_campaigns:
+        :type mock_get_sov_campaigns:
+        :param mock_bulk_get_or_create:
+        :type mock_bulk_get_or_create:
+        :param mock_update_dashboard_data_cache:
+        :type mock_update_dashboard_data_cache:
+        :return:
+        :rtype:
+        """
+
+        mock_get_sov_structures.return_value = None
+
+        with Lease(name="update_sov_campaigns", ttl=60):
+            sync_stats = update_sov_structures_and_campaigns()
+
+        mock_get_sov_structures.assert_called_once()
+        mock_get_sov_campaigns.assert_not_called()
+        self.assertEqual(sync_stats, {"structures": None, "campaigns": None})
+
+        # The throttle wasn't claimed while the structures lease is held
+        cache.delete(Constants.TASK_STRUCTURE_CACHE_KEY)
+
+        with Lease(name="update_sov_structures", ttl=60):
+            update_sov_structures_and_campaigns()
+
+        mock_get_sov_structures.assert_called_once()
+        mock_get_sov_campaigns.assert_called_once()
+        self.assertFalse(cache.get(Constants.TASK_STRUCTURE_CACHE_KEY))
+
+
+@patch("sovtimer.tasks.run_sov_campaign_updates.apply_async")
+@patch("sovtimer.tasks.next_run_countdown", return_value=127.5)
+class TestScheduleSovCampaignUpdates(BaseTestCase):
+    """
+    Test the schedule_sov_campaign_updates task
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, the scheduled run is marked in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_schedules_next_run_after_the_esi_data_expires(
+        self, mock_next_run_countdown, mock_apply_async
+    ):
+        """
+        Test that the next run is scheduled with the countdown to the ESI expiry
+
+        :param mock_next_run_countdown:
+        :type mock_next_run_countdown:
+        :param mock_apply_async:
+        :type mock_apply_async:
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(schedule_sov_campaign_updates(), 127.5)
+
+        mock_next_run_countdown.assert_called_once_with(
+            operation_ids=("GetSovereigntySystems", "GetSovereigntyCampaigns")
+        )
+        mock_apply_async.assert_called_once_with(countdown=127.5, priority=6)
+
+    def test_schedules_only_one_run_at_a_time(
+        self, mock_next_run_countdown, mock_apply_async
+    ):
+        """
+        Test that no other run is scheduled while one is pending
+
+        :param mock_next_run_countdown:
+        :type mock_next_run_countdown:
+        :param mock_apply_async:
+        :type mock_apply_async:
+        :return:
+        :rtype:
+        """
+
+        schedule_sov_campaign_updates()
+
+        self.assertIsNone(schedule_sov_campaign_updates())
+        mock_apply_async.assert_called_once()
+
+        # Once the scheduled run is due, it schedules the next one
+        cache.delete(Constants.TASK_NEXT_RUN_CACHE_KEY)
+
+        self.assertEqual(schedule_sov_campaign_updates(), 127.5)
+        self.assertEqual(mock_apply_async.call_count, 2)
@@ -6,37 +6,45 @@ Unit tests for sovtimer views
 from datetime import datetime
 from datetime import timezone as dt_timezone
 from http import HTTPStatus
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 # Django
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 from django.utils.timezone import now
 
 # AA Sovereignty Timer
 from sovtimer.tests import BaseTestCase
-from sovtimer.views import _fmt_float_to_percentage
 
 
-class TestHelperFmtFloatToPercentage(BaseTestCase):
+def _campaign_row(**values) -> dict:
     """
-    Test the _fmt_float_to_percentage helper function
-    """
-
-    def test_fmt_float_to_percentage(self):
-        """
-        Test the _fmt_float_to_percentage function
+    Get a campaign row as fetched by build_dashboard_data
 
-        :return:
-        :rtype:
-        """
+    :param values: Values overriding the defaults
+    :type values:
+    :return:
+    :rtype:
+    """
 
-        self.assertEqual(_fmt_float_to_percentage(0.0), "00%")
-        self.assertEqual(_fmt_float_to_percentage(0.01), "01%")
-        self.assertEqual(_fmt_float_to_percentage(0.1), "10%")
-        self.assertEqual(_fmt_float_to_percentage(0.1234), "12%")
-        self.assertEqual(_fmt_float_to_percentage(0.5678), "57%")
-        self.assertEqual(_fmt_float_to_percentage(1.0), "100%")
+    return {
+        "campaign_id": 1,
+        "start_time": datetime(2023, 10, 1, 12, 0, tzinfo=dt_timezone.utc),
+        "progress_current": 0.3,
+        "progress_previous": 0.3,
+        "solar_system_id": 30000001,
+        "solar_system_name": "System A",
+        "constellation_id": 20000001,
+        "constellation_name": "Constellation A",
+        "region_id": 10000001,
+        "region_name": "Region A",
+        "defender_id": 3001,
+        "defender_name": "Alliance A",
+        "adm": 1.0,
+        **values,
+    }
 
 
 class TestDashboard(BaseTestCase):
@@ -88,88 +96,56 @@ class TestDashboardData(BaseTestCase):
     Test the dashboard_data view
     """
 
-    @patch("sovtimer.views.Campaign.objects.select_related")
-    def test_returns_empty_response_when_no_campaign_system_ids(
-        self, mock_campaign_select_related
-    ):
+    def setUp(self):
         """
-        Test that the dashboard_data view returns an empty response when no campaign system IDs
+        Set up the test case, the dashboard data is served from the cache
 
-        :param mock_campaign_select_related:
-        :type mock_campaign_select_related:
         :return:
         :rtype:
         """
 
-        qs_mock = MagicMock()
-        qs_mock.values_list.return_value = []
-        qs_mock.__iter__.return_value = iter([])
+        cache.clear()
+
+    @patch("sovtimer.helper.dashboard.Campaign.objects.filter")
+    def test_returns_empty_response_when_no_campaigns(self, mock_campaign_filter):
+        """
+        Test that the dashboard_data view returns an empty response when there are no campaigns
+
+        :param mock_campaign_filter:
+        :type mock_campaign_filter:
+        :return:
+        :rtype:
+        """
 
-        mock_campaign_select_related.return_value.filter.return_value = qs_mock
+        mock_campaign_filter.return_value.values.return_value = []
 
         response = self.client.get(reverse("sovtimer:dashboard_data"))
 
         self.assertEqual(response.status_code, HTTPStatus.OK)
         self.assertEqual(response.json(), [])
 
-    @patch("sovtimer.views.Campaign.Type")
-    @patch("sovtimer.views.Campaign.objects.select_related")
-    @patch("sovtimer.views.SovereigntyStructure.objects.filter")
-    def test_dashboard_data_includes_active_campaigns(
-        self, mock_structure_filter, mock_campaign_select_related, mock_campaign_type
-    ):
+    @patch("sovtimer.helper.dashboard.Campaign.objects.filter")
+    def test_dashboard_data_includes_active_campaigns(self, mock_campaign_filter):
         """
         Test that the dashboard_data view includes active campaigns
 
-        :param mock_structure_filter:
-        :type mock_structure_filter:
-        :param mock_campaign_select_related:
-        :type mock_campaign_select_related:
-        :param mock_campaign_type:
-        :type mock_campaign_type:
+        :param mock_campaign_filter:
+        :type mock_campaign_filter:
         :return:
         :rtype:
         """
 
-        mock_campaign_type.return_value = MagicMock(label="active")
-
-        mock_campaign = MagicMock()
-        structure = MagicMock()
-        structure.solar_system_id = 1
-
-        alliance = MagicMock()
-        alliance.name = "Alliance A"
-        alliance.alliance_id = 111
-        structure.alliance = alliance
-
-        solar_system = MagicMock()
-        solar_system.name = "System A"
-
-        constellation = MagicMock()
-        constellation.name = "Constellation A"
-        constellation.pk = 7002
-        region = MagicMock()
-        region.name = "Region A"
-        region.pk = 7001
-        constellation.region = region
-        solar_system.constellation = constellation
-        structure.solar_system = solar_system
-
-        mock_campaign.structure = structure
-        mock_campaign.start_time = now()
-        mock_campaign.progress_previous = 0.2
-        mock_campaign.progress_current = 0.5
-        mock_campaign.event_type = 1
-
-        qs_mock = MagicMock()
-        qs_mock.__iter__.return_value = iter([mock_campaign])
-        qs_mock.values_list.return_value = [1]
-        mock_campaign_select_related.return_value.filter.return_value = qs_mock
-
-        mock_structure = MagicMock()
-        mock_structure.solar_system_id = 1
-        mock_structure.vulnerability_occupancy_level = 1.5
-        mock_structure_filter.return_value = [mock_structure]
+        mock_campaign_filter.return_value.values.return_value = [
+            _campaign_row(
+                campaign_id=1,
+                solar_system_name="System A",
+                defender_name="Alliance A",
+                adm=1.5,
+                start_time=now(),
+                progress_previous=0.2,
+                progress_current=0.5,
+            )
+        ]
 
         response = self.client.get(reverse("sovtimer:dashboard_data"))
 
@@ -177,62 +153,25 @@ class TestDashboardData(BaseTestCase):
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["solar_system"]["sort"], "System A")
         self.assertEqual(response.json()[0]["defender"]["sort"], "Alliance A")
+        self.assertEqual(response.json()[0]["adm"], "1.5")
         self.assertEqual(response.json()[0]["campaign_status"], "active")
 
-    @patch("sovtimer.views.Campaign.Type")
-    @patch("sovtimer.views.Campaign.objects.select_related")
-    @patch("sovtimer.views.SovereigntyStructure.objects.filter")
+    @patch("sovtimer.helper.dashboard.Campaign.objects.filter")
     def test_dashboard_data_handles_missing_vulnerability_levels(
-        self, mock_structure_filter, mock_campaign_select_related, mock_campaign_type
+        self, mock_campaign_filter
     ):
         """
         Test that the dashboard_data view handles missing vulnerability levels
 
-        :param mock_structure_filter:
-        :type mock_structure_filter:
-        :param mock_campaign_select_related:
-        :type mock_campaign_select_related:
-        :param mock_campaign_type:
-        :type mock_campaign_type:
+        :param mock_campaign_filter:
+        :type mock_campaign_filter:
         :return:
         :rtype:
         """
 
-        mock_campaign_type.return_value = MagicMock(label="other")
-
-        mock_campaign = MagicMock()
-        structure = MagicMock()
-        structure.solar_system_id = 1
-
-        alliance = MagicMock()
-        alliance.name = "Alliance B"
-        alliance.alliance_id = 222
-        structure.alliance = alliance
-
-        solar_system = MagicMock()
-        solar_system.name = "System B"
-
-        constellation = MagicMock()
-        constellation.name = "Constellation B"
-        region = MagicMock()
-        region.name = "Region B"
-        region.pk = 7003
-        constellation.region = region
-        solar_system.constellation = constellation
-        structure.solar_system = solar_system
-
-        mock_campaign.structure = structure
-        mock_campaign.start_time = now()
-        mock_campaign.progress_previous = 0.3
-        mock_campaign.progress_current = 0.3
-        mock_campaign.event_type = 2
-
-        qs_mock = MagicMock()
-        qs_mock.__iter__.return_value = iter([mock_campaign])
-        qs_mock.values_list.return_value = [1]
-        mock_campaign_select_related.return_value.filter.return_value = qs_mock
-
-        mock_structure_filter.return_value = []
+        mock_campaign_filter.return_value.values.return_value = [
+            _campaign_row(campaign_id=2, adm=None, start_time=now())
+        ]
 
         response = self.client.get(reverse("sovtimer:dashboard_data"))
 
@@ -240,73 +179,29 @@ class TestDashboardData(BaseTestCase):
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["adm"], "1.0")
 
-    @patch("sovtimer.views.Campaign.Type")
-    @patch("sovtimer.views.timezone.now")
-    @patch("sovtimer.views.Campaign.objects.select_related")
-    @patch("sovtimer.views.SovereigntyStructure.objects.filter")
+    @patch("sovtimer.helper.dashboard.timezone.now")
+    @patch("sovtimer.helper.dashboard.Campaign.objects.filter")
     def test_campaign_status_is_upcoming_when_within_timeframe(
-        self,
-        mock_structure_filter,
-        mock_campaign_select_related,
-        mock_now,
-        mock_campaign_type,
+        self, mock_campaign_filter, mock_now
     ):
         """
         Test that the campaign status is "upcoming" when the current time is within 4 hours of the campaign start time
 
-        :param mock_structure_filter:
-        :type mock_structure_filter:
-        :param mock_campaign_select_related:
-        :type mock_campaign_select_related:
+        :param mock_campaign_filter:
+        :type mock_campaign_filter:
         :param mock_now:
         :type mock_now:
-        :param mock_campaign_type:
-        :type mock_campaign_type:
         :return:
         :rtype:
         """
 
-        mock_campaign_type.return_value = MagicMock(label="upcoming")
         mock_now.return_value = datetime(2023, 10, 1, 12, 0, tzinfo=dt_timezone.utc)
-
-        mock_campaign = MagicMock()
-        mock_campaign.start_time = datetime(2023, 10, 1, 15, 0, tzinfo=dt_timezone.utc)
-        mock_campaign.progress_previous = 0.1
-        mock_campaign.progress_current = 0.2
-        mock_campaign.event_type = 1
-
-        structure = MagicMock()
-        structure.solar_system_id = 1
-
-        alliance = MagicMock()
-        alliance.name = "Alliance U"
-        alliance.alliance_id = 333
-        structure.alliance = alliance
-
-        solar_system = MagicMock()
-        solar_system.name = "System U"
-
-        constellation = MagicMock()
-        constellation.name = "Constellation U"
-        constellation.pk = 7004
-        region = MagicMock()
-        region.name = "Region U"
-        region.pk = 7005
-        constellation.region = region
-        solar_system.constellation = constellation
-        structure.solar_system = solar_system
-
-        mock_campaign.structure = structure
-
-        qs_mock = MagicMock()
-        qs_mock.__iter__.return_value = iter([mock_campaign])
-        qs_mock.values_list.return_value = [1]
-        mock_campaign_select_related.return_value.filter.return_value = qs_mock
-
-        mock_structure = MagicMock()
-        mock_structure.solar_system_id = 1
-        mock_structure.vulnerability_occupancy_level = 1.5
-        mock_structure_filter.return_value = [mock_structure]
+        mock_campaign_filter.return_value.values.return_value = [
+            _campaign_row(
+                campaign_id=3,
+                start_time=datetime(2023, 10, 1, 15, 0, tzinfo=dt_timezone.utc),
+            )
+        ]
 
         response = self.client.get(reverse("sovtimer:dashboard_data"))
 
@@ -314,67 +209,401 @@ class TestDashboardData(BaseTestCase):
         self.assertEqual(len(response.json()), 1)
         self.assertEqual(response.json()[0]["campaign_status"], "upcoming")
 
-    @patch("sovtimer.views.Campaign.Type")
-    @patch("sovtimer.views.Campaign.objects.select_related")
-    @patch("sovtimer.views.SovereigntyStructure.objects.filter")
+    @patch("sovtimer.helper.dashboard.Campaign.objects.filter")
     def test_sets_attackers_progress_when_previous_progress_is_higher(
-        self, mock_structure_filter, mock_campaign_select_related, mock_campaign_type
+        self, mock_campaign_filter
     ):
         """
         Test that the dashboard_data view sets "Attackers making progress" when the previous progress is higher than the current progress
 
-        :param mock_structure_filter:
-        :type mock_structure_filter:
-        :param mock_campaign_select_related:
-        :type mock_campaign_select_related:
-        :param mock_campaign_type:
-        :type mock_campaign_type:
+        :param mock_campaign_filter:
+        :type mock_campaign_filter:
         :return:
         :rtype:
         """
 
-        mock_campaign_type.return_value = MagicMock(label="active")
+        mock_campaign_filter.return_value.values.return_value = [
+            _campaign_row(
+                campaign_id=4,
+                start_time=now(),
+                progress_previous=0.6,
+                progress_current=0.4,
+            )
+        ]
 
-        mock_campaign = MagicMock()
-        mock_campaign.progress_previous = 0.6
-        mock_campaign.progress_current = 0.4
+        response = self.client.get(reverse("sovtimer:dashboard_data"))
 
-        structure = MagicMock()
-        structure.solar_system_id = 1
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(len(response.json()), 1)
+        self.assertIn(
+            "Attackers making progress",
+            response.json()[0]["campaign_progress"]["display"],
+        )
 
-        alliance = MagicMock()
-        alliance.name = "Alliance X"
-        alliance.alliance_id = 444
-        structure.alliance = alliance
+    @patch("sovtimer.views.get_dashboard_data")
+    def test_returns_etag_and_not_modified_for_matching_etag(
+        self, mock_get_dashboard_data
+    ):
+        """
+        Test that the dashboard_data view sends an ETag and answers a request with
+        a matching If-None-Match header with 304 Not Modified
 
-        solar_system = MagicMock()
-        solar_system.name = "System X"
+        :param mock_get_dashboard_data:
+        :type mock_get_dashboard_data:
+        :return:
+        :rtype:
+        """
 
-        constellation = MagicMock()
-        constellation.name = "Constellation X"
-        region = MagicMock()
-        region.name = "Region X"
-        region.pk = 7006
-        constellation.region = region
-        solar_system.constellation = constellation
-        structure.solar_system = solar_system
+        mock_get_dashboard_data.return_value = {"version": "v1", "campaigns": []}
 
-        mock_campaign.structure = structure
-        mock_campaign.start_time = now()
-        mock_campaign.event_type = 1
+        response = self.client.get(reverse("sovtimer:dashboard_data"))
+        etag = response["ETag"]
 
-        qs_mock = MagicMock()
-        qs_mock.__iter__.return_value = iter([mock_campaign])
-        qs_mock.values_list.return_value = [1]
-        mock_campaign_select_related.return_value.filter.return_value = qs_mock
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("no-cache", response["Cache-Control"])
 
-        mock_structure_filter.return_value = []
+        response = self.client.get(
+            reverse("sovtimer:dashboard_data"), HTTP_IF_NONE_MATCH=etag
+        )
 
-        response = self.client.get(reverse("sovtimer:dashboard_data"))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    @patch("sovtimer.views.get_dashboard_data")
+    def test_returns_data_when_etag_is_outdated(self, mock_get_dashboard_data):
+        """
+        Test that the dashboard_data view sends the data when the ETag of the
+        client is outdated
+
+        :param mock_get_dashboard_data:
+        :type mock_get_dashboard_data:
+        :return:
+        :rtype:
+        """
+
+        mock_get_dashboard_data.return_value = {"version": "v1", "campaigns": []}
+
+        etag = self.client.get(reverse("sovtimer:dashboard_data"))["ETag"]
+
+        mock_get_dashboard_data.return_value = {"version": "v2", "campaigns": []}
+
+        response = self.client.get(
+            reverse("sovtimer:dashboard_data"), HTTP_IF_NONE_MATCH=etag
+        )
 
         self.assertEqual(response.status_code, HTTPStatus.OK)
-        self.assertEqual(len(response.json()), 1)
-        self.assertIn(
-            "Attackers making progress",
-            response.json()[0]["campaign_progress"]["display"],
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json(), [])
+
+    @patch("sovtimer.views.get_dashboard_data")
+    def test_etag_depends_on_the_language(self, mock_get_dashboard_data):
+        """
+        Test that a client switching its language doesn't get a 304 for the rows
+        in the previous language
+
+        :param mock_get_dashboard_data:
+        :type mock_get_dashboard_data:
+        :return:
+        :rtype:
+        """
+
+        mock_get_dashboard_data.return_value = {
+            "version": "v1",
+            "sync_version": 1,
+            "campaigns": [],
+            "campaign_data": [],
+        }
+
+        for data in ({}, {"since": "1:100"}):
+            with self.subTest(data=data):
+                etag = self.client.get(
+                    reverse("sovtimer:dashboard_data"),
+                    data=data,
+                    HTTP_ACCEPT_LANGUAGE="en",
+                )["ETag"]
+
+                response = self.client.get(
+                    reverse("sovtimer:dashboard_data"),
+                    data=data,
+                    HTTP_ACCEPT_LANGUAGE="de",
+                    HTTP_IF_NONE_MATCH=etag,
+                )
+
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertNotEqual(response["ETag"], etag)
+
+                response = self.client.get(
+                    reverse("sovtimer:dashboard_data"),
+                    data=data,
+                    HTTP_ACCEPT_LANGUAGE="en",
+                    HTTP_IF_NONE_MATCH=etag,
+                )
+
+                self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    @patch("sovtimer.views.dashboard_changes")
+    def test_returns_changes_since_token(self, mock_dashboard_changes):
+        """
+        Test that the dashboard_data view returns the changes since a token
+
+        :param mock_dashboard_changes:
+        :type mock_dashboard_changes:
+        :return:
+        :rtype:
+        """
+
+        changes = {"full": False, "token": "2:100", "changed": [], "removed": [7]}
+        mock_dashboard_changes.return_value = changes
+
+        response = self.client.get(
+            reverse("sovtimer:dashboard_data"), data={"since": "1:100"}
         )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json(), changes)
+        mock_dashboard_changes.assert_called_once()
+        self.assertEqual(mock_dashboard_changes.call_args.kwargs["since"], "1:100")
+        self.assertEqual(mock_dashboard_changes.call_args.kwargs["schema"], 1)
+
+        etag = response["ETag"]
+
+        response = self.client.get(
+            reverse("sovtimer:dashboard_data"),
+            data={"since": "1:100"},
+            HTTP_IF_NONE_MATCH=etag,
+        )
+
+        # Answered before the changes are collected
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        mock_dashboard_changes.assert_called_once()
+
+        # Another token gets its own changes
+        response = self.client.get(
+            reverse("sovtimer:dashboard_data"),
+            data={"since": "2:100"},
+            HTTP_IF_NONE_MATCH=etag,
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(mock_dashboard_changes.call_count, 2)
+
+    def test_returns_full_data_for_out_of_range_token(self):
+        """
+        Test that a token with a timestamp out of range is answered with the full
+        data instead of an error
+
+        :return:
+        :rtype:
+        """
+
+        for url_name in ("sovtimer:dashboard_data", "sovtimer:dashboard_data_v2"):
+            for since in ("3:100000000000000000000", "3:-100000000000000"):
+                with self.subTest(url_name=url_name, since=since):
+                    response = self.client.get(reverse(url_name), data={"since": since})
+
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
+                    self.assertTrue(response.json()["full"])
+
+    @patch("sovtimer.views.get_dashboard_data")
+    def test_v2_returns_plain_campaign_data(self, mock_get_dashboard_data):
+        """
+        Test that the v2 endpoint returns plain campaign data without any HTML
+
+        :param mock_get_dashboard_data:
+        :type mock_get_dashboard_data:
+        :return:
+        :rtype:
+        """
+
+        mock_get_dashboard_data.return_value = {
+            "version": "v1",
+            "campaigns": [],
+            "campaign_data": [
+                {
+                    "campaign_id": 1,
+                    "solar_system_id": 30000142,
+                    "solar_system_name": "Jita",
+                    "constellation_id": 20000020,
+                    "constellation_name": "Kimotoro",
+                    "region_id": 10000002,
+                    "region_name": "The Forge",
+                    "defender_id": 3001,
+                    "defender_name": "Test Alliance",
+                    "adm": 4.5,
+                    "start_time": now(),
+                    "progress_current": 0.6,
+                    "progress_previous": 0.5,
+                }
+            ],
+        }
+
+        response = self.client.get(reverse("sovtimer:dashboard_data_v2"))
+        row = response.json()[0]
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(row["solar_system_name"], "Jita")
+        self.assertEqual(row["adm"], 4.5)
+        self.assertEqual(row["campaign_status"], "active")
+        self.assertIn("remaining_seconds", row)
+        self.assertNotIn("<", response.content.decode())
+
+    @patch("sovtimer.views.dashboard_changes")
+    def test_v2_returns_columnar_changes(self, mock_dashboard_changes):
+        """
+        Test that the v2 endpoint returns the changed rows in columnar form when
+        requested
+
+        :param mock_dashboard_changes:
+        :type mock_dashboard_changes:
+        :return:
+        :rtype:
+        """
+
+        mock_dashboard_changes.return_value = {
+            "full": False,
+            "token": "2:100",
+            "changed": [],
+            "removed": [7],
+        }
+
+        response = self.client.get(
+            reverse("sovtimer:dashboard_data_v2"),
+            data={"since": "1:100", "format": "columnar"},
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()["changed"]["length"], 0)
+        self.assertEqual(response.json()["changed"]["lookups"]["region"], [])
+        self.assertEqual(response.json()["removed"], [7])
+
+    @patch("sovtimer.views.get_dashboard_data")
+    def test_columnar_format_has_its_own_etag(self, mock_get_dashboard_data):
+        """
+        Test that the columnar format doesn't share the ETag of the row format
+
+        :param mock_get_dashboard_data:
+        :type mock_get_dashboard_data:
+        :return:
+        :rtype:
+        """
+
+        mock_get_dashboard_data.return_value = {"version": "v1", "campaign_data": []}
+
+        url = reverse("sovtimer:dashboard_data_v2")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(
+            url, data={"format": "columnar"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()["length"], 0)
+
+    def test_v1_url_serves_rendered_rows(self):
+        """
+        Test that the versioned v1 URL serves the same data as the legacy URL
+
+        :return:
+        :rtype:
+        """
+
+        self.assertEqual(
+            self.client.get(reverse("sovtimer:dashboard_data_v1")).json(),
+            self.client.get(reverse("sovtimer:dashboard_data")).json(),
+        )
+
+
+class TestDashboardEvents(BaseTestCase):
+    """
+    Test the dashboard_events view
+    """
+
+    def setUp(self):
+        """
+        Set up the test case, the stream slots are kept in the cache
+
+        :return:
+        :rtype:
+        """
+
+        cache.clear()
+
+    def test_returns_404_when_sse_is_disabled(self):
+        """
+        Test that the dashboard_events view is not available by default
+
+        :return:
+        :rtype:
+        """
+
+        response = self.client.get(reverse("sovtimer:dashboard_events"))
+
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    @override_settings(SOVTIMER_DASHBOARD_SSE_ENABLED=True)
+    @patch("sovtimer.views.dashboard_event_stream")
+    def test_streams_events_when_sse_is_enabled(self, mock_dashboard_event_stream):
+        """
+        Test that the dashboard_events view streams the events when enabled
+
+        :param mock_dashboard_event_stream:
+        :type mock_dashboard_event_stream:
+        :return:
+        :rtype:
+        """
+
+        mock_dashboard_event_stream.return_value = iter(["retry: 5000\n\n"])
+
+        response = self.client.get(reverse("sovtimer:dashboard_events"))
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(b"".join(response.streaming_content), b"retry: 5000\n\n")
+
+    @override_settings(
+        SOVTIMER_DASHBOARD_SSE_ENABLED=True, SOVTIMER_DASHBOARD_SSE_MAX_STREAMS=1
+    )
+    @patch("sovtimer.helper.dashboard._dashboard_events")
+    def test_refuses_streams_beyond_the_limit(self, mock_dashboard_events):
+        """
+        Test that no more streams than allowed are open at a time, the dashboards
+        beyond the limit fall back to polling
+
+        :param mock_dashboard_events:
+        :type mock_dashboard_events:
+        :return:
+        :rtype:
+        """
+
+        mock_dashboard_events.side_effect = lambda **kwargs: iter(["retry: 5000\n\n"])
+
+        open_response = self.client.get(reverse("sovtimer:dashboard_events"))
+
+        self.assertEqual(open_response.status_code, HTTPStatus.OK)
+
+        response = self.client.get(reverse("sovtimer:dashboard_events"))
+
+        self.assertEqual(response.status_code, HTTPStatus.SERVICE_UNAVAILABLE)
+
+        # The slot is released once the open stream ended
+        b"".join(open_response.streaming_content)
+
+        response = self.client.get(reverse("sovtimer:dashboard_events"))
+
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    @override_settings(SOVTIMER_DASHBOARD_SSE_ENABLED=True)
+    def test_dashboard_passes_events_url_when_sse_is_enabled(self):
+        """
+        Test that the dashboard gets the events URL when SSE is enabled
+
+        :return:
+        :rtype:
+        """
+
+        response = self.client.get(reverse("sovtimer:dashboard"))
+
+        self.assertContains(response, reverse("sovtimer:dashboard_events"))
@@ -14,9 +14,27 @@ app_name: str = "sovtimer"  # pylint: disable=invalid-name
 urlpatterns = [
     path(route="", view=views.dashboard, name="dashboard"),
     # Ajax call
+    # v1 (rendered HTML per column), the unversioned URL is kept for compatibility
     path(
         route=f"{Constants.INTERNAL_URL_PREFIX}/ajax/sov-campaign_data/",
         view=views.dashboard_data,
         name="dashboard_data",
     ),
+    path(
+        route=f"{Constants.INTERNAL_URL_PREFIX}/ajax/v1/sov-campaign-data/",
+        view=views.dashboard_data,
+        name="dashboard_data_v1",
+    ),
+    # v2 (plain data, rendered client-side)
+    path(
+        route=f"{Constants.INTERNAL_URL_PREFIX}/ajax/v2/sov-campaign-data/",
+        view=views.dashboard_data_v2,
+        name="dashboard_data_v2",
+    ),
+    # Server-Sent Events
+    path(
+        route=f"{Constants.INTERNAL_URL_PREFIX}/sse/sov-campaign-events/",
+        view=views.dashboard_events,
+        name="dashboard_events",
+    ),
 ]
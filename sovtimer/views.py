@@ -4,212 +4,179 @@ The views
 
 # Django
 from django.core.handlers.wsgi import WSGIRequest
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.templatetags.static import static
 from django.utils import timezone
-from django.utils.translation import gettext_lazy as _
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.translation import get_language
 
 # Alliance Auth
-from allianceauth.eveonline.evelinks.eveimageserver import alliance_logo_url
-from allianceauth.eveonline.templatetags.evelinks import (
-    dotlan_alliance_url,
-    dotlan_region_url,
-)
 from allianceauth.services.hooks import get_extension_logger
 
 # AA Sovereignty Timer
-from sovtimer.models import Campaign, SovereigntyStructure
+from sovtimer.app_settings import dashboard_sse_enabled
+from sovtimer.helper.dashboard import (
+    acquire_dashboard_event_stream_slot,
+    dashboard_changes,
+    dashboard_columnar,
+    dashboard_etag,
+    dashboard_event_stream,
+    dashboard_rows,
+    get_dashboard_data,
+)
 from sovtimer.providers.applogger import AppLogger
 
 logger = AppLogger(my_logger=get_extension_logger(name=__name__))
 
 
-def _fmt_float_to_percentage(value: float) -> str:
+def dashboard(request: WSGIRequest) -> HttpResponse:
     """
-    Format a float value (0.0-1.0) as a percentage string with leading zero if <10%
+    Index view
+    """
+
+    logger.info(msg=f"Module called by {request.user}")
+
+    return render(
+        request=request,
+        template_name="sovtimer/dashboard.html",
+        context={"dashboard_sse_enabled": dashboard_sse_enabled()},
+    )
+
+
+def _dashboard_data_response(request: WSGIRequest, schema: int) -> HttpResponse:
+    """
+    Get the dashboard data response in the given schema
+
+    The campaign data is prepared by the update tasks and read from the cache,
+    only the remaining time and campaign status are computed per request.
 
-    :param value:
-    :type value:
+    With a "since" token, only the campaigns that changed since the client's
+    last update are returned, along with a new token.
+
+    Responses carry an ETag, derived from the data version, the campaign statuses
+    and the token, a request with a matching If-None-Match header is answered with
+    304 Not Modified before the data or the changes are serialized.
+
+    Plain data rows can be requested in columnar form with "format=columnar".
+
+    :param request:
+    :type request:
+    :param schema: 1 for rendered table rows, 2 for plain data rows
+    :type schema:
     :return:
     :rtype:
     """
 
-    pct = int(round(value * 100))
-    s = f"{pct}%"
+    since = request.GET.get("since")
+    columnar = schema == 2 and request.GET.get("format") == "columnar"
+    variant = "columnar" if columnar else ""
+    cached_data = get_dashboard_data()
 
-    if pct < 10:
-        s = "0" + s
+    if since is None:
+        rows = dashboard_rows(cached_data, schema=schema)
+        etag = dashboard_etag(cached_data, rows, variant=variant)
 
-    return s
+        response = get_conditional_response(request=request, etag=etag)
 
+        if response is None:
+            response = JsonResponse(
+                data=dashboard_columnar(rows) if columnar else rows, safe=False
+            )
+    else:
+        now = timezone.now()
+
+        # The plain rows are enough for the campaign statuses, and cheap to get
+        etag = dashboard_etag(
+            cached_data,
+            dashboard_rows(cached_data, now=now, schema=2),
+            variant=variant,
+            since=since,
+        )
 
-def dashboard(request: WSGIRequest) -> HttpResponse:
-    """
-    Index view
-    """
+        response = get_conditional_response(request=request, etag=etag)
 
-    logger.info(msg=f"Module called by {request.user}")
+        if response is None:
+            # Only the campaigns that changed since the client's last update
+            changes = dashboard_changes(
+                since=since, now=now, schema=schema, dashboard_data=cached_data
+            )
 
-    return render(request=request, template_name="sovtimer/dashboard.html")
+            if columnar:
+                rows_key = "rows" if changes["full"] else "changed"
+                changes[rows_key] = dashboard_columnar(changes[rows_key])
 
+            response = JsonResponse(data=changes)
 
-def dashboard_data(  # pylint: disable=too-many-statements too-many-locals
-    request: WSGIRequest,  # pylint: disable=unused-argument
-) -> JsonResponse:
+    response["ETag"] = etag
+
+    # Browsers must revalidate with us, the data can change with every sync
+    patch_cache_control(response, private=True, no_cache=True)
+
+    return response
+
+
+def dashboard_data(request: WSGIRequest) -> HttpResponse:
     """
-    Ajax call => Get dashboard data
+    Ajax call => Get dashboard data (v1, rendered HTML per column)
+
+    Kept for compatibility, the dashboard itself uses dashboard_data_v2.
 
     :param request:
     :return:
     """
 
-    data = []
+    return _dashboard_data_response(request=request, schema=1)
 
-    sovereignty_campaigns = Campaign.objects.select_related(
-        "structure",
-        "structure__alliance",
-        "structure__solar_system",
-        "structure__solar_system__constellation",
-        "structure__solar_system__constellation__region",
-    ).filter(structure__isnull=False)
 
-    campaign_system_ids = set(
-        sovereignty_campaigns.values_list("structure__solar_system_id", flat=True)
-    )
+def dashboard_data_v2(request: WSGIRequest) -> HttpResponse:
+    """
+    Ajax call => Get dashboard data (v2, plain data)
 
-    if not campaign_system_ids:
-        return JsonResponse(data=data, safe=False)
+    IDs, names, scores and timestamps only, links and logos are rendered
+    client-side.
 
-    sovereignty_structures = SovereigntyStructure.objects.filter(
-        solar_system_id__in=campaign_system_ids
-    )
+    :param request:
+    :return:
+    """
 
-    # Map solar_system_id -> vulnerability_occupancy_level for O(1) lookup
-    occupancy_by_system = {
-        s.solar_system_id: s.vulnerability_occupancy_level
-        for s in sovereignty_structures
-        if s.vulnerability_occupancy_level
-    }
-
-    now = timezone.now()
-
-    for campaign in sovereignty_campaigns:
-        alliance = campaign.structure.alliance
-        solar_system = campaign.structure.solar_system
-        constellation = solar_system.constellation
-        region = constellation.region
-
-        # Defender
-        defender_name = alliance.name
-        defender_url = dotlan_alliance_url(eve_obj=alliance.pk)
-        defender_logo_url = alliance_logo_url(alliance_id=alliance.pk, size=32)
-        defender_name_html = (
-            f'<a href="{defender_url}" target="_blank" rel="noopener noreferer">'
-            f'<img class="aa-sovtimer-entity-logo-left me-2" src="{defender_logo_url}" '
-            f'alt="{defender_name}">{defender_name}</a>'
-        )
+    return _dashboard_data_response(request=request, schema=2)
 
-        # Region / System / Constellation URLs and HTML (compute region_url once)
-        region_url = dotlan_region_url(eve_obj=region.pk)
-        campaign_system_name = solar_system.name
-        solar_system_url = f"{region_url}/{campaign_system_name}"
-        solar_system_name_html = f'<a href="{solar_system_url}" target="_blank" rel="noopener noreferer">{campaign_system_name}</a>'
 
-        constellation_name = constellation.name
-        constellation_url = f"{region_url}/{constellation_name}"
-        constellation_name_html = f'<a href="{constellation_url}" target="_blank" rel="noopener noreferer">{constellation_name}</a>'
+def dashboard_events(
+    request: WSGIRequest,  # pylint: disable=unused-argument
+) -> StreamingHttpResponse:
+    """
+    Server-Sent Events => Stream dashboard updates
 
-        region_name = region.name
-        region_name_html = f'<a href="{region_url}" target="_blank" rel="noopener noreferer">{region_name}</a>'
+    Only available when SOVTIMER_DASHBOARD_SSE_ENABLED is set, and for at most
+    SOVTIMER_DASHBOARD_SSE_MAX_STREAMS streams at a time, the dashboard falls back
+    to polling dashboard_data otherwise.
 
-        # Activity defense multiplier (fast lookup) formatted with one decimal
-        structure_adm = (
-            f"{occupancy_by_system.get(campaign.structure.solar_system_id, 1):.1f}"
-        )
+    :param request:
+    :return:
+    """
 
-        # Start time and remaining seconds (use timezone-aware now)
-        start_time = campaign.start_time
-        remaining_time_in_seconds = (start_time - now).total_seconds()
-
-        # Progress formatting
-        prev_formatted = _fmt_float_to_percentage(campaign.progress_previous)
-        curr_formatted = _fmt_float_to_percentage(campaign.progress_current)
-
-        campaign_progress_html = curr_formatted
-        campaign_status = "inactive"
-
-        if 0 <= remaining_time_in_seconds <= 14400:
-            campaign_status = "upcoming"
-
-        if remaining_time_in_seconds < 0:
-            campaign_status = "active"
-
-            if campaign.progress_previous < campaign.progress_current:
-                title = _("Defenders making progress")
-                cls = "aa-sovtimer-trend-up"
-                icon_name = "trending_up"
-            elif campaign.progress_previous > campaign.progress_current:
-                title = _("Attackers making progress")
-                cls = "aa-sovtimer-trend-down"
-                icon_name = "trending_down"
-            else:
-                title = _("Neither side has made any progress yet")
-                cls = "aa-sovtimer-trend-flat"
-                icon_name = "trending_flat"
-
-            campaign_progress_icon = (
-                f'<i class="material-icons aa-sovtimer-trend {cls}" '
-                f'title="{title}" data-bs-tooltip="aa-sovtimer">{icon_name}</i>'
-            )
+    if not dashboard_sse_enabled():
+        raise Http404("Server-Sent Events are not enabled.")
 
-            zkb_href = f"https://zkillboard.com/constellation/{constellation.pk}/"
-            zkb_icon = f'<img src="{static("sovtimer/images/zkillboard.png")}" alt="zKillboard">'
-            constellation_killboard_link = (
-                f'<a href="{zkb_href}" target="_blank" rel="noopener noreferer" '
-                f'class="aa-sov-timer-zkb-icon ms-2">{zkb_icon}</a>'
-            )
+    slot = acquire_dashboard_event_stream_slot()
 
-            campaign_progress_html = (
-                prev_formatted
-                + campaign_progress_icon
-                + curr_formatted
-                + constellation_killboard_link
-            )
+    # All slots are taken, the browser closes the event source on any other status
+    # than 200 and polls instead
+    if slot is None:
+        logger.debug(msg="All Server-Sent Events streams are taken, refusing another.")
 
-        data.append(
-            {
-                # "event_type": Campaign.Type(campaign.event_type).label,
-                "solar_system": {
-                    "display": solar_system_name_html,
-                    "sort": campaign_system_name,
-                },
-                "constellation": {
-                    "display": constellation_name_html,
-                    "sort": constellation_name,
-                },
-                "region": {
-                    "display": region_name_html,
-                    "sort": region_name,
-                },
-                "defender": {
-                    "display": defender_name_html,
-                    "sort": defender_name,
-                },
-                "adm": structure_adm,
-                "start_time": start_time,
-                "remaining_time": {
-                    "display": "",
-                    "seconds": remaining_time_in_seconds,
-                },
-                # "remaining_time_in_seconds": remaining_time_in_seconds,
-                "campaign_progress": {
-                    "current": campaign.progress_current,
-                    "previous": campaign.progress_previous,
-                    "display": campaign_progress_html,
-                },
-                "campaign_status": campaign_status,
-            }
-        )
+        return HttpResponse(status=503)
+
+    response = StreamingHttpResponse(
+        streaming_content=dashboard_event_stream(
+            language_code=get_language(), slot=slot
+        ),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+
+    # Tell nginx not to buffer the stream
+    response["X-Accel-Buffering"] = "no"
 
-    return JsonResponse(data=data, safe=False)
+    return response